@@ -0,0 +1,111 @@
+"""
+Batched display names for audit user columns (created_by, updated_by, ...).
+
+``obj.created_by.get_full_name()`` in a SerializerMethodField costs one query
+per row and per column.  ``AuditUserField`` reads the raw ``<fk>_id`` instead
+and looks the name up in a per-process cache.  ``AuditUserListSerializer``
+collects every user id on the page first and loads the missing ones in a
+single query, so a list page costs the same no matter how many rows it has.
+
+The cache is dropped per user on ``CustomUser`` save/delete (core.signals),
+but those signals only reach the process that made the change, so entries
+also expire after ``NAME_CACHE_TIMEOUT`` seconds: a rename made through
+another worker shows up everywhere within that window.
+"""
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from rest_framework import serializers
+
+# Plenty for an ERP user table; cleared wholesale if it ever grows past this.
+MAX_CACHED_NAMES = 10000
+# Seconds a name is trusted without another query; bounds staleness across workers.
+NAME_CACHE_TIMEOUT = 60
+
+_names = {}
+_lock = threading.Lock()
+
+
+def invalidate_user_name(user_id):
+    with _lock:
+        _names.pop(user_id, None)
+
+
+def clear_user_names():
+    with _lock:
+        _names.clear()
+
+
+def resolve_user_names(user_ids):
+    """Returns {user_id: display name}, loading cache misses and expired names in one query."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    now = time.monotonic()
+    with _lock:
+        cached = {user_id: _names.get(user_id) for user_id in user_ids}
+    found = {user_id: entry[0] for user_id, entry in cached.items() if entry and entry[1] > now}
+    missing = user_ids - found.keys()
+    if missing:
+        users = get_user_model().objects.filter(pk__in=missing).only('id', 'first_name', 'last_name', 'email')
+        loaded = {user.pk: user.get_full_name() for user in users}
+        expires = now + NAME_CACHE_TIMEOUT
+        with _lock:
+            if len(_names) + len(loaded) > MAX_CACHED_NAMES:
+                _names.clear()
+            _names.update((user_id, (name, expires)) for user_id, name in loaded.items())
+        found.update(loaded)
+    return found
+
+
+def resolve_user_name(user_id):
+    if user_id is None:
+        return None
+    return resolve_user_names([user_id]).get(user_id)
+
+
+class AuditUserField(serializers.Field):
+    """
+    Read-only display name of a user foreign key.  Never touches the relation,
+    so no join and no per-row query is needed.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_user_id(self, instance):
+        *path, name = self.source_attrs
+        for attr in path:
+            instance = getattr(instance, attr, None)
+            if instance is None:
+                return None
+        return getattr(instance, f'{name}_id', None)
+
+    def get_attribute(self, instance):
+        return self.get_user_id(instance)
+
+    def to_representation(self, value):
+        return resolve_user_name(value)
+
+
+def prime_audit_users(serializer, instances):
+    """Loads the names behind every AuditUserField of ``serializer`` for ``instances``."""
+    audit_fields = [
+        field for field in serializer.fields.values() if isinstance(field, AuditUserField)
+    ]
+    if not audit_fields:
+        return
+    resolve_user_names(
+        field.get_user_id(instance) for instance in instances for field in audit_fields
+    )
+
+
+class AuditUserListSerializer(serializers.ListSerializer):
+    """``many=True`` counterpart that resolves the whole page in one query."""
+
+    def to_representation(self, data):
+        items = data.all() if isinstance(data, models.manager.BaseManager) else data
+        items = list(items)
+        prime_audit_users(self.child, items)
+        return super().to_representation(items)
@@ -0,0 +1,85 @@
+"""
+Token authentication that loads token, user, role and branch in one query
+and keeps the result in the cache for a short TTL.
+
+DRF's ``TokenAuthentication`` runs a token→user query per request, and the
+permission check and views then lazy-load ``user.role`` and ``user.branch``.
+Here one ``select_related`` query fills all of them, and later requests with
+the same token are served from the cache.
+
+Cached principals are dropped (core.signals) when the token is deleted
+(logout), the user is saved or deleted, or their role or branch changes.
+That only reaches other workers through a shared cache, so with the default
+process-local cache nothing is cached and every request runs the query.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+DEFAULT_AUTH_TOKEN_CACHE_TIMEOUT = 60
+
+
+def _token_cache_key(key):
+    return 'authtoken:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _user_cache_key(user_id):
+    return f'authtoken:user:{user_id}'
+
+
+def cache_timeout():
+    if not getattr(settings, 'SHARED_CACHE', False):
+        return 0
+    return getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', DEFAULT_AUTH_TOKEN_CACHE_TIMEOUT)
+
+
+def invalidate_token(key):
+    if key:
+        cache.delete(_token_cache_key(key))
+
+
+def invalidate_user_tokens(user_id):
+    key = cache.get(_user_cache_key(user_id))
+    if key:
+        cache.delete_many([_token_cache_key(key), _user_cache_key(user_id)])
+
+
+def invalidate_tokens_for(**user_filter):
+    """Drops cached principals of every user matching ``user_filter`` (e.g. role_id=3)."""
+    from rest_framework.authtoken.models import Token
+
+    keys = Token.objects.filter(**{f'user__{name}': value for name, value in user_filter.items()}) \
+        .values_list('key', flat=True)
+    cache.delete_many([_token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for ``rest_framework.authentication.TokenAuthentication``."""
+
+    def authenticate_credentials(self, key):
+        timeout = cache_timeout()
+        cache_key = _token_cache_key(key)
+        cached = cache.get(cache_key) if timeout else None
+        if cached is not None:
+            return cached
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user__role', 'user__branch').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        principal = (token.user, token)
+        if timeout:
+            cache.set_many({
+                cache_key: principal,
+                _user_cache_key(token.user_id): key,
+            }, timeout)
+        return principal
@@ -0,0 +1,540 @@
+"""
+In-process HTTP benchmarks for the API.
+
+Every scenario is driven through DRF's ``APIClient`` with a real token, so a
+request pays for authentication, permissions, middleware and serialization
+exactly like production minus the network.  Per scenario we record:
+
+* throughput (requests per second of wall time),
+* p50 / p95 / p99 latency,
+* SQL queries per request (from ``QueryBudgetMiddleware``),
+* peak RSS while the scenario ran.
+
+The email endpoints only write to the outbox (core/outbox.py), so the email
+scenarios drain it after every request into ``LocalSMTPServer``, a
+throwaway SMTP sink on 127.0.0.1, and their latency includes the SMTP
+delivery that ``manage.py send_outbox`` does in production.
+
+Requests run in autocommit as they do behind gunicorn, so ``on_commit``
+hooks fire and nothing sees a caller's transaction.  The rows a scenario
+adds are deleted once it has run.
+
+Run against a seeded database (``manage.py seed_perf_data``) through
+``manage.py run_benchmarks``.
+"""
+import io
+import json
+import os
+import platform
+import resource
+import socketserver
+import statistics
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max, ProtectedError, RestrictedError
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+BENCHMARK_USER_EMAIL = 'benchmark@example.com'
+
+SCENARIO_KINDS = ('list', 'detail', 'create', 'action', 'import', 'pdf', 'email')
+
+
+# ────────────────────────────────────────────────
+# SMTP stand-in
+# ────────────────────────────────────────────────
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts and counts every message."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 localhost benchmark SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.wfile.write(b'250-localhost\r\n250 SIZE 52428800\r\n')
+            elif command.startswith('DATA'):
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                for data in iter(self.rfile.readline, b''):
+                    if data in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data)
+                if self.server.record(size):
+                    self.reply('250 OK')
+                else:
+                    self.reply(f'{self.server.reject_code} Message not accepted')
+            elif command.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self.reply('250 OK')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    SMTP sink on 127.0.0.1 for benchmarks and local testing:
+
+        with LocalSMTPServer() as smtp:
+            with override_settings(**smtp.email_settings()):
+                ...
+            smtp.messages
+
+    Set ``reject_next`` to refuse that many messages with ``reject_code``: a
+    temporary 451 by default to exercise retries, or a 5xx permanent refusal.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages = 0
+        self.bytes = 0
+        self.reject_next = 0
+        self.reject_code = 451
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    def record(self, size):
+        """Counts an accepted message; returns False if it was rejected instead."""
+        with self._count_lock:
+            if self.reject_next > 0:
+                self.reject_next -= 1
+                return False
+            self.messages += 1
+            self.bytes += size
+            return True
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def email_settings(self):
+        return {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': self.server_address[0],
+            'EMAIL_PORT': self.port,
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        return super().__exit__(*exc_info)
+
+
+# ────────────────────────────────────────────────
+# Memory
+# ────────────────────────────────────────────────
+
+def reset_peak_rss():
+    """Resets the kernel's RSS high-water mark (Linux only); False elsewhere."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as handle:
+            for line in handle:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux.
+    return peak // 1024 if platform.system() == 'Darwin' else peak
+
+
+# ────────────────────────────────────────────────
+# Scenarios
+# ────────────────────────────────────────────────
+
+@dataclass
+class Scenario:
+    name: str
+    kind: str
+    method: str
+    path: str
+    # Called once per request; returns the request kwargs (data, format, ...).
+    payload: Optional[Callable[[int], dict]] = None
+    expect: tuple = (200, 201)
+    # Called after every request and timed with it, e.g. to send the mail it queued.
+    after: Optional[Callable[[], object]] = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    kind: str
+    method: str
+    path: str
+    requests: int = 0
+    errors: int = 0
+    status_codes: dict = field(default_factory=dict)
+    latencies_ms: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    wall_seconds: float = 0.0
+    peak_rss_kb: int = 0
+    peak_rss_exact: bool = False
+
+    def percentile(self, pct):
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+        return round(ordered[index], 2)
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'method': self.method,
+            'path': self.path,
+            'requests': self.requests,
+            'errors': self.errors,
+            'status_codes': self.status_codes,
+            'throughput_rps': round(self.requests / self.wall_seconds, 2) if self.wall_seconds else None,
+            'latency_ms': {
+                'mean': round(statistics.fmean(self.latencies_ms), 2) if self.latencies_ms else None,
+                'p50': self.percentile(50),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'max': round(max(self.latencies_ms), 2) if self.latencies_ms else None,
+            },
+            'queries': {
+                'mean': round(statistics.fmean(self.queries), 2) if self.queries else None,
+                'max': max(self.queries) if self.queries else None,
+            },
+            'peak_rss_kb': self.peak_rss_kb,
+            'peak_rss_exact': self.peak_rss_exact,
+        }
+
+
+def _send_outbox():
+    from .outbox import drain
+
+    return drain(burst=True)
+
+
+def _first_id(queryset):
+    return queryset.order_by('id').values_list('id', flat=True).first()
+
+
+def _product_csv(product, rows):
+    lines = ['name,product_type,unit_price,discount,quantity,stock_level,reorder_level,status,product_usage,category,tax_code,uom,warehouse']
+    for n in range(rows):
+        lines.append(
+            f'Benchmark Import {n},Goods,{product.unit_price},0,10,10,2,Active,Both,'
+            f'{product.category_id or ""},{product.tax_code_id or ""},{product.uom_id or ""},{product.warehouse_id or ""}'
+        )
+    return '\n'.join(lines).encode()
+
+
+def build_scenarios(import_rows=50):
+    """
+    Scenarios for the current database.  Ones whose fixtures are missing are
+    returned in the second list with the reason, so a thin database still runs.
+    """
+    from crm.models import Quotation, SalesOrder
+    from masters.models import Customer, Product, Supplier
+
+    scenarios, skipped = [], []
+
+    def add(scenario, *required):
+        if all(value is not None for value in required):
+            scenarios.append(scenario)
+        else:
+            skipped.append((scenario.name, 'no matching rows; run seed_perf_data first'))
+
+    # Three distinct products: a quotation rejects the same product on two lines
+    line_products = list(Product.objects.exclude(uom=None).order_by('id')[:3])
+    product = line_products[0] if line_products else None
+    product_id = product.pk if product else None
+    customer_id = _first_id(Customer.objects.all())
+    quotation_id = _first_id(Quotation.objects.all())
+    draft_quotation_id = _first_id(
+        Quotation.objects.filter(status='Draft').exclude(expiry_date__lt=timezone.now().date())
+    )
+    sales_order_id = _first_id(SalesOrder.objects.all())
+    draft_order_id = _first_id(SalesOrder.objects.filter(status='Draft'))
+    supplier_id = _first_id(Supplier.objects.filter(workflow_status='Submitted'))
+    sales_rep_id = _first_id(get_user_model().objects.filter(role__role='Sales Representative'))
+
+    for name, path in [
+        ('products.list', '/api/masters/products/'),
+        ('customers.list', '/api/masters/customers/'),
+        ('suppliers.list', '/api/masters/suppliers/'),
+        ('enquiries.list', '/api/crm/enquiries/'),
+        ('quotations.list', '/api/crm/quotations/'),
+        ('sales_orders.list', '/api/crm/sales-orders/'),
+        ('delivery_notes.list', '/api/crm/delivery-notes/'),
+        ('invoices.list', '/api/crm/invoices/'),
+    ]:
+        scenarios.append(Scenario(name, 'list', 'get', path))
+    add(Scenario('quotations.list.cursor', 'list', 'get', '/api/crm/quotations/?cursor='), quotation_id)
+
+    add(Scenario('products.detail', 'detail', 'get', f'/api/masters/products/{product_id}/'), product_id)
+    add(Scenario('customers.detail', 'detail', 'get', f'/api/masters/customers/{customer_id}/'), customer_id)
+    add(Scenario('quotations.detail', 'detail', 'get', f'/api/crm/quotations/{quotation_id}/'), quotation_id)
+    add(Scenario('sales_orders.detail', 'detail', 'get', f'/api/crm/sales-orders/{sales_order_id}/'), sales_order_id)
+
+    def quotation_payload(n):
+        return {'format': 'json', 'data': {
+            'customer': customer_id,
+            'sales_rep': sales_rep_id,
+            'quotation_type': 'Standard',
+            'quotation_date': timezone.now().date().isoformat(),
+            'currency': 'INR',
+            'status': 'Draft',
+            'items': [{
+                'product': line.pk, 'uom': line.uom_id, 'tax': line.tax_code_id,
+                'unit_price': str(line.unit_price), 'quantity': 2, 'discount': '0.00',
+            } for line in line_products],
+        }}
+
+    def product_payload(n):
+        return {'format': 'json', 'data': {
+            'name': f'Benchmark Product {n}', 'product_type': 'Goods', 'unit_price': '99.50',
+            'quantity': 5, 'stock_level': 5, 'status': 'Active', 'product_usage': 'Both',
+        }}
+
+    scenarios.append(Scenario('products.create', 'create', 'post', '/api/masters/products/', product_payload))
+    add(Scenario('quotations.create', 'create', 'post', '/api/crm/quotations/', quotation_payload),
+        customer_id, line_products[2] if len(line_products) == 3 else None)
+
+    action = {'format': 'json', 'data': {'action': 'save_draft'}}
+    add(Scenario('quotations.action', 'action', 'post', f'/api/crm/quotations/{draft_quotation_id}/action/',
+                 lambda n: action), draft_quotation_id)
+    add(Scenario('sales_orders.action', 'action', 'post', f'/api/crm/sales-orders/{draft_order_id}/action/',
+                 lambda n: action), draft_order_id)
+
+    if product is not None:
+        csv_bytes = _product_csv(product, import_rows)
+
+        def import_payload(n):
+            upload = io.BytesIO(csv_bytes)
+            upload.name = 'products.csv'
+            return {'format': 'multipart', 'data': {'file': upload}}
+
+        def confirm_payload(n):
+            rows = [
+                {'name': f'Benchmark Confirm {n}-{i}', 'product_type': 'Goods', 'unit_price': '10.00',
+                 'quantity': 1, 'stock_level': 1, 'status': 'Active', 'product_usage': 'Both'}
+                for i in range(import_rows)
+            ]
+            return {'format': 'json', 'data': {'valid_rows': rows}}
+
+        scenarios.append(Scenario('products.import', 'import', 'post', '/api/masters/products/import/', import_payload))
+        scenarios.append(Scenario('products.import.confirm', 'import', 'post', '/api/masters/products/import/confirm/', confirm_payload))
+    else:
+        skipped.append(('products.import', 'no products to copy foreign keys from'))
+
+    add(Scenario('quotations.pdf', 'pdf', 'get', f'/api/crm/quotations/{quotation_id}/pdf/'), quotation_id)
+    add(Scenario('sales_orders.pdf', 'pdf', 'get', f'/api/crm/sales-orders/{sales_order_id}/pdf/'), sales_order_id)
+    add(Scenario('suppliers.pdf', 'pdf', 'get', f'/api/masters/suppliers/{supplier_id}/pdf/'), supplier_id)
+
+    mail = {'format': 'json', 'data': {'email': 'benchmark.recipient@example.com'}}
+    add(Scenario('quotations.email', 'email', 'post', f'/api/crm/quotations/{quotation_id}/email/',
+                 lambda n: mail, after=_send_outbox), quotation_id)
+    add(Scenario('sales_orders.email', 'email', 'post', f'/api/crm/sales-orders/{sales_order_id}/email/',
+                 lambda n: mail, after=_send_outbox), sales_order_id)
+    add(Scenario('suppliers.email', 'email', 'post', f'/api/masters/suppliers/{supplier_id}/email/',
+                 lambda n: mail, after=_send_outbox), supplier_id)
+
+    return scenarios, skipped
+
+
+# ────────────────────────────────────────────────
+# Runner
+# ────────────────────────────────────────────────
+
+def get_benchmark_client():
+    """APIClient authenticated as a dedicated superuser through a real token."""
+    User = get_user_model()
+    user = User.objects.filter(email=BENCHMARK_USER_EMAIL).first()
+    if user is None:
+        user = User.objects.create_superuser(email=BENCHMARK_USER_EMAIL, password=None, first_name='Benchmark')
+    token, _ = Token.objects.get_or_create(user=user)
+    client = APIClient()
+    # A failing view is a 500 in the results, not the end of the run.
+    client.raise_request_exception = False
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def _row_marks():
+    """Highest pk of every table with an integer key, to tell the rows a scenario adds."""
+    marks = {}
+    for model in apps.get_models():
+        if model._meta.pk.get_internal_type() in ('AutoField', 'BigAutoField', 'SmallAutoField'):
+            marks[model] = model._base_manager.aggregate(last=Max('pk'))['last'] or 0
+    return marks
+
+
+def _delete_rows_after(marks):
+    """Deletes the rows added since ``marks``; a table whose rows are still protected waits for the others."""
+    pending = dict(marks)
+    while pending:
+        protected = {}
+        for model, mark in pending.items():
+            try:
+                with transaction.atomic():
+                    model._base_manager.filter(pk__gt=mark).delete()
+            except (ProtectedError, RestrictedError):
+                protected[model] = mark
+        if len(protected) == len(pending):
+            raise RuntimeError(f'Could not delete benchmark rows from {", ".join(m.__name__ for m in protected)}')
+        pending = protected
+
+
+class BenchmarkRunner:
+    """
+    Runs each scenario ``warmup`` times unmeasured, then ``iterations`` times
+    measured.  With ``cleanup`` (the default) the rows a scenario added are
+    deleted after it, so writes don't skew the next run.
+    """
+
+    def __init__(self, iterations=50, warmup=3, cleanup=True, stdout=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cleanup = cleanup
+        self.stdout = stdout
+
+    def run(self, scenarios):
+        client = get_benchmark_client()
+        hosts = list(settings.ALLOWED_HOSTS) + ['testserver']
+        with LocalSMTPServer() as smtp, \
+                override_settings(ALLOWED_HOSTS=hosts, QUERY_BUDGET_STRICT=False, **smtp.email_settings()):
+            results = [self.run_scenario(client, scenario) for scenario in scenarios]
+            self.emails_sent = smtp.messages
+        return results
+
+    def run_scenario(self, client, scenario):
+        result = ScenarioResult(scenario.name, scenario.kind, scenario.method.upper(), scenario.path)
+        marks = _row_marks() if self.cleanup else None
+        try:
+            self._measure(client, scenario, result)
+        finally:
+            if marks is not None:
+                _delete_rows_after(marks)
+        if self.stdout:
+            self.stdout.write(
+                f'  {scenario.name:<28} p50 {result.percentile(50)}ms  p95 {result.percentile(95)}ms  '
+                f'errors {result.errors}'
+            )
+        return result
+
+    def _measure(self, client, scenario, result):
+        request = getattr(client, scenario.method)
+        for n in range(self.warmup):
+            self._send(request, scenario, scenario.payload(-n - 1) if scenario.payload else {})
+
+        result.peak_rss_exact = reset_peak_rss()
+        started = time.perf_counter()
+        for n in range(self.iterations):
+            kwargs = scenario.payload(n) if scenario.payload else {}
+            begin = time.perf_counter()
+            response = self._send(request, scenario, kwargs)
+            result.latencies_ms.append((time.perf_counter() - begin) * 1000)
+            result.requests += 1
+            code = str(response.status_code)
+            result.status_codes[code] = result.status_codes.get(code, 0) + 1
+            if response.status_code not in scenario.expect:
+                result.errors += 1
+            stats = getattr(response, 'query_stats', None)
+            if stats is not None:
+                result.queries.append(stats.count)
+        result.wall_seconds = time.perf_counter() - started
+        result.peak_rss_kb = peak_rss_kb()
+
+
+    @staticmethod
+    def _send(request, scenario, kwargs):
+        response = request(scenario.path, **kwargs)
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)  # a streamed ZIP is built as it is read
+        if scenario.after:
+            scenario.after()
+        return response
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results, runner, skipped=()):
+    return {
+        'revision': git_revision(),
+        'started_at': timezone.now().isoformat(),
+        'database': settings.DATABASES['default']['ENGINE'],
+        'python': platform.python_version(),
+        'iterations': runner.iterations,
+        'warmup': runner.warmup,
+        'cleanup': runner.cleanup,
+        'emails_sent': getattr(runner, 'emails_sent', 0),
+        'pid': os.getpid(),
+        'scenarios': [result.as_dict() for result in results],
+        'skipped': [{'name': name, 'reason': reason} for name, reason in skipped],
+    }
+
+
+def compare_reports(old, new):
+    """Rows of (name, metric, old, new, change %) for scenarios in both reports."""
+    previous = {scenario['name']: scenario for scenario in old.get('scenarios', [])}
+    rows = []
+    for scenario in new.get('scenarios', []):
+        before = previous.get(scenario['name'])
+        if before is None:
+            continue
+        for metric, old_value, new_value in [
+            ('p50', before['latency_ms']['p50'], scenario['latency_ms']['p50']),
+            ('p95', before['latency_ms']['p95'], scenario['latency_ms']['p95']),
+            ('queries', before['queries']['mean'], scenario['queries']['mean']),
+            ('rps', before['throughput_rps'], scenario['throughput_rps']),
+        ]:
+            change = None
+            if old_value and new_value is not None:
+                change = round((new_value - old_value) / old_value * 100, 1)
+            rows.append((scenario['name'], metric, old_value, new_value, change))
+    return rows
+
+
+def load_report(path):
+    with open(path) as handle:
+        return json.load(handle)
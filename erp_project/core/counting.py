@@ -0,0 +1,144 @@
+"""
+Count strategies for the paginated list envelope.
+
+``totalCount`` used to be a fresh ``COUNT(*)`` over the filtered queryset on
+every request.  ``get_total_count`` picks the cheapest answer that is still
+good enough for a grid footer:
+
+* ``?count=false``      – no count at all, ``totalCount``/``totalPages`` are null.
+* unfiltered list       – row estimate from the table statistics when the
+                          table is big enough for COUNT(*) to hurt.
+* everything else       – exact COUNT(*), cached per (tables, filter SQL).
+
+Cached counts are keyed on a version number per table.  Every save/delete on a
+model bumps the version of its table (see core.signals), which orphans all
+cached counts that read from it.  ``COUNT_CACHE_TIMEOUT`` bounds staleness for
+writes that bypass signals (``QuerySet.update()``, ``bulk_create()``).
+
+The versions live in the default cache.  With a per-process cache (LocMem,
+the default without ``CACHE_URL``) a bump only reaches the worker that made
+the write, so counts are then kept for ``LOCAL_COUNT_CACHE_TIMEOUT`` seconds
+only: a list may show a count a few seconds behind a write made through
+another worker.  Point ``CACHE_URL`` at a shared cache to keep them longer.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+COUNT_PARAM = 'count'
+COUNT_CACHE_TIMEOUT = 60 * 5
+# Per-process caches never see other workers' bumps; keep counts barely long enough to page.
+LOCAL_COUNT_CACHE_TIMEOUT = 5
+# Below this many rows an exact COUNT(*) is cheap and the estimate is noisy.
+ESTIMATE_MIN_ROWS = 10000
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+
+
+def _version_key(table):
+    return f'listcount:version:{table}'
+
+
+def bump_table_version(table):
+    """Invalidates every cached count that reads from ``table``."""
+    key = _version_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def _table_versions(tables):
+    versions = cache.get_many([_version_key(t) for t in tables])
+    return [f'{t}:{versions.get(_version_key(t), 0)}' for t in tables]
+
+
+def _query_tables(queryset):
+    return sorted({
+        alias.table_name for alias in queryset.query.alias_map.values()
+    } | {queryset.model._meta.db_table})
+
+
+def _count_cache_key(queryset):
+    # Count only depends on the filter, not on columns or ordering.
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    signature = hashlib.sha1(f'{sql}|{params!r}'.encode()).hexdigest()
+    versions = '|'.join(_table_versions(_query_tables(queryset)))
+    version_hash = hashlib.sha1(versions.encode()).hexdigest()[:16]
+    return f'listcount:{queryset.model._meta.label_lower}:{version_hash}:{signature}'
+
+
+def count_cache_timeout():
+    if getattr(settings, 'SHARED_CACHE', False):
+        return COUNT_CACHE_TIMEOUT
+    return LOCAL_COUNT_CACHE_TIMEOUT
+
+
+def cached_count(queryset):
+    key = _count_cache_key(queryset)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, count_cache_timeout())
+    return count
+
+
+def estimated_count(queryset):
+    """
+    Row estimate from the table statistics, or None when the backend has none.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    [table],
+                )
+            elif connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [table],
+                )
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Could not read table statistics for %s", table)
+        return None
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def is_unfiltered(queryset):
+    query = queryset.query
+    return not query.where and not query.distinct and query.low_mark == 0 and query.high_mark is None
+
+
+def count_disabled(request):
+    return request.query_params.get(COUNT_PARAM, '').strip().lower() in ('false', '0', 'no')
+
+
+def get_total_count(request, queryset):
+    """
+    Returns (count, mode).  ``count`` is None when the client opted out.
+    """
+    if count_disabled(request):
+        return None, COUNT_NONE
+
+    if is_unfiltered(queryset):
+        estimate = estimated_count(queryset)
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            return estimate, COUNT_ESTIMATE
+
+    return cached_count(queryset), COUNT_EXACT
@@ -0,0 +1,273 @@
+"""
+PDF documents, registered by type name.
+
+Each app declares its printable documents in its ``pdfs.py``:
+
+    @document('quotation', Quotation, filename=lambda q: f'Quotation_{q.quotation_id}.pdf')
+    def render_quotation(quotation, base_url=None):
+        return html_pdf('quotation_pdf.html', {...}, base_url=base_url)
+
+so a PDF can be produced from just ``(type, pk)`` by a view, by the
+``render_pdf`` background job or by a bulk export, and every path renders
+the same bytes.  ``pdf_view_response`` is what the PDF views return: the file
+inline, or a queued job with ``?background=true``.
+
+Rendered PDFs are cached on disk at
+
+    MEDIA_ROOT/pdf_cache/<type>/<pk>/<updated_at>-<template hash>.pdf
+
+so a repeat download is the row the view already fetched plus a file send.
+Saving the document moves ``updated_at`` and changes the key; editing the
+renderer's module or templates changes the hash.  Writes to rows a document
+prints but that don't save it (comments, GRN lines, ...) bump its
+``updated_at`` from core.signals.  A stale file is only replaced when the
+new version is rendered: lazily on the next download, or right after the
+write with ``PDF_CACHE_PREWARM``.  Models without ``updated_at`` are never
+cached.
+
+``html_pdf`` keeps each template's inline stylesheets parsed and the font
+configuration loaded across renders, so only the first render of a process
+pays for them.
+"""
+import hashlib
+import inspect
+import os
+import re
+import shutil
+import tempfile
+from collections import namedtuple
+from contextlib import suppress
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.module_loading import autodiscover_modules
+from rest_framework.response import Response
+
+from .jobs import enqueue, queued_response_data, wants_background
+
+Document = namedtuple('Document', 'name model render filename templates')
+
+CACHE_DIR = 'pdf_cache'
+
+_DOCUMENTS = {}
+
+
+def document(name, model, filename, templates=()):
+    """
+    Registers the decorated ``render(instance, base_url=None) -> bytes`` as
+    ``name``.  ``templates`` are the Django templates it renders, part of the
+    cache key.
+    """
+    def register(render):
+        _DOCUMENTS[name] = Document(name, model, render, filename, tuple(templates))
+        return render
+    return register
+
+
+@lru_cache(maxsize=None)
+def _discover():
+    autodiscover_modules('pdfs')
+
+
+def get_document(name):
+    _discover()
+    try:
+        return _DOCUMENTS[name]
+    except KeyError:
+        raise LookupError(f'Unknown document type "{name}"') from None
+
+
+def documents_for(model):
+    """The registered documents that print rows of ``model``."""
+    _discover()
+    return [doc for doc in _DOCUMENTS.values() if doc.model is model]
+
+
+# ──────────────────────────────────────────────────────────────
+# On-disk cache
+# ──────────────────────────────────────────────────────────────
+def _cache_enabled():
+    return getattr(settings, 'PDF_CACHE_ENABLED', True)
+
+
+@lru_cache(maxsize=None)
+def template_hash(name):
+    """Hash of the code that shapes document ``name``: its module, its templates and this file."""
+    doc = get_document(name)
+    paths = [inspect.getsourcefile(doc.render), __file__]
+    paths += [get_template(template).origin.name for template in doc.templates]
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+def _cache_dir(name, pk):
+    return os.path.join(settings.MEDIA_ROOT, CACHE_DIR, name, str(pk))
+
+
+def _cache_path(doc, instance):
+    """Where the current version of ``instance`` is cached, or None if it can't be."""
+    if not _cache_enabled() or not hasattr(instance, 'updated_at'):
+        return None
+    version = instance.updated_at.strftime('%Y%m%d%H%M%S%f') if instance.updated_at else '0'
+    return os.path.join(_cache_dir(doc.name, instance.pk), f'{version}-{template_hash(doc.name)}.pdf')
+
+
+def _store(path, pdf):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write aside and rename, so a concurrent download never sees half a file
+    fd, partial = tempfile.mkstemp(dir=directory, suffix='.part')
+    with os.fdopen(fd, 'wb') as out:
+        out.write(pdf)
+    os.replace(partial, path)
+    for entry in os.scandir(directory):
+        if entry.name.endswith('.pdf') and entry.path != path:
+            with suppress(FileNotFoundError):
+                os.remove(entry.path)
+
+
+def cached_file(name, instance):
+    """Path of the up-to-date cached PDF of ``instance`` as document ``name``, or None."""
+    path = _cache_path(get_document(name), instance)
+    return path if path and os.path.exists(path) else None
+
+
+def forget_document(model, pk):
+    """Deletes every cached PDF of the ``model`` row ``pk``."""
+    for doc in documents_for(model):
+        shutil.rmtree(_cache_dir(doc.name, pk), ignore_errors=True)
+
+
+def refresh_document(model, pk):
+    """After a write to a ``model`` row: re-render its PDFs in the background if prewarming is on."""
+    if not (_cache_enabled() and getattr(settings, 'PDF_CACHE_PREWARM', False)):
+        return
+    for doc in documents_for(model):
+        transaction.on_commit(lambda name=doc.name: enqueue('cache_pdf', document=name, pk=pk))
+
+
+def _lookup(name, instance):
+    doc = get_document(name)
+    if not isinstance(instance, doc.model):
+        instance = doc.model._default_manager.get(pk=instance)
+    return doc, instance, _cache_path(doc, instance)
+
+
+def render_document(name, instance, base_url=None):
+    """Document ``name`` of an instance or pk as ``(filename, pdf bytes)``, from the cache when fresh."""
+    doc, instance, path = _lookup(name, instance)
+    if path:
+        with suppress(FileNotFoundError), open(path, 'rb') as cached:
+            return doc.filename(instance), cached.read()
+    pdf = doc.render(instance, base_url=base_url)
+    if path:
+        _store(path, pdf)
+    return doc.filename(instance), pdf
+
+
+def pdf_response(filename, pdf):
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def pdf_view_response(request, name, instance):
+    """The PDF as a download, or a 202 with the job to poll when ``?background=true``."""
+    base_url = request.build_absolute_uri()
+    if wants_background(request):
+        job = enqueue('render_pdf', user=request.user, document=name, pk=instance.pk, base_url=base_url)
+        return Response(queued_response_data(job, request), status=202)
+    doc, instance, path = _lookup(name, instance)
+    if path:
+        with suppress(FileNotFoundError):
+            return FileResponse(open(path, 'rb'), as_attachment=True, filename=doc.filename(instance),
+                                content_type='application/pdf')
+    return pdf_response(*render_document(name, instance, base_url=base_url))
+
+
+# ──────────────────────────────────────────────────────────────
+# Warm WeasyPrint rendering
+# ──────────────────────────────────────────────────────────────
+_STYLE_BLOCK = re.compile(r'<style[^>]*>(.*?)</style>', re.S | re.I)
+
+
+def _warm_enabled():
+    return getattr(settings, 'PDF_WARM_RENDER', True)
+
+
+@lru_cache(maxsize=None)
+def _font_config():
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=None)
+def warm_template(template_name):
+    """``(template, stylesheets)``: the template with its inline ``<style>`` blocks parsed once."""
+    from weasyprint import CSS
+
+    template = get_template(template_name)
+    blocks = _STYLE_BLOCK.findall(template.template.source)
+    # Blocks with template tags differ per render, so leave them in the page
+    if any('{{' in block or '{%' in block for block in blocks):
+        return template, ()
+    return template, tuple(CSS(string=block, font_config=_font_config()) for block in blocks)
+
+
+def html_pdf(template_name, context, base_url=None):
+    """Renders a Django template to PDF with WeasyPrint."""
+    from weasyprint import HTML
+
+    if not _warm_enabled():
+        return HTML(string=render_to_string(template_name, context), base_url=base_url).write_pdf()
+    template, stylesheets = warm_template(template_name)
+    html = template.render(context)
+    if stylesheets:
+        html = _STYLE_BLOCK.sub('', html)
+    return HTML(string=html, base_url=base_url).write_pdf(stylesheets=stylesheets, font_config=_font_config())
+
+
+def preload():
+    """Loads every document's templates, stylesheets and fonts, so the next render starts warm."""
+    from weasyprint import HTML
+
+    _discover()
+    for doc in _DOCUMENTS.values():
+        for template_name in doc.templates:
+            warm_template(template_name)
+        template_hash(doc.name)
+    HTML(string='<p>warm-up</p>').write_pdf(font_config=_font_config())
+
+
+def display_name(party):
+    """Printable name of a customer or supplier."""
+    if party is None:
+        return 'N/A'
+    name = getattr(party, 'supplier_name', None) or getattr(party, 'company_name', None)
+    if not name:
+        name = f"{getattr(party, 'first_name', '')} {getattr(party, 'last_name', '') or ''}".strip()
+    return name or str(party)
+
+
+def simple_pdf(heading, lines):
+    """One-page ReportLab summary: a bold heading, then one paragraph per line."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    heading_style = ParagraphStyle('DocumentHeading', fontName='Helvetica-Bold', fontSize=14, leading=18)
+    body_style = ParagraphStyle('DocumentBody', fontName='Helvetica', fontSize=12, leading=16)
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(
+        [Paragraph(escape(heading), heading_style)]
+        + [Paragraph(escape(str(line)), body_style) for line in lines]
+    )
+    return buffer.getvalue()
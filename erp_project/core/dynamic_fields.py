@@ -0,0 +1,167 @@
+"""
+Sparse fieldsets for read endpoints: ``?fields=a,b,c`` and ``?exclude=x,y``.
+
+``DynamicFieldsMixin`` goes in front of ``serializers.ModelSerializer`` and
+accepts ``fields=`` / ``exclude=`` keyword arguments that drop serializer
+fields before anything is encoded.  ``trim_queryset`` then removes the
+matching work from the SQL side:
+
+* dropped plain columns are ``defer()``-ed,
+* dropped FK fields lose their ``select_related`` join and column,
+* dropped reverse/M2M fields lose their ``prefetch_related`` query.
+
+When a kept field is a ``SerializerMethodField`` (or any ``source='*'``
+field) we can't know which columns or relations it reads, so the queryset is
+left as it is: a deferred column it touches would cost a query per row.
+"""
+from django.core.exceptions import FieldDoesNotExist
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def parse_field_list(value):
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    return names or None
+
+
+def get_requested_fields(request):
+    """Serializer kwargs for the ``fields``/``exclude`` query params, if any."""
+    if request is None:
+        return {}
+    kwargs = {}
+    fields = parse_field_list(request.query_params.get(FIELDS_PARAM))
+    exclude = parse_field_list(request.query_params.get(EXCLUDE_PARAM))
+    if fields:
+        kwargs['fields'] = fields
+    if exclude:
+        kwargs['exclude'] = exclude
+    return kwargs
+
+
+def _flatten_select_related(tree, prefix=''):
+    paths = []
+    for name, subtree in tree.items():
+        path = f'{prefix}{name}'
+        nested = _flatten_select_related(subtree, f'{path}__') if subtree else []
+        paths.extend(nested or [path])
+    return paths
+
+
+def _lookup_root(lookup):
+    path = getattr(lookup, 'prefetch_through', lookup)
+    return path.split('__')[0]
+
+
+class DynamicFieldsMixin:
+    """
+    Lets callers pick the serialized fields:
+
+        ProductSerializer(qs, many=True, fields=['id', 'name', 'unit_price'])
+        SupplierSerializer(qs, many=True, exclude=['attachments'])
+
+    Unknown names are ignored so a stale client can't break the endpoint.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        self._dropped_fields = {}
+        if fields is None and exclude is None:
+            return
+
+        keep = set(self.fields)
+        if fields is not None:
+            keep &= set(fields)
+        if exclude is not None:
+            keep -= set(exclude)
+        for name in list(self.fields):
+            if name not in keep:
+                self._dropped_fields[name] = self.fields.pop(name)
+
+    def trim_queryset(self, queryset):
+        """
+        Returns ``queryset`` without the columns, joins and prefetches that
+        only fed the dropped fields.
+        """
+        if not self._dropped_fields:
+            return queryset
+
+        # SerializerMethodField reads from source='*' too
+        if any(field.source == '*' for field in self.fields.values()):
+            return queryset
+
+        opts = queryset.model._meta
+        protected = {opts.pk.name}
+        for field in self.fields.values():
+            source = field.source.split('.')[0]
+            protected.add(source)
+            # ``customer_id`` reads the same column as ``customer``
+            try:
+                protected.add(opts.get_field(source).name)
+            except FieldDoesNotExist:
+                pass
+        for name in queryset.query.order_by or opts.ordering:
+            if isinstance(name, str):
+                protected.add(name.lstrip('-').split('__')[0])
+
+        defer, drop_relations = [], set()
+        for name, field in self._dropped_fields.items():
+            source = name if field.source == '*' else field.source.split('.')[0]
+            if source in protected:
+                continue
+            try:
+                model_field = opts.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.name in protected:
+                continue
+            if model_field.is_relation:
+                drop_relations.add(model_field.name)
+                if not model_field.concrete or model_field.many_to_many:
+                    continue
+            elif not model_field.concrete:
+                continue
+            defer.append(model_field.name)
+
+        select_related = queryset.query.select_related
+        if drop_relations and isinstance(select_related, dict):
+            paths = [
+                path for path in _flatten_select_related(select_related)
+                if path.split('__')[0] not in drop_relations
+            ]
+            queryset = queryset.select_related(None)
+            if paths:
+                queryset = queryset.select_related(*paths)
+        elif select_related is True:
+            # select_related() with no args joins every FK; deferring one of
+            # them would make Django refuse the query.
+            defer = [name for name in defer if not opts.get_field(name).is_relation]
+
+        lookups = queryset._prefetch_related_lookups
+        if drop_relations and lookups:
+            kept = [lookup for lookup in lookups if _lookup_root(lookup) not in drop_relations]
+            if len(kept) != len(lookups):
+                queryset = queryset.prefetch_related(None)
+                if kept:
+                    queryset = queryset.prefetch_related(*kept)
+
+        if defer:
+            queryset = queryset.defer(*defer)
+        return queryset
+
+
+def apply_dynamic_fields(queryset, serializer_class, context, request):
+    """
+    Returns ``(queryset, serializer_kwargs)`` for the requested sparse fieldset.
+    The kwargs must be passed to the serializer that renders the queryset.
+    """
+    kwargs = get_requested_fields(request)
+    if not kwargs or not issubclass(serializer_class, DynamicFieldsMixin):
+        return queryset, {}
+    probe = serializer_class(context=context, **kwargs)
+    return probe.trim_queryset(queryset), kwargs
@@ -0,0 +1,228 @@
+"""
+Bulk PDF export: many documents of one type in a single ZIP.
+
+``PDFExport(name, pks)`` iterates over the ZIP's bytes.  Documents with an
+up-to-date file in the PDF cache (core/documents.py) are added straight
+from disk; the rest are rendered by a pool of forked processes and added in
+the order they finish, so the download starts with the first file instead
+of after the last.  Documents that fail to render are listed in
+``errors.txt`` inside the archive rather than aborting it.
+
+``export_pdfs_response`` is what the export views return: the ZIP streamed
+with an ``X-Job-Id`` header whose job shows progress while it downloads, or
+a queued ``export_pdfs`` job whose result is the ZIP.  Exports go to the
+job with ``?background=true`` and always above ``PDF_EXPORT_INLINE_MAX``
+documents: an inline export renders one document at a time inside the web
+worker, which only fits a handful of documents into the request timeout.
+"""
+import multiprocessing
+import os
+import traceback
+import zipfile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .documents import cached_file, get_document, render_document
+from .jobs import enqueue, queued_response_data, wants_background, worker_name
+from .models import Job
+
+DEFAULT_MAX_DOCUMENTS = 2000
+DEFAULT_INLINE_MAX_DOCUMENTS = 20
+
+
+def export_processes():
+    return getattr(settings, 'PDF_EXPORT_PROCESSES', None) or min(4, os.cpu_count() or 1)
+
+
+def _render(args):
+    name, pk = args
+    try:
+        filename, pdf = render_document(name, pk)
+    except Exception as error:
+        return pk, None, None, f'{type(error).__name__}: {error}'
+    return pk, filename, pdf, None
+
+
+class _Chunks:
+    """Write-only file for ZipFile that hands back what was written since the last ``take``."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+class PDFExport:
+    """The ZIP of document ``name`` for ``pks``, as an iterator of byte chunks."""
+
+    def __init__(self, name, pks, job=None, processes=None):
+        self.doc = get_document(name)
+        self.pks = list(pks)
+        self.job = job
+        self.processes = processes or export_processes()
+        self.done = 0
+        self.cached = 0
+        self.errors = {}
+
+    @property
+    def total(self):
+        return len(self.pks)
+
+    def summary(self):
+        return {
+            'document': self.doc.name,
+            'total': self.total,
+            'exported': self.done - len(self.errors),
+            'from_cache': self.cached,
+            'failed': self.errors,
+        }
+
+    def __iter__(self):
+        out = _Chunks()
+        names = set()
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for pk, filename, pdf, error in self._documents():
+                self.done += 1
+                if error:
+                    self.errors[pk] = error
+                else:
+                    archive.writestr(self._unique(filename, names), pdf)
+                self._report()
+                yield out.take()
+            if self.errors:
+                archive.writestr('errors.txt', ''.join(
+                    f'{self.doc.name} {pk}: {error}\n' for pk, error in self.errors.items()
+                ))
+        yield out.take()
+
+    @staticmethod
+    def _unique(filename, names):
+        stem, ext = os.path.splitext(filename)
+        candidate, n = filename, 1
+        while candidate in names:
+            n += 1
+            candidate = f'{stem} ({n}){ext}'
+        names.add(candidate)
+        return candidate
+
+    def _report(self):
+        if not self.job:
+            return
+        progress = self.done * 100 // max(self.total, 1)
+        # One UPDATE per percent, not per document
+        if progress != self.job.progress or self.done == self.total:
+            self.job.report(min(progress, 99), f'{self.done} of {self.total} documents')
+
+    def _documents(self):
+        """Yields ``(pk, filename, pdf, error)`` for every pk: cached files first, then as rendered."""
+        instances = self.doc.model._default_manager.in_bulk(self.pks)
+        to_render = []
+        for pk in self.pks:
+            instance = instances.get(pk)
+            if instance is None:
+                yield pk, None, None, 'Not found'
+                continue
+            path = cached_file(self.doc.name, instance)
+            if path is None:
+                to_render.append(pk)
+                continue
+            with open(path, 'rb') as cached:
+                pdf = cached.read()
+            self.cached += 1
+            yield pk, self.doc.filename(instance), pdf, None
+
+        tasks = [(self.doc.name, pk) for pk in to_render]
+        # Forked children can't share our connections, and an open transaction can't be closed
+        in_transaction = any(conn.in_atomic_block for conn in connections.all())
+        if self.processes < 2 or len(tasks) < 2 or in_transaction:
+            yield from map(_render, tasks)
+            return
+        connections.close_all()
+        pool = multiprocessing.get_context('fork').Pool(min(self.processes, len(tasks)))
+        try:
+            yield from pool.imap_unordered(_render, tasks)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+def _stream(export, job):
+    try:
+        yield from export
+    except GeneratorExit:
+        Job.objects.filter(pk=job.pk).update(
+            status='Failed', error='Download interrupted', finished_at=timezone.now(),
+        )
+        raise
+    except Exception:
+        Job.objects.filter(pk=job.pk).update(
+            status='Failed', error=traceback.format_exc(), finished_at=timezone.now(),
+        )
+        raise
+    Job.objects.filter(pk=job.pk).update(
+        status='Succeeded', progress=100, message=f'{export.done} of {export.total} documents',
+        result=export.summary(), finished_at=timezone.now(),
+    )
+
+
+def export_pdfs_response(request, name, queryset, filters):
+    """
+    Exports the PDFs of document ``name`` picked by the request body: either
+    ``{"ids": [...]}`` or any of the ``filters`` keys, each mapped to the
+    queryset lookup it applies (``{'date_from': 'invoice_date__gte'}``).
+    """
+    ids = request.data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            return Response({'error': '"ids" must be a list of integers'}, status=400)
+        queryset = queryset.filter(pk__in=ids)
+    else:
+        lookups = {lookup: request.data[key] for key, lookup in filters.items()
+                   if request.data.get(key) not in (None, '')}
+        if not lookups:
+            return Response({'error': f'Pass "ids" or at least one of: {", ".join(filters)}'}, status=400)
+        try:
+            queryset = queryset.filter(**lookups)
+        except ValidationError as error:
+            return Response({'error': ' '.join(error.messages)}, status=400)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=400)
+
+    limit = getattr(settings, 'PDF_EXPORT_MAX_DOCUMENTS', DEFAULT_MAX_DOCUMENTS)
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:limit + 1])
+    if not pks:
+        return Response({'error': 'No documents match'}, status=404)
+    if len(pks) > limit:
+        return Response({'error': f'Export at most {limit} documents at a time'}, status=400)
+
+    inline_limit = getattr(settings, 'PDF_EXPORT_INLINE_MAX', DEFAULT_INLINE_MAX_DOCUMENTS)
+    if wants_background(request) or len(pks) > inline_limit:
+        job = enqueue('export_pdfs', user=request.user, document=name, pks=pks)
+        return Response(queued_response_data(job, request), status=202)
+
+    job = Job.objects.create(
+        task='export_pdfs', params={'document': name, 'pks': pks}, status='Running',
+        worker=worker_name(), attempts=1, started_at=timezone.now(), created_by=request.user,
+    )
+    # No render pool in a web worker: forking it would copy the whole server process
+    export = PDFExport(name, pks, job=job, processes=1)
+    response = StreamingHttpResponse(_stream(export, job), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{name}_export_{job.pk}.zip"'
+    response['X-Job-Id'] = str(job.pk)
+    return response
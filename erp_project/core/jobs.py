@@ -0,0 +1,176 @@
+"""
+Background jobs without an external broker.
+
+Slow work (PDF rendering, imports, ...) is queued as a ``Job`` row and run
+by ``manage.py run_workers``.  Clients poll ``/api/jobs/<id>/`` for status
+and progress and download the file from ``/api/jobs/<id>/result/``.
+
+Tasks are plain functions registered in an app's ``tasks.py``; they get the
+job first and the queued params as keyword arguments, and return a
+JSON-serializable result:
+
+    @task('render_pdf')
+    def render_pdf(job, document, pk):
+        job.report(10, 'Rendering')
+        save_result(job, 'quotation.pdf', pdf_bytes)
+        return {'size': len(pdf_bytes)}
+
+    job = enqueue('render_pdf', user=request.user, document='quotation', pk=1)
+
+A worker claims a queued row with a conditional UPDATE, so any number of
+workers can share the table and a job runs once.  ``enqueue`` is usually
+called inside the request's transaction; workers only see the job once that
+commits.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RESULT_DIR = 'jobs'
+
+_TASKS = {}
+
+
+def task(name):
+    """Registers the decorated function as the task called ``name``."""
+    def register(func):
+        _TASKS[name] = func
+        return func
+    return register
+
+
+def get_task(name):
+    if name not in _TASKS:
+        autodiscover_modules('tasks')
+    try:
+        return _TASKS[name]
+    except KeyError:
+        raise LookupError(f'Unknown task "{name}"') from None
+
+
+def enqueue(name, user=None, **params):
+    """Queues task ``name`` with JSON-serializable ``params``; returns the Job."""
+    get_task(name)
+    return Job.objects.create(task=name, params=params, created_by=user)
+
+
+def wants_background(request):
+    """True when the client asked for ``?background=true`` instead of an inline result."""
+    return request.query_params.get('background', '').lower() in ('1', 'true', 'yes')
+
+
+def queued_response_data(job, request):
+    """Body of a 202 response for ``job``, with the URL to poll."""
+    return {
+        'message': 'Job queued',
+        'data': {
+            'id': job.pk,
+            'status': job.status,
+            'status_url': request.build_absolute_uri(f'/api/jobs/{job.pk}/'),
+        },
+    }
+
+
+def save_result(job, filename, content):
+    """
+    Stores ``content`` (bytes, str or an open file) as the job's result file;
+    returns its path under MEDIA_ROOT.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    content = File(content) if hasattr(content, 'read') else ContentFile(content)
+    path = default_storage.save(f'{RESULT_DIR}/{job.pk}/{filename}', content)
+    Job.objects.filter(pk=job.pk).update(result_path=path)
+    job.result_path = path
+    return path
+
+
+def worker_name(pid=None):
+    return f'{socket.gethostname()}:{pid or os.getpid()}'
+
+
+def claim_next(worker=None):
+    """Marks the oldest queued job Running for this worker and returns it, or None."""
+    worker = worker or worker_name()
+    while True:
+        pk = Job.objects.filter(status='Queued').order_by('pk').values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        # Only one worker's UPDATE can still see the row as Queued
+        claimed = Job.objects.filter(pk=pk, status='Queued').update(
+            status='Running', worker=worker, attempts=F('attempts') + 1,
+            started_at=timezone.now(), updated_at=timezone.now(),
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+
+
+def run_job(job):
+    """Runs a claimed job and records the outcome; returns True on success."""
+    try:
+        result = get_task(job.task)(job, **job.params)
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+        Job.objects.filter(pk=job.pk).update(
+            status='Failed', error=traceback.format_exc(), finished_at=timezone.now(),
+        )
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status='Succeeded', progress=100, result=result, finished_at=timezone.now(),
+    )
+    return True
+
+
+def work(worker=None, max_jobs=None, poll_interval=1.0, burst=False, should_stop=lambda: False):
+    """
+    Claims and runs jobs until ``should_stop()``, ``max_jobs`` have run, or,
+    with ``burst``, the queue is empty.  Returns how many jobs ran.
+    """
+    done = 0
+    while not should_stop():
+        job = claim_next(worker)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        done += 1
+        if max_jobs and done >= max_jobs:
+            break
+    return done
+
+
+def requeue_stale(older_than=timedelta(hours=1)):
+    """
+    Puts Running jobs that haven't reported since ``older_than`` (their worker
+    died) back in the queue, or fails them after MAX_ATTEMPTS.  Returns the count.
+    """
+    return _requeue(Job.objects.filter(status='Running', updated_at__lt=timezone.now() - older_than))
+
+
+def requeue_worker(worker):
+    """Same for the Running jobs of ``worker``, which is known to have died."""
+    return _requeue(Job.objects.filter(status='Running', worker=worker))
+
+
+def _requeue(running):
+    failed = running.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='Failed', error='Worker stopped before the job finished', finished_at=timezone.now(),
+    )
+    requeued = running.update(status='Queued', worker='', updated_at=timezone.now())
+    return failed + requeued
@@ -0,0 +1,23 @@
+# core/management/commands/backfill_order_totals.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crm.models import Quotation, SalesOrder
+from crm.totals import backfill_totals
+
+
+class Command(BaseCommand):
+    help = 'Store subtotal/tax/grand totals on quotations and sales orders saved before those columns existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Orders checked per transaction')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        for model in (Quotation, SalesOrder):
+            checked, changed = backfill_totals(model, chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: updated {changed} of {checked}'
+            ))
@@ -0,0 +1,62 @@
+# core/management/commands/benchmark_pdf_renders.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core.documents import get_document, preload
+
+DOCUMENTS = ('quotation', 'sales_order', 'supplier')
+
+
+class Command(BaseCommand):
+    help = 'Measure WeasyPrint render throughput: cold and warm in-process'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Renders of each document per mode')
+        parser.add_argument('--min-speedup', type=float, default=0,
+                            help='Fail unless warm renders at least this many times faster than cold')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        targets = []
+        for name in DOCUMENTS:
+            doc = get_document(name)
+            instance = doc.model._default_manager.order_by('pk').first()
+            if instance is None:
+                raise CommandError(f'No {doc.model.__name__} to render; run seed_perf_data first')
+            targets.append((doc, instance))
+        renders = targets * options['iterations']
+
+        # Renders call doc.render directly: the PDF cache would turn every mode into file reads
+        results = []
+        with override_settings(PDF_WARM_RENDER=False):
+            for doc, instance in targets:
+                doc.render(instance)  # imports and Django's template loader, paid once in any process
+            results.append(('cold', self.timed(lambda: [doc.render(instance) for doc, instance in renders])))
+
+        with override_settings(PDF_WARM_RENDER=True):
+            preload()
+            results.append(('warm', self.timed(lambda: [doc.render(instance) for doc, instance in renders])))
+
+        self.print_table(results, len(renders))
+        speedup = results[0][1] / results[-1][1]
+        if options['min_speedup'] and speedup < options['min_speedup']:
+            raise CommandError(f'Warm is {speedup:.1f}x cold, below --min-speedup {options["min_speedup"]}')
+
+    @staticmethod
+    def timed(run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
+
+    def print_table(self, results, count):
+        cold = results[0][1]
+        self.stdout.write(f'{count} renders per mode ({", ".join(DOCUMENTS)}) on {os.cpu_count()} CPUs')
+        self.stdout.write(f'{"mode":<6} {"seconds":>9} {"renders/s":>10} {"speedup":>8}')
+        for mode, seconds in results:
+            self.stdout.write(f'{mode:<6} {seconds:>9.2f} {count / seconds:>10.1f} {cold / seconds:>7.1f}x')
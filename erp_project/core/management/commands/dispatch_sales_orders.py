@@ -0,0 +1,49 @@
+# core/management/commands/dispatch_sales_orders.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crm.conversions import DELIVERABLE_STATUSES, create_delivery_notes, create_invoices
+from crm.models import SalesOrder
+
+
+class Command(BaseCommand):
+    help = 'Deliver (and optionally invoice) sales orders in batches, e.g. for end-of-day dispatch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='Sales order pks (default: every deliverable order)')
+        parser.add_argument('--status', action='append', choices=DELIVERABLE_STATUSES,
+                            help='Only orders in this status; repeat for several (default: all deliverable)')
+        parser.add_argument('--invoice', action='store_true', help='Also invoice each batch once delivered')
+        parser.add_argument('--batch-size', type=int, default=200, help='Orders converted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many orders would ship')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        orders = SalesOrder.objects.filter(status__in=options['status'] or DELIVERABLE_STATUSES)
+        if options['ids']:
+            orders = orders.filter(pk__in=options['ids'])
+        order_ids = list(orders.order_by('pk').values_list('pk', flat=True))
+
+        if options['dry_run']:
+            self.stdout.write(f'{len(order_ids)} sales orders to dispatch')
+            return
+
+        started = time.monotonic()
+        delivered = invoiced = 0
+        size = options['batch_size']
+        for start in range(0, len(order_ids), size):
+            batch = order_ids[start:start + size]
+            delivered += len(create_delivery_notes(batch))
+            if options['invoice']:
+                invoiced += len(create_invoices(batch))
+
+        summary = f'{delivered} delivery notes'
+        if options['invoice']:
+            summary += f', {invoiced} invoices'
+        self.stdout.write(self.style.SUCCESS(
+            f'{summary} for {len(order_ids)} sales orders in {time.monotonic() - started:.2f}s'
+        ))
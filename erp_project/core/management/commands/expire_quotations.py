@@ -0,0 +1,49 @@
+# core/management/commands/expire_quotations.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+from crm.expiry import DEFAULT_CHUNK_SIZE, due_quotations, expire_due_quotations
+
+
+class Command(BaseCommand):
+    help = 'Mark quotations past their expiry date as Expired, in chunked batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Quotations updated per transaction')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Keep running and sweep every N seconds (default: sweep once and exit)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many are due')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if options['interval'] < 0:
+            raise CommandError('--interval cannot be negative')
+
+        if options['dry_run']:
+            self.stdout.write(f'{due_quotations().count()} quotations due to expire')
+            return
+
+        while True:
+            started = time.monotonic()
+            try:
+                expired = expire_due_quotations(chunk_size=options['chunk_size'])
+            except DatabaseError as error:
+                # A long-running sweep outlives a database restart; retry next interval
+                if not options['interval']:
+                    raise
+                self.stderr.write(f'{timezone.now():%Y-%m-%d %H:%M:%S} sweep failed: {error}')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{timezone.now():%Y-%m-%d %H:%M:%S} expired {expired} quotations '
+                    f'in {time.monotonic() - started:.2f}s'
+                ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+            close_old_connections()
@@ -0,0 +1,82 @@
+# core/management/commands/run_benchmarks.py
+
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    SCENARIO_KINDS, BenchmarkRunner, build_report, build_scenarios, compare_reports, load_report,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API in-process and write latency/throughput/query/RSS results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per scenario')
+        parser.add_argument('--kind', action='append', choices=SCENARIO_KINDS,
+                            help='Only run scenarios of this kind (repeatable)')
+        parser.add_argument('--only', action='append', default=[],
+                            help='Only run scenarios whose name starts with this (repeatable)')
+        parser.add_argument('--import-rows', type=int, default=50, help='Rows per import request')
+        parser.add_argument('--keep-writes', action='store_true',
+                            help='Keep the rows created by write scenarios instead of deleting them')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the JSON results')
+        parser.add_argument('--compare', help='Earlier results file to diff against')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        scenarios, skipped = build_scenarios(import_rows=options['import_rows'])
+        if options['kind']:
+            scenarios = [scenario for scenario in scenarios if scenario.kind in options['kind']]
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if scenario.name.startswith(tuple(options['only']))]
+        if not scenarios:
+            raise CommandError('No scenarios selected')
+
+        runner = BenchmarkRunner(
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            cleanup=not options['keep_writes'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(f'Running {len(scenarios)} scenarios x {runner.iterations} requests')
+        results = runner.run(scenarios)
+        report = build_report(results, runner, skipped)
+
+        self.print_table(report)
+        for name, reason in skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {name}: {reason}'))
+
+        output = options['output']
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+        if options['compare']:
+            self.print_comparison(load_report(options['compare']), report)
+
+    def print_table(self, report):
+        header = f"{'scenario':<28} {'req':>5} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'rss MB':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in report['scenarios']:
+            latency = row['latency_ms']
+            self.stdout.write(
+                f"{row['name']:<28} {row['requests']:>5} {row['errors']:>4} {row['throughput_rps'] or 0:>8} "
+                f"{latency['p50'] or 0:>8} {latency['p95'] or 0:>8} {latency['p99'] or 0:>8} "
+                f"{row['queries']['mean'] if row['queries']['mean'] is not None else '-':>8} "
+                f"{row['peak_rss_kb'] / 1024:>8.1f}"
+            )
+
+    def print_comparison(self, old, new):
+        self.stdout.write(f"\nAgainst {old.get('revision') or 'previous run'}:")
+        for name, metric, before, after, change in compare_reports(old, new):
+            change_text = f'{change:+.1f}%' if change is not None else 'n/a'
+            self.stdout.write(f'  {name:<28} {metric:<8} {before!s:>10} -> {after!s:<10} {change_text}')
@@ -0,0 +1,87 @@
+# core/management/commands/run_workers.py
+
+import multiprocessing
+import os
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.jobs import requeue_stale, requeue_worker, work, worker_name
+
+# Exit code of a worker that stopped after --max-jobs and wants replacing
+RECYCLE = 75
+
+
+def _worker(max_jobs, poll_interval, burst, stop, parent):
+    # Never share the parent's database connection across the fork
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Not daemonic, so tasks may start their own pools; stop if the parent dies instead
+    done = work(worker_name(), max_jobs=max_jobs, poll_interval=poll_interval, burst=burst,
+                should_stop=lambda: stop.is_set() or os.getppid() != parent)
+    connections.close_all()
+    os._exit(RECYCLE if max_jobs and done >= max_jobs else 0)
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Worker processes to keep running')
+        parser.add_argument('--max-jobs', type=int, default=100,
+                            help='Replace a worker after it has run this many jobs (0: never)')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds an idle worker waits before checking the queue again')
+        parser.add_argument('--stale-after', type=int, default=3600,
+                            help='Requeue Running jobs with no progress for this many seconds at startup')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['processes'] < 1:
+            raise CommandError('--processes must be at least 1')
+        if options['max_jobs'] < 0:
+            raise CommandError('--max-jobs cannot be negative')
+
+        requeued = requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f'Requeued or failed {requeued} stale jobs')
+
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+        def start():
+            process = context.Process(
+                target=_worker,
+                args=(options['max_jobs'] or None, options['poll_interval'], options['burst'], stop, os.getpid()),
+            )
+            process.start()
+            return process
+
+        connections.close_all()
+        pool = [start() for _ in range(options['processes'])]
+        self.stdout.write(self.style.SUCCESS(f'Started {len(pool)} workers'))
+
+        while pool:
+            time.sleep(0.2)
+            for index, process in enumerate(pool):
+                if process is None or process.is_alive():
+                    continue
+                process.join()
+                # Recycled workers are replaced; in burst mode an idle exit means the queue is drained
+                replace = not stop.is_set() and (process.exitcode == RECYCLE or not options['burst'])
+                if process.exitcode not in (0, RECYCLE):
+                    self.stderr.write(f'Worker {process.pid} exited with code {process.exitcode}')
+                    # Killed mid-job (OOM, segfault): its job would stay Running until --stale-after
+                    requeued = requeue_worker(worker_name(process.pid))
+                    connections.close_all()
+                    if requeued:
+                        self.stderr.write(f'Requeued or failed {requeued} jobs of worker {process.pid}')
+                pool[index] = start() if replace else None
+            pool = [process for process in pool if process is not None]
+
+        self.stdout.write('All workers stopped')
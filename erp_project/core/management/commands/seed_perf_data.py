@@ -0,0 +1,598 @@
+# core/management/commands/seed_perf_data.py
+
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.counting import bump_table_version
+from core.models import Candidate
+from core.pricing import line_total
+from core.sequences import allocate_block, last_number
+from crm.models import (
+    DeliveryNote, DeliveryNoteItem, Enquiry, EnquiryItem, Invoice, InvoiceItem,
+    Quotation, QuotationItem, SalesOrder, SalesOrderItem,
+)
+from crm.totals import apply_totals
+from finance.models import CreditNote, CreditNoteItem, DebitNote, DebitNoteItem
+from masters.models import (
+    UOM, Branch, Category, Color, Customer, Department, Product, ProductSupplier,
+    Role, Size, Supplier, TaxCode, Warehouse,
+)
+from purchase.models import (
+    BatchNumber, BatchSerialNumber, PurchaseOrder, PurchaseOrderItem, SerialNumber,
+    StockReceipt, StockReceiptItem,
+)
+
+User = get_user_model()
+
+# Rows created per unit of --scale.
+PER_SCALE = {
+    'branches': 2,
+    'users': 20,
+    'candidates': 10,
+    'products': 200,
+    'customers': 100,
+    'suppliers': 20,
+    'enquiries': 100,
+    'quotations': 200,
+    'sales_orders': 150,
+    'delivery_notes': 100,
+    'invoices': 100,
+    'purchase_orders': 50,
+    'stock_receipts': 50,
+    'credit_notes': 20,
+    'debit_notes': 20,
+}
+
+DEPARTMENTS = [('SAL', 'Sales'), ('PUR', 'Purchase'), ('FIN', 'Finance'), ('WH', 'Warehouse')]
+ROLES = ['Sales Representative', 'Manager', 'Executive']
+TAX_RATES = [Decimal('0.00'), Decimal('5.00'), Decimal('12.00'), Decimal('18.00'), Decimal('28.00')]
+CITIES = ['Hyderabad', 'Bengaluru', 'Chennai', 'Mumbai', 'Pune', 'Delhi', 'Kolkata']
+FIRST_NAMES = ['Arjun', 'Priya', 'Rahul', 'Sneha', 'Vikram', 'Ananya', 'Kiran', 'Divya', 'Ravi', 'Meera']
+LAST_NAMES = ['Sharma', 'Reddy', 'Iyer', 'Patel', 'Nair', 'Gupta', 'Rao', 'Das', 'Menon', 'Singh']
+PRODUCT_WORDS = ['Steel', 'Copper', 'Industrial', 'Compact', 'Heavy Duty', 'Smart', 'Portable', 'Modular']
+PRODUCT_NOUNS = ['Valve', 'Pump', 'Bearing', 'Sensor', 'Cable', 'Motor', 'Panel', 'Switch', 'Filter']
+
+CENT = Decimal('0.01')
+
+
+class Command(BaseCommand):
+    help = 'Bulk-load realistic related data across the ERP models for performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Multiplier for the row counts in PER_SCALE')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per bulk_create batch')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        if scale < 1:
+            raise CommandError('--scale must be at least 1')
+
+        self.chunk_size = options['chunk_size']
+        self.rng = random.Random(options['seed'])
+        # Keeps unique columns (emails, tax ids, serials) distinct across runs,
+        # including repeated runs with the same --seed.
+        self.tag = uuid.uuid4().hex[:6]
+        self.today = timezone.now().date()
+        self.counts = {name: per_unit * scale for name, per_unit in PER_SCALE.items()}
+        self.created = {}
+
+        started = time.perf_counter()
+        self.seed_organisation()
+        self.seed_inventory_masters()
+        self.seed_products()
+        self.seed_parties()
+        self.seed_enquiries()
+        self.seed_quotations()
+        self.seed_sales_orders()
+        self.seed_delivery_notes()
+        self.seed_invoices()
+        self.seed_purchases()
+        self.seed_finance_notes()
+
+        for model in self.created:
+            bump_table_version(model._meta.db_table)
+
+        for model, count in self.created.items():
+            self.stdout.write(f'  {model._meta.label:<28} {count:>8}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {sum(self.created.values())} rows at scale {scale} '
+            f'in {time.perf_counter() - started:.1f}s (tag {self.tag})'
+        ))
+
+    # ────────────────────────────────────────────────
+    # Helpers
+    # ────────────────────────────────────────────────
+
+    def bulk(self, model, objs, key=None):
+        """
+        bulk_create in chunks.  With ``key`` (a unique column) returns the new
+        primary keys in the order of ``objs``; MySQL doesn't hand them back.
+        """
+        for start in range(0, len(objs), self.chunk_size):
+            model.objects.bulk_create(objs[start:start + self.chunk_size])
+        self.created[model] = self.created.get(model, 0) + len(objs)
+        if key is None:
+            return None
+
+        values = [getattr(obj, key) for obj in objs]
+        pks = {}
+        for start in range(0, len(values), self.chunk_size):
+            chunk = values[start:start + self.chunk_size]
+            pks.update(model.objects.filter(**{f'{key}__in': chunk}).values_list(key, 'pk'))
+        return [pks[value] for value in values]
+
+    def reserve(self, name, model, field, count_name):
+        """First number of a block from the model's core.Sequence counter."""
+        block = allocate_block(name, self.counts[count_name], initial=lambda: last_number(model, field))
+        return block.start
+
+    def past_date(self, days=365):
+        return self.today - timedelta(days=self.rng.randint(0, days))
+
+    def person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def phone(self):
+        return f'9{self.rng.randint(100000000, 999999999)}'
+
+    def lines(self, low=1, high=5):
+        """Random (product, quantity) pairs without repeating a product."""
+        picks = self.rng.sample(self.products, self.rng.randint(low, min(high, len(self.products))))
+        return [(product, self.rng.randint(1, 20)) for product in picks]
+
+    # ────────────────────────────────────────────────
+    # Stages
+    # ────────────────────────────────────────────────
+
+    @transaction.atomic
+    def seed_organisation(self):
+        branch_names = [f'Perf {self.tag} {city} {i + 1}' for i, city in
+                        enumerate(self.rng.choice(CITIES) for _ in range(self.counts['branches']))]
+        branch_ids = self.bulk(Branch, [Branch(name=name) for name in branch_names], key='name')
+
+        departments = [
+            Department(branch_id=branch_id, code=f'{code}-{self.tag}-{b}', department_name=name)
+            for b, branch_id in enumerate(branch_ids) for code, name in DEPARTMENTS
+        ]
+        department_ids = self.bulk(Department, departments, key='code')
+
+        full = {'view': True, 'create': True, 'edit': True, 'delete': False, 'full_access': False}
+        permissions = {category: dict(full) for category in ('masters', 'inventory', 'customer', 'supplier', 'dashboard', 'profile')}
+        roles = [
+            Role(department_id=department_id, branch_id=branch_ids[d // len(DEPARTMENTS)], role=role, permissions=permissions)
+            for d, department_id in enumerate(department_ids) for role in ROLES
+        ]
+        self.bulk(Role, roles)
+        role_rows = list(Role.objects.filter(department_id__in=department_ids).values_list('id', 'department_id', 'role'))
+        self.sales_rep_role_ids = [row[0] for row in role_rows if row[2] == 'Sales Representative']
+        department_of_role = {row[0]: row[1] for row in role_rows}
+        branch_of_department = {department_id: branch_ids[d // len(DEPARTMENTS)] for d, department_id in enumerate(department_ids)}
+
+        # Hashing is deliberately slow; every seeded user shares one hash.
+        password = make_password('Perf@12345')
+        users = []
+        for i in range(self.counts['users']):
+            role_id = self.rng.choice([row[0] for row in role_rows])
+            department_id = department_of_role[role_id]
+            first_name, last_name = self.person()
+            users.append(User(
+                email=f'perf.user.{self.tag}.{i}@example.com', password=password,
+                first_name=first_name, last_name=last_name, contact_number=self.phone(),
+                branch_id=branch_of_department[department_id], department_id=department_id, role_id=role_id,
+                employee_id=f'PERF-{self.tag}-{i:05d}',
+            ))
+        self.user_ids = self.bulk(User, users, key='email')
+        self.sales_rep_ids = list(
+            User.objects.filter(pk__in=self.user_ids, role_id__in=self.sales_rep_role_ids).values_list('pk', flat=True)
+        ) or self.user_ids
+
+        start = self.reserve('STA', Candidate, 'employee_code', 'candidates')
+        candidates = []
+        for i in range(self.counts['candidates']):
+            first_name, last_name = self.person()
+            department_id = self.rng.choice(department_ids)
+            candidates.append(Candidate(
+                employee_code=f'STA{start + i:04d}', first_name=first_name, last_name=last_name,
+                department_id=department_id, branch_id=branch_of_department[department_id],
+                gender=self.rng.choice(['Male', 'Female']), joining_date=self.past_date(1500),
+                personal_number=self.phone(), email=f'perf.candidate.{self.tag}.{i}@example.com',
+                aadhar_number=f'{self.rng.randint(10 ** 11, 10 ** 12 - 1)}',
+                pan_number=f'ABCDE{self.rng.randint(1000, 9999)}F',
+            ))
+        self.candidate_ids = self.bulk(Candidate, candidates, key='employee_code')
+        self.branch_ids = branch_ids
+
+    @transaction.atomic
+    def seed_inventory_masters(self):
+        def named(model, names, **extra):
+            return self.bulk(model, [model(name=f'{name} {self.tag}', **extra) for name in names], key='name')
+
+        self.category_ids = named(Category, ['Hardware', 'Electrical', 'Plumbing', 'Tools', 'Safety'])
+        tax_codes = [TaxCode(name=f'GST {rate} {self.tag}', percentage=rate) for rate in TAX_RATES]
+        tax_ids = self.bulk(TaxCode, tax_codes, key='name')
+        self.tax_codes = list(zip(tax_ids, TAX_RATES))
+        self.uoms = [
+            (uom_id, name) for uom_id, name in zip(
+                self.bulk(UOM, [UOM(name=f'{name} {self.tag}', items=items) for name, items in
+                                [('Nos', 1), ('Box', 10), ('Pack', 6), ('Kg', 1)]], key='name'),
+                ['Nos', 'Box', 'Pack', 'Kg'],
+            )
+        ]
+        warehouses = [Warehouse(name=f'WH {city} {self.tag}', location=city) for city in CITIES[:4]]
+        self.warehouse_ids = self.bulk(Warehouse, warehouses, key='name')
+        self.size_ids = named(Size, ['S', 'M', 'L', 'XL'])
+        self.color_ids = named(Color, ['Red', 'Blue', 'Black', 'Silver'])
+        self.product_supplier_ids = named(ProductSupplier, ['Acme', 'Globex', 'Initech'])
+
+    @transaction.atomic
+    def seed_products(self):
+        product_ids = Product.allocate_product_ids(self.counts['products'])
+        products = []
+        for i in range(self.counts['products']):
+            tax_id, tax_rate = self.rng.choice(self.tax_codes)
+            uom_id, _ = self.rng.choice(self.uoms)
+            products.append(Product(
+                product_id=product_ids[i],
+                name=f'{self.rng.choice(PRODUCT_WORDS)} {self.rng.choice(PRODUCT_NOUNS)} {product_ids[i][3:]}',
+                product_type=self.rng.choice(['Goods', 'Goods', 'Services', 'Combo']),
+                category_id=self.rng.choice(self.category_ids),
+                unit_price=Decimal(self.rng.randint(100, 500000)) / 100,
+                discount=self.rng.choice([Decimal('0.00'), Decimal('0.00'), Decimal('5.00'), Decimal('10.00')]),
+                tax_code_id=tax_id, uom_id=uom_id,
+                quantity=self.rng.randint(0, 500), stock_level=self.rng.randint(0, 500),
+                reorder_level=self.rng.randint(5, 50),
+                warehouse_id=self.rng.choice(self.warehouse_ids),
+                size_id=self.rng.choice(self.size_ids), color_id=self.rng.choice(self.color_ids),
+                supplier_id=self.rng.choice(self.product_supplier_ids),
+                status=self.rng.choice(['Active', 'Active', 'Active', 'Inactive', 'Discontinued']),
+                product_usage=self.rng.choice(['Purchase', 'Sale', 'Both']),
+            ))
+        for product, pk in zip(products, self.bulk(Product, products, key='product_id')):
+            product.pk = pk
+
+        # (pk, product_id, name, unit_price, discount, tax_code_id, tax_rate, uom_id, uom name)
+        rates = dict(self.tax_codes)
+        uom_names = dict(self.uoms)
+        self.products = [
+            (p.pk, p.product_id, p.name, p.unit_price, p.discount, p.tax_code_id, rates[p.tax_code_id], p.uom_id, uom_names[p.uom_id])
+            for p in products
+        ]
+
+    @transaction.atomic
+    def seed_parties(self):
+        start = self.reserve('CUS', Customer, 'customer_id', 'customers')
+        customers = []
+        for i in range(self.counts['customers']):
+            first_name, last_name = self.person()
+            city = self.rng.choice(CITIES)
+            customer_type = self.rng.choice(['Individual', 'Business', 'Organization'])
+            customers.append(Customer(
+                customer_id=f'CUS{start + i:04d}', first_name=first_name, last_name=last_name,
+                customer_type=customer_type, assigned_sales_rep_id=self.rng.choice(self.sales_rep_ids),
+                email=f'perf.customer.{self.tag}.{i}@example.com', phone_number=self.phone(),
+                street=f'{self.rng.randint(1, 999)} Main Road', city=city, state=city, country='India',
+                company_name=f'{last_name} Traders' if customer_type != 'Individual' else None,
+                credit_limit=Decimal(self.rng.choice([50000, 100000, 250000])),
+                billing_address=f'{self.rng.randint(1, 999)} Main Road, {city}',
+            ))
+        customer_ids = self.bulk(Customer, customers, key='customer_id')
+        self.customers = [
+            (pk, f'{c.first_name} {c.last_name}', c.email, c.phone_number, c.billing_address)
+            for pk, c in zip(customer_ids, customers)
+        ]
+
+        start = self.reserve('SUP', Supplier, 'supplier_id', 'suppliers')
+        suppliers = []
+        for i in range(self.counts['suppliers']):
+            first_name, last_name = self.person()
+            name = f'{last_name} {self.rng.choice(["Industries", "Enterprises", "Supplies"])} {i + 1}'
+            suppliers.append(Supplier(
+                supplier_id=f'SUP-{start + i:04d}', tax_id=f'GST{self.tag.upper()}{i:06d}',
+                supplier_name=name, legal_entity_name=f'{name} Pvt Ltd',
+                primary_contact_first_name=first_name, primary_contact_last_name=last_name,
+                primary_contact_email=f'perf.supplier.{self.tag}.{i}@example.com',
+                primary_contact_phone=self.phone(),
+                registered_address=f'Plot {self.rng.randint(1, 300)}, {self.rng.choice(CITIES)}',
+                workflow_status='Submitted',
+            ))
+        supplier_ids = self.bulk(Supplier, suppliers, key='supplier_id')
+        self.suppliers = [(pk, s.supplier_name) for pk, s in zip(supplier_ids, suppliers)]
+
+    @transaction.atomic
+    def seed_enquiries(self):
+        start = self.reserve('ENQ', Enquiry, 'enquiry_id', 'enquiries')
+        enquiries, lines = [], []
+        for i in range(self.counts['enquiries']):
+            first_name, last_name = self.person()
+            enquiries.append(Enquiry(
+                enquiry_id=f'ENQ{start + i:04d}', user_id=self.rng.choice(self.user_ids),
+                first_name=first_name, last_name=last_name,
+                email=f'perf.enquiry.{self.tag}.{i}@example.com', phone_number=self.phone(),
+                city=self.rng.choice(CITIES), enquiry_type=self.rng.choice(['Product', 'Service', 'Both']),
+                enquiry_channel=self.rng.choice(['Phone', 'Email', 'Web Form']),
+            ))
+            lines.append(self.lines(1, 3))
+        enquiry_ids = self.bulk(Enquiry, enquiries, key='enquiry_id')
+
+        items = []
+        for enquiry_id, enquiry_lines in zip(enquiry_ids, lines):
+            for product, quantity in enquiry_lines:
+                selling_price = product[3]
+                items.append(EnquiryItem(
+                    enquiry_id=enquiry_id, item_code=product[1], product_description=product[2],
+                    cost_price=(selling_price * Decimal('0.8')).quantize(CENT), selling_price=selling_price,
+                    quantity=quantity, total_amount=line_total(quantity, selling_price),
+                ))
+        self.bulk(EnquiryItem, items)
+
+    def order_items(self, model, parent_field, parent_ids, lines):
+        items = []
+        for parent_id, order_lines in zip(parent_ids, lines):
+            for (pk, product_id, name, price, discount, tax_id, tax_rate, uom_id, _), quantity in order_lines:
+                items.append(model(
+                    **{f'{parent_field}_id': parent_id},
+                    product_id=pk, product_name=name, product_id_display=product_id,
+                    uom_id=uom_id, unit_price=price, discount=discount, tax_id=tax_id, tax_rate=tax_rate,
+                    quantity=quantity, total=line_total(quantity, price, discount, tax_rate),
+                ))
+        self.bulk(model, items)
+
+    def order_totals(self, order, order_lines):
+        """Fills the stored totals in memory; bulk_create skips the item signals."""
+        subtotal = tax = Decimal('0.00')
+        for (_, _, _, price, discount, _, tax_rate, _, _), quantity in order_lines:
+            total = line_total(quantity, price, discount, tax_rate)
+            subtotal += total
+            tax += total * tax_rate / Decimal('100')
+        apply_totals(order, subtotal, tax)
+        return order
+
+    @transaction.atomic
+    def seed_quotations(self):
+        start = self.reserve('QUO', Quotation, 'quotation_id', 'quotations')
+        statuses = ['Draft', 'Submitted', 'Approved', 'Rejected', 'Converted to SO', 'Expired']
+        quotations, lines = [], []
+        for i in range(self.counts['quotations']):
+            quotation_date = self.past_date()
+            user_id = self.rng.choice(self.user_ids)
+            quotations.append(Quotation(
+                quotation_id=f'QUO{start + i:04d}', created_by_id=user_id, updated_by_id=user_id,
+                customer_id=self.rng.choice(self.customers)[0], sales_rep_id=self.rng.choice(self.sales_rep_ids),
+                quotation_type=self.rng.choice(['Standard', 'Blanket', 'Service']),
+                quotation_date=quotation_date, expiry_date=quotation_date + timedelta(days=30),
+                payment_terms=self.rng.choice(['Net 15', 'Net 30', 'Net 45']),
+                expected_delivery=quotation_date + timedelta(days=self.rng.randint(7, 45)),
+                status=self.rng.choice(statuses),
+                global_discount=self.rng.choice([Decimal('0.00'), Decimal('2.50'), Decimal('5.00')]),
+                shipping_charges=Decimal(self.rng.choice([0, 250, 500, 1000])),
+            ))
+            lines.append(self.lines(1, 6))
+            self.order_totals(quotations[-1], lines[-1])
+        quotation_ids = self.bulk(Quotation, quotations, key='quotation_id')
+        self.order_items(QuotationItem, 'quotation', quotation_ids, lines)
+
+    @transaction.atomic
+    def seed_sales_orders(self):
+        start = self.reserve('SO', SalesOrder, 'sales_order_id', 'sales_orders')
+        statuses = [choice for choice, _ in SalesOrder.STATUS_CHOICES]
+        orders, lines = [], []
+        for i in range(self.counts['sales_orders']):
+            order_date = self.past_date()
+            user_id = self.rng.choice(self.user_ids)
+            orders.append(SalesOrder(
+                sales_order_id=f'SO-{start + i:04d}', created_by_id=user_id, updated_by_id=user_id,
+                order_date=order_date, sales_rep_id=self.rng.choice(self.sales_rep_ids),
+                order_type=self.rng.choice(['Standard', 'Rush', 'Backorder']),
+                customer_id=self.rng.choice(self.customers)[0],
+                payment_method=self.rng.choice(['Bank Transfer', 'Credit Card', 'COD']),
+                due_date=order_date + timedelta(days=30),
+                shipping_method=self.rng.choice(['Road', 'Air', 'Courier']),
+                expected_delivery=order_date + timedelta(days=self.rng.randint(3, 30)),
+                status=self.rng.choice(statuses),
+                shipping_charges=Decimal(self.rng.choice([0, 250, 500])),
+            ))
+            lines.append(self.lines(1, 6))
+            self.order_totals(orders[-1], lines[-1])
+        order_ids = self.bulk(SalesOrder, orders, key='sales_order_id')
+        self.order_items(SalesOrderItem, 'sales_order', order_ids, lines)
+        self.sales_orders = [(pk, order.customer_id, order_lines) for pk, order, order_lines in zip(order_ids, orders, lines)]
+
+    @transaction.atomic
+    def seed_delivery_notes(self):
+        start = self.reserve('DN', DeliveryNote, 'DN_ID', 'delivery_notes')
+        customers = {customer[0]: customer for customer in self.customers}
+        notes, lines = [], []
+        for i in range(self.counts['delivery_notes']):
+            sales_order_id, customer_id, order_lines = self.rng.choice(self.sales_orders)
+            customer = customers[customer_id]
+            notes.append(DeliveryNote(
+                DN_ID=f'DN-{start + i:04d}', delivery_date=self.past_date(),
+                sales_order_reference_id=sales_order_id, customer_name=customer[1],
+                delivery_type=self.rng.choice(['Regular', 'Regular', 'Urgent']),
+                destination_address=customer[4] or '',
+                delivery_status=self.rng.choice(['Draft', 'Partially Delivered', 'Delivered']),
+            ))
+            lines.append(order_lines)
+        note_ids = self.bulk(DeliveryNote, notes, key='DN_ID')
+        self.bulk(DeliveryNoteItem, [
+            DeliveryNoteItem(delivery_note_id=note_id, product_id=product[0], quantity=quantity, uom=product[8])
+            for note_id, note_lines in zip(note_ids, lines) for product, quantity in note_lines
+        ])
+
+    @transaction.atomic
+    def seed_invoices(self):
+        start = self.reserve('INV', Invoice, 'INVOICE_ID', 'invoices')
+        customers = {customer[0]: customer for customer in self.customers}
+        invoices, lines = [], []
+        for i in range(self.counts['invoices']):
+            sales_order_id, customer_id, order_lines = self.rng.choice(self.sales_orders)
+            customer = customers[customer_id]
+            invoice_date = self.past_date()
+            invoices.append(Invoice(
+                INVOICE_ID=f'INV-{start + i:04d}', invoice_date=invoice_date,
+                due_date=invoice_date + timedelta(days=30), sales_order_reference_id=sales_order_id,
+                customer_id=customer_id, billing_address=customer[4] or '', shipping_address=customer[4] or '',
+                email_id=customer[2], phone_number=customer[3], contact_person=customer[1],
+                invoice_status=self.rng.choice(['Draft', 'Sent', 'Paid', 'Overdue']),
+                payment_terms=self.rng.choice(['Net 15', 'Net 20', 'Net 45', 'Due on Receipt']),
+                payment_status=self.rng.choice(['Paid', 'Partial', 'Unpaid']),
+                invoice_total=sum(
+                    (line_total(quantity, p[3], p[4], p[6]) for p, quantity in order_lines), Decimal('0.00')
+                ),
+            ))
+            lines.append(order_lines)
+        invoice_ids = self.bulk(Invoice, invoices, key='INVOICE_ID')
+        self.invoice_ids = invoice_ids
+        self.bulk(InvoiceItem, [
+            InvoiceItem(
+                invoice_id=invoice_id, product_id=p[0], quantity=quantity, uom=p[8], unit_price=p[3],
+                tax=p[6], discount=p[4], total=line_total(quantity, p[3], p[4], p[6]),
+            )
+            for invoice_id, invoice_lines in zip(invoice_ids, lines) for p, quantity in invoice_lines
+        ])
+
+    @transaction.atomic
+    def seed_purchases(self):
+        stamp = self.today.strftime('%Y%m%d')
+        start = self.reserve('PO', PurchaseOrder, 'PO_ID', 'purchase_orders')
+        orders, lines = [], []
+        for i in range(self.counts['purchase_orders']):
+            supplier_id, supplier_name = self.rng.choice(self.suppliers)
+            order_lines = self.lines(1, 5)
+            subtotal = sum((Decimal(quantity) * p[3] for p, quantity in order_lines), Decimal('0.00'))
+            tax = sum((Decimal(quantity) * p[3] * p[6] / 100 for p, quantity in order_lines), Decimal('0.00')).quantize(CENT)
+            shipping = Decimal(self.rng.choice([0, 500, 1500]))
+            orders.append(PurchaseOrder(
+                PO_ID=f'PO-{stamp}-{start + i:03d}', PO_date=self.past_date(),
+                delivery_date=self.today + timedelta(days=self.rng.randint(5, 60)),
+                status=self.rng.choice(['Draft', 'Submitted', 'Partially Received', 'Closed']),
+                sales_order_reference=self.rng.choice(self.sales_orders)[0],
+                supplier_id=supplier_id, supplier_name=supplier_name,
+                payment_terms=self.rng.choice(['Net 30', 'Net 45', 'Advance']),
+                inco_terms=self.rng.choice(['FOB', 'CIF', 'EXW']), currency='INR',
+                subtotal=subtotal, tax_summary=tax, shipping_charges=shipping,
+                total_order_value=subtotal + tax + shipping,
+            ))
+            lines.append(order_lines)
+        po_ids = self.bulk(PurchaseOrder, orders, key='PO_ID')
+        self.bulk(PurchaseOrderItem, [
+            PurchaseOrderItem(
+                purchase_order_id=po_id, product_id=p[0], qty_ordered=quantity,
+                insufficient_stock=self.rng.randint(0, quantity), unit_price=p[3], tax=p[6], discount=p[4],
+                total=line_total(quantity, p[3], p[4], p[6]),
+            )
+            for po_id, po_lines in zip(po_ids, lines) for p, quantity in po_lines
+        ])
+        self.purchase_orders = list(zip(po_ids, [order.supplier_id for order in orders], lines))
+
+        start = self.reserve('GRN', StockReceipt, 'GRN_ID', 'stock_receipts')
+        receipts, receipt_lines = [], []
+        for i in range(self.counts['stock_receipts']):
+            po_id, supplier_id, po_lines = self.rng.choice(self.purchase_orders)
+            receipts.append(StockReceipt(
+                GRN_ID=f'GRN-{stamp}-{start + i:04d}', PO_reference_id=po_id, received_date=self.past_date(),
+                supplier_id=supplier_id, supplier_dn_no=f'SDN-{self.rng.randint(1000, 9999)}',
+                supplier_invoice_no=f'SINV-{self.rng.randint(1000, 9999)}',
+                received_by_id=self.rng.choice(self.user_ids), qc_done_by_id=self.rng.choice(self.user_ids),
+                status=self.rng.choice(['Draft', 'Submitted']),
+            ))
+            receipt_lines.append(po_lines)
+        receipt_ids = self.bulk(StockReceipt, receipts, key='GRN_ID')
+
+        items = []
+        for receipt_id, po_lines in zip(receipt_ids, receipt_lines):
+            for p, quantity in po_lines:
+                accepted = self.rng.randint(max(quantity - 2, 0), quantity)
+                items.append(StockReceiptItem(
+                    stock_receipt_id=receipt_id, product_id=p[0], uom=p[8], qty_ordered=quantity,
+                    qty_received=quantity, accepted_qty=accepted, rejected_qty=quantity - accepted,
+                    stock_dim=self.rng.choice(['None', 'Serial', 'Batch']),
+                    warehouse_id=self.rng.choice(self.warehouse_ids), unit_price=p[3], tax=p[6], discount=p[4],
+                    total=line_total(quantity, p[3], p[4], p[6]),
+                ))
+        self.bulk(StockReceiptItem, items)
+        # No unique column to map on; read the new lines back in insert order.
+        item_rows = list(
+            StockReceiptItem.objects.filter(stock_receipt_id__in=receipt_ids)
+            .order_by('id').values_list('id', 'stock_dim', 'accepted_qty')
+        )
+
+        serials, batches = [], []
+        for item_id, stock_dim, accepted in item_rows:
+            if stock_dim == 'Serial':
+                serials.extend(
+                    SerialNumber(stock_receipt_item_id=item_id, serial_no=f'SN-{self.tag}-{item_id}-{n}')
+                    for n in range(accepted)
+                )
+            elif stock_dim == 'Batch' and accepted:
+                mfg_date = self.past_date(180)
+                batches.append(BatchNumber(
+                    stock_receipt_item_id=item_id, batch_no=f'BT-{self.tag}-{item_id}', batch_qty=accepted,
+                    mfg_date=mfg_date, expiry_date=mfg_date + timedelta(days=self.rng.choice([180, 365, 730])),
+                ))
+        self.bulk(SerialNumber, serials)
+        batch_ids = self.bulk(BatchNumber, batches, key='batch_no')
+        self.bulk(BatchSerialNumber, [
+            BatchSerialNumber(batch_number_id=batch_id, serial_no=f'{batch.batch_no}-{n}')
+            for batch_id, batch in zip(batch_ids, batches) for n in range(batch.batch_qty)
+        ])
+
+    @transaction.atomic
+    def seed_finance_notes(self):
+        start = self.reserve('CRN', CreditNote, 'CREDIT_NOTE_ID', 'credit_notes')
+        customers = {customer[0]: customer for customer in self.customers}
+        invoices = dict(Invoice.objects.filter(pk__in=self.invoice_ids).values_list('pk', 'customer_id'))
+        notes, lines = [], []
+        for i in range(self.counts['credit_notes']):
+            invoice_id = self.rng.choice(self.invoice_ids)
+            customer = customers[invoices[invoice_id]]
+            note_lines = [(p, self.rng.randint(1, 3)) for p, _ in self.lines(1, 3)]
+            notes.append(CreditNote(
+                CREDIT_NOTE_ID=f'CRN-{start + i:04d}', credit_note_date=self.past_date(),
+                invoice_reference_id=invoice_id, created_by_id=self.rng.choice(self.candidate_ids),
+                branch_id=self.rng.choice(self.branch_ids), customer_id=customer[0],
+                billing_address=customer[4] or '', phone_number=customer[3],
+                invoice_total=sum((line_total(q, p[3], p[4], p[6]) for p, q in note_lines), Decimal('0.00')),
+            ))
+            lines.append(note_lines)
+        note_ids = self.bulk(CreditNote, notes, key='CREDIT_NOTE_ID')
+        self.bulk(CreditNoteItem, [
+            CreditNoteItem(
+                credit_note_id=note_id, product_id=p[0], returned_qty=quantity, uom=p[8],
+                return_reason='Damaged in transit', unit_price=p[3], tax=p[6], discount=p[4],
+                total=line_total(quantity, p[3], p[4], p[6]),
+            )
+            for note_id, note_lines in zip(note_ids, lines) for p, quantity in note_lines
+        ])
+
+        start = self.reserve('DBN', DebitNote, 'DEBIT_NOTE_ID', 'debit_notes')
+        notes, lines = [], []
+        for i in range(self.counts['debit_notes']):
+            po_id, supplier_id, po_lines = self.rng.choice(self.purchase_orders)
+            note_lines = [(p, self.rng.randint(1, quantity)) for p, quantity in po_lines]
+            notes.append(DebitNote(
+                DEBIT_NOTE_ID=f'DBN-{start + i:04d}', debit_note_date=self.past_date(),
+                po_reference_id=po_id, created_by_id=self.rng.choice(self.candidate_ids),
+                branch_id=self.rng.choice(self.branch_ids), supplier_id=supplier_id,
+                purchase_total=sum((line_total(q, p[3], p[4], p[6]) for p, q in note_lines), Decimal('0.00')),
+            ))
+            lines.append(note_lines)
+        note_ids = self.bulk(DebitNote, notes, key='DEBIT_NOTE_ID')
+        self.bulk(DebitNoteItem, [
+            DebitNoteItem(
+                debit_note_id=note_id, product_id=p[0], returned_qty=quantity, uom=p[8],
+                return_reason='Rejected in QC', unit_price=p[3], tax=p[6], discount=p[4],
+                total=line_total(quantity, p[3], p[4], p[6]),
+            )
+            for note_id, note_lines in zip(note_ids, lines) for p, quantity in note_lines
+        ])
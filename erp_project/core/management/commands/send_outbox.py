@@ -0,0 +1,42 @@
+# core/management/commands/send_outbox.py
+
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.outbox import drain, requeue_stale, retry_failed
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails from the outbox over one reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Messages claimed per batch')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to wait before checking an empty outbox again')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue messages left Sending for this many seconds at startup')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Give Failed messages another full set of attempts first')
+        parser.add_argument('--burst', action='store_true', help='Exit once no message is due')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        requeued = requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale emails')
+        if options['retry_failed']:
+            self.stdout.write(f'Retrying {retry_failed()} failed emails')
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+        sent = drain(
+            batch_size=options['batch_size'], poll_interval=options['poll_interval'],
+            burst=options['burst'], should_stop=lambda: bool(stopping),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} emails'))
@@ -0,0 +1,72 @@
+import logging
+
+from django.conf import settings
+
+from .query_budget import QueryBudgetExceeded, QueryRecorder, get_query_budget
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the SQL cost of every request and checks it against the view's
+    declared budget (core.query_budget.QUERY_BUDGETS).
+
+    - ``request.query_stats`` / ``response.query_stats`` hold the recorder.
+    - With ``QUERY_BUDGET_HEADERS`` on, the numbers are returned as
+      ``X-DB-*`` response headers.
+    - Going over budget is logged; with ``QUERY_BUDGET_STRICT`` on (tests)
+      it raises ``QueryBudgetExceeded`` instead.
+    - Duplicate-query fingerprints are only collected with ``DEBUG``,
+      ``QUERY_BUDGET_STRICT`` or ``QUERY_BUDGET_HEADERS`` on; otherwise
+      just the count and time are kept.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        headers = getattr(settings, 'QUERY_BUDGET_HEADERS', settings.DEBUG)
+        strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+        recorder = QueryRecorder(fingerprints=settings.DEBUG or strict or headers)
+        request.query_stats = recorder
+        with recorder.record():
+            response = self.get_response(request)
+        response.query_stats = recorder
+
+        view_name = self.get_view_name(request)
+        budget = get_query_budget(view_name, request.method) if view_name else None
+
+        if headers:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Time-Ms'] = str(recorder.duration_ms)
+            response['X-DB-Duplicate-Queries'] = str(recorder.duplicate_count)
+            if recorder.duplicates:
+                response['X-DB-Duplicate-Fingerprints'] = ','.join(
+                    f'{key}x{count}' for key, count in
+                    sorted(recorder.duplicates.items(), key=lambda item: -item[1])[:5]
+                )
+            if view_name:
+                response['X-DB-View'] = view_name
+            if budget is not None:
+                response['X-DB-Query-Budget'] = str(budget)
+
+        if budget is not None and recorder.count > budget:
+            duplicates = f", {recorder.duplicate_count} duplicates" if recorder.fingerprinting else ""
+            message = (
+                f"{view_name} {request.method} {request.path} ran {recorder.count} queries "
+                f"(budget {budget}{duplicates})"
+            )
+            if strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    @staticmethod
+    def get_view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None
+        view_class = getattr(match.func, 'view_class', None)
+        return view_class.__name__ if view_class else None
@@ -0,0 +1,159 @@
+# Generated by Django 4.2.14 on 2026-10-18 06:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('check_in_times', models.JSONField(default=list)),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('status', models.CharField(choices=[('Present', 'Present'), ('Absent', 'Absent'), ('Weekend', 'Weekend'), ('Holiday', 'Holiday')], default='Absent', max_length=10)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Candidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('employee_code', models.CharField(editable=False, max_length=10, unique=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(blank=True, max_length=100)),
+                ('gender', models.CharField(choices=[('Male', 'Male'), ('Female', 'Female')], max_length=10)),
+                ('joining_date', models.DateField(blank=True, null=True)),
+                ('personal_number', models.CharField(max_length=15)),
+                ('emergency_contact_number', models.CharField(blank=True, max_length=15)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('aadhar_number', models.CharField(max_length=14)),
+                ('pan_number', models.CharField(max_length=10)),
+                ('status', models.CharField(choices=[('Active', 'Active'), ('Inactive', 'Inactive')], default='Active', max_length=10)),
+                ('current_address', models.TextField(blank=True)),
+                ('highest_qualification', models.CharField(blank=True, max_length=200)),
+                ('previous_employer', models.CharField(blank=True, max_length=200)),
+                ('total_experience_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('total_experience_month', models.PositiveIntegerField(blank=True, null=True)),
+                ('relevant_experience_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('relevant_experience_month', models.PositiveIntegerField(blank=True, null=True)),
+                ('marital_status', models.CharField(blank=True, choices=[('Married', 'Married'), ('Unmarried', 'Unmarried')], max_length=20)),
+                ('basics', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('hra', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('conveyance_allowance', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('medical_allowance', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('other_allowances', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('bonus', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('taxes', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('pf', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('esi', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('gross_salary', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('net_salary', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('uan_number', models.CharField(blank=True, max_length=12)),
+                ('pf_number', models.CharField(blank=True, max_length=12)),
+                ('bank_name', models.CharField(blank=True, max_length=100)),
+                ('account_number', models.CharField(blank=True, max_length=20)),
+                ('ifsc_code', models.CharField(blank=True, max_length=11)),
+                ('asset', models.CharField(blank=True, choices=[('Y', 'Yes'), ('N', 'No')], max_length=3)),
+                ('asset_type', models.CharField(blank=True, choices=[('laptop', 'Laptop'), ('phone', 'Phone')], max_length=50)),
+                ('laptop_company_name', models.CharField(blank=True, choices=[('HP', 'HP'), ('Dell', 'Dell'), ('Lenovo', 'Lenovo')], max_length=50)),
+                ('asset_id', models.CharField(blank=True, max_length=20)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CandidateDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='Candidate_documents/%Y/%m/%d/')),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Document',
+                'verbose_name_plural': 'Documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='GovernmentHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('description', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('Queued', 'Queued'), ('Running', 'Running'), ('Succeeded', 'Succeeded'), ('Failed', 'Failed')], default='Queued', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('message', models.CharField(blank=True, max_length=255)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('result_path', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('content_subtype', models.CharField(default='plain', max_length=20)),
+                ('from_email', models.CharField(blank=True, max_length=255)),
+                ('to', models.JSONField(default=list)),
+                ('cc', models.JSONField(blank=True, default=list)),
+                ('bcc', models.JSONField(blank=True, default=list)),
+                ('reply_to', models.JSONField(blank=True, default=list)),
+                ('headers', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Sending', 'Sending'), ('Sent', 'Sent'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('Not Started', 'Not Started'), ('In Progress', 'In Progress'), ('Completed', 'Completed'), ('Awaiting Feedback', 'Awaiting Feedback')], max_length=20)),
+                ('start_date', models.DateField()),
+                ('due_date', models.DateField()),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
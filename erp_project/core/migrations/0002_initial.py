@@ -0,0 +1,66 @@
+# Generated by Django 4.2.14 on 2026-10-18 06:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('masters', '0001_initial'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='assigned_to',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tasks_assigned', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='core_outbox_status_b2f640_idx'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.branch'),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.department'),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='designation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidate_designations', to='masters.role'),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='upload_documents',
+            field=models.ManyToManyField(blank=True, to='core.candidatedocument'),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'id'], name='core_job_status_d3df32_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendance',
+            unique_together={('user', 'date')},
+        ),
+    ]
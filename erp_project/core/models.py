@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 import re
 from django.contrib.auth.models import AbstractUser
 from django.db.models import JSONField
 
+from .sequences import last_number, next_value
+
 
 class CandidateDocument(models.Model):
     file = models.FileField(upload_to='Candidate_documents/%Y/%m/%d/')
@@ -63,13 +66,8 @@ class Candidate(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.employee_code:
-            last_candidate = Candidate.objects.order_by('id').last()
-            if last_candidate:
-                last_num = int(last_candidate.employee_code.replace('STA', ''))
-                new_num = last_num + 1
-            else:
-                new_num = 1
-            self.employee_code = f'STA{new_num:04d}'
+            num = next_value('STA', initial=lambda: last_number(Candidate, 'employee_code'))
+            self.employee_code = f'STA{num:04d}'
 
         phone_regex = r'^[0-9+\-\s]+$'
         if self.personal_number and not re.match(phone_regex, self.personal_number):
@@ -143,4 +141,102 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class Sequence(models.Model):
+    """
+    Document number counter per prefix (QUO, SO, DN, ...); see core/sequences.py.
+    ``value`` is the last number handed out.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work, run by ``manage.py run_workers``; see core/jobs.py.
+    ``result_path`` is relative to MEDIA_ROOT.
+    """
+    STATUS_CHOICES = (
+        ('Queued', 'Queued'),
+        ('Running', 'Running'),
+        ('Succeeded', 'Succeeded'),
+        ('Failed', 'Failed'),
+    )
+
+    task = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Queued')
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    result_path = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    def report(self, progress, message=''):
+        """Records progress (0-100) from inside a running task."""
+        self.progress = max(0, min(int(progress), 100))
+        self.message = message[:255]
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress, message=self.message, updated_at=timezone.now()
+        )
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting for ``manage.py send_outbox``; see core/outbox.py.
+    Written in the transaction of the change it announces, so a rolled back
+    request sends nothing and a committed one can't lose its mail.
+    """
+    STATUS_CHOICES = (
+        ('Pending', 'Pending'),
+        ('Sending', 'Sending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=20, default='plain')
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
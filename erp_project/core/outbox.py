@@ -0,0 +1,195 @@
+"""
+Transactional email outbox.
+
+Views don't talk to the mail server.  They build the ``EmailMessage`` as
+before and hand it to ``queue_email``, which saves an ``OutboxEmail`` row in
+the request's transaction:
+
+    with transaction.atomic():
+        user.save()
+        queue_email(EmailMessage(subject, html, to=[user.email]))
+
+``manage.py send_outbox`` drains the table in batches over one SMTP
+connection, reused until the queue runs dry.  A message that fails is
+retried with exponential backoff (1, 2, 4 ... minutes, capped at an hour)
+and marked Failed after MAX_ATTEMPTS, or at once when the server rejects it
+permanently.  Delivery is at-least-once: a worker killed between the SMTP
+send and the status update sends that message again once it is requeued.
+
+For local testing, point the EMAIL_* settings at
+``core.benchmark.LocalSMTPServer`` or ``python -m aiosmtpd -n``.
+"""
+import logging
+import smtplib
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .jobs import worker_name
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 60  # seconds before the first retry; doubles with every attempt
+BACKOFF_MAX = 3600
+
+
+
+def queue_email(message):
+    """Saves ``message`` (an EmailMessage) for the outbox worker instead of sending it."""
+    if message.attachments:
+        raise ValueError('The email outbox does not store attachments')
+    return OutboxEmail.objects.create(
+        subject=message.subject,
+        body=message.body,
+        content_subtype=message.content_subtype,
+        from_email=message.from_email or '',
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=dict(message.extra_headers),
+    )
+
+
+def backoff(attempts):
+    """Delay before retrying a message that has failed ``attempts`` times."""
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def _message(row, connection):
+    message = EmailMessage(
+        subject=row.subject, body=row.body, from_email=row.from_email or None,
+        to=row.to, cc=row.cc, bcc=row.bcc, reply_to=row.reply_to,
+        headers=row.headers, connection=connection,
+    )
+    message.content_subtype = row.content_subtype
+    return message
+
+
+def _connection_lost(error):
+    # The session is gone (or never came up), rather than one message refused.
+    # SMTPException subclasses OSError, so plain socket errors are tested last.
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError,
+                          smtplib.SMTPAuthenticationError)):
+        return True
+    return not isinstance(error, smtplib.SMTPException)
+
+
+def _permanent(error):
+    # 5xx for every recipient or for the message itself; retrying won't help
+    return isinstance(error, smtplib.SMTPRecipientsRefused) or (
+        isinstance(error, smtplib.SMTPDataError) and error.smtp_code >= 500
+    )
+
+
+def claim_batch(worker=None, size=50):
+    """Marks up to ``size`` due Pending messages Sending for this worker and returns them."""
+    worker = worker or worker_name()
+    now = timezone.now()
+    pks = list(
+        OutboxEmail.objects.filter(status='Pending', next_attempt_at__lte=now)
+        .order_by('pk').values_list('pk', flat=True)[:size]
+    )
+    if not pks:
+        return []
+    # Rows another worker took between the two statements are no longer Pending
+    OutboxEmail.objects.filter(pk__in=pks, status='Pending').update(
+        status='Sending', worker=worker, updated_at=now,
+    )
+    return list(OutboxEmail.objects.filter(pk__in=pks, status='Sending', worker=worker).order_by('pk'))
+
+
+def _record_failure(rows, error):
+    now = timezone.now()
+    for row in rows:
+        attempts = row.attempts + 1
+        final = attempts >= MAX_ATTEMPTS or _permanent(error)
+        OutboxEmail.objects.filter(pk=row.pk).update(
+            status='Failed' if final else 'Pending',
+            attempts=attempts,
+            next_attempt_at=now if final else now + backoff(attempts),
+            last_error=f'{type(error).__name__}: {error}'[:2000],
+            worker='',
+            updated_at=now,
+        )
+
+
+def deliver(rows, connection):
+    """
+    Sends claimed ``rows`` over ``connection``, opening it if needed, and
+    records each outcome.  A connection failure defers the rest of the batch.
+    Returns how many were sent.
+    """
+    sent = 0
+    for index, row in enumerate(rows):
+        try:
+            connection.open()  # no-op while the session is up
+            connection.send_messages([_message(row, connection)])
+        except OSError as error:
+            if _connection_lost(error):
+                logger.warning('SMTP connection failed, deferring %s emails: %s', len(rows) - index, error)
+                _close(connection)
+                _record_failure(rows[index:], error)
+                break
+            logger.warning('Email %s was not accepted: %s', row.pk, error)
+            _record_failure([row], error)
+            continue
+        except Exception as error:
+            # A message we can't even build; retrying spends its attempts, then parks it
+            logger.exception('Email %s could not be sent', row.pk)
+            _record_failure([row], error)
+            continue
+        OutboxEmail.objects.filter(pk=row.pk).update(
+            status='Sent', attempts=row.attempts + 1, sent_at=timezone.now(), last_error='', worker='',
+        )
+        sent += 1
+    return sent
+
+
+def _close(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def drain(worker=None, batch_size=50, poll_interval=2.0, burst=False, should_stop=lambda: False):
+    """
+    Sends due messages until ``should_stop()``, or with ``burst`` until none
+    are due.  The SMTP session is reused across batches and closed whenever
+    the queue is idle.  Returns how many messages were sent.
+    """
+    worker = worker or worker_name()
+    connection = get_connection(fail_silently=False)
+    sent = 0
+    try:
+        while not should_stop():
+            rows = claim_batch(worker, batch_size)
+            if not rows:
+                _close(connection)
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            sent += deliver(rows, connection)
+    finally:
+        _close(connection)
+    return sent
+
+
+def requeue_stale(older_than=timedelta(minutes=10)):
+    """Puts messages left Sending by a worker that died back in the queue; returns the count."""
+    return OutboxEmail.objects.filter(
+        status='Sending', updated_at__lt=timezone.now() - older_than,
+    ).update(status='Pending', worker='', updated_at=timezone.now())
+
+
+def retry_failed():
+    """Gives every Failed message a fresh set of attempts; returns the count."""
+    return OutboxEmail.objects.filter(status='Failed').update(
+        status='Pending', attempts=0, next_attempt_at=timezone.now(), updated_at=timezone.now(),
+    )
@@ -0,0 +1,234 @@
+"""
+Shared pagination for the list endpoints.
+
+Every list view answers with the same envelope:
+
+    {"message": ..., "data": {"from", "to", "totalCount", "totalPages", "data"}}
+
+Two modes are supported:
+
+* page mode (``?page=&limit=``) – the original OFFSET paginator, kept as-is
+  so existing clients keep working.
+* cursor mode (``?cursor=&limit=``) – keyset pagination that seeks on the
+  ``(sort_key, id)`` tuple of the queryset ordering.  Every page is a single
+  index range scan, so page 5,000 costs the same as page 1.  Pass an empty
+  ``cursor`` for the first page and then the returned ``nextCursor``.  A
+  nullable sort key puts its NULL rows last in either direction, so they
+  can be seeked on too.
+
+``?fields=``/``?exclude=`` trim both the rows and the SQL (core.dynamic_fields).
+
+``totalCount`` comes from core.counting (cached exact count, table-statistics
+estimate, or none with ``?count=false``); ``countMode`` says which one.
+"""
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from rest_framework import status
+from rest_framework.response import Response
+
+from .counting import COUNT_EXACT, get_total_count
+from .dynamic_fields import apply_dynamic_fields
+
+CURSOR_PARAM = 'cursor'
+DEFAULT_PAGE_SIZE = 10
+MAX_CURSOR_PAGE_SIZE = 100
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def get_page_size(request):
+    try:
+        page_size = int(request.query_params.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return page_size if page_size > 0 else DEFAULT_PAGE_SIZE
+
+
+def get_sort_key(queryset):
+    """
+    Returns (field, descending) for the leading column of the queryset ordering.
+    Falls back to the primary key when the queryset is unordered or ordered by a
+    related/expression column that can't be seeked on directly.
+    """
+    model = queryset.model
+    ordering = list(queryset.query.order_by) or list(model._meta.ordering)
+    if ordering and isinstance(ordering[0], str):
+        name = ordering[0]
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        if name == 'pk':
+            name = model._meta.pk.name
+        if '__' not in name:
+            try:
+                return model._meta.get_field(name), descending
+            except FieldDoesNotExist:
+                pass
+    return model._meta.pk, False
+
+
+def encode_cursor(field, obj, position):
+    value = None if field.value_from_object(obj) is None else field.value_to_string(obj)
+    payload = {'v': value, 'id': obj.pk, 'n': position}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(field, cursor):
+    """
+    ``(value, id, position)`` from a cursor made by ``encode_cursor`` for
+    ``field``.  Anything else raises ``InvalidCursor``: a null value is only
+    accepted for a nullable field, and ``id`` and ``n`` must be integers.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        raw_value, last_id, position = payload['v'], payload['id'], payload.get('n', 0)
+        if not (_is_int(last_id) and _is_int(position) and position >= 0):
+            raise InvalidCursor(cursor)
+        if raw_value is None:
+            if not field.null:
+                raise InvalidCursor(cursor)
+            return None, last_id, position
+        if not isinstance(raw_value, str):
+            raise InvalidCursor(cursor)
+        value = field.to_python(raw_value)
+        if value is None:
+            raise InvalidCursor(cursor)
+        return value, last_id, position
+    except (ValueError, TypeError, KeyError, ValidationError):
+        raise InvalidCursor(cursor)
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    Returns (objects, next_cursor, position) for one keyset page.
+    ``position`` is the number of rows the client has already seen.
+    """
+    field, descending = get_sort_key(queryset)
+    pk_name = queryset.model._meta.pk.name
+    op = 'lt' if descending else 'gt'
+    prefix = '-' if descending else ''
+
+    if field.primary_key:
+        queryset = queryset.order_by(f'{prefix}{pk_name}')
+    elif field.null:
+        # Databases disagree on where NULLs sort; pin them to the end
+        sort = F(field.name).desc(nulls_last=True) if descending else F(field.name).asc(nulls_last=True)
+        queryset = queryset.order_by(sort, f'{prefix}{pk_name}')
+    else:
+        queryset = queryset.order_by(f'{prefix}{field.name}', f'{prefix}{pk_name}')
+
+    position = 0
+    if cursor:
+        value, last_id, position = decode_cursor(field, cursor)
+        if field.primary_key:
+            queryset = queryset.filter(**{f'{pk_name}__{op}': last_id})
+        elif value is None:
+            # Already inside the trailing NULL rows
+            queryset = queryset.filter(**{f'{field.name}__isnull': True, f'{pk_name}__{op}': last_id})
+        else:
+            after = (
+                Q(**{f'{field.name}__{op}': value}) |
+                Q(**{field.name: value, f'{pk_name}__{op}': last_id})
+            )
+            if field.null:
+                after |= Q(**{f'{field.name}__isnull': True})
+            queryset = queryset.filter(after)
+
+    # One extra row tells us whether there is a next page without a COUNT.
+    objects = list(queryset[:page_size + 1])
+    has_next = len(objects) > page_size
+    objects = objects[:page_size]
+
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor(field, objects[-1], position + len(objects))
+    return objects, next_cursor, position
+
+
+def get_total_pages(total_count, page_size):
+    if total_count is None:
+        return None
+    return -(-total_count // page_size) if total_count else 1
+
+
+def paginated_response(view, queryset, message, serializer_class=None):
+    """
+    Builds the list envelope for ``queryset`` in page or cursor mode.
+    ``serializer_class`` overrides the view's serializer for the rows.
+    """
+    request = view.request
+    page_size = get_page_size(request)
+
+    if serializer_class is None:
+        serializer_class = view.get_serializer_class()
+    context = view.get_serializer_context()
+    queryset, field_kwargs = apply_dynamic_fields(queryset, serializer_class, context, request)
+
+    def serialize(objects):
+        return serializer_class(objects, many=True, context=context, **field_kwargs).data
+
+    if CURSOR_PARAM in request.query_params:
+        page_size = min(page_size, MAX_CURSOR_PAGE_SIZE)
+        try:
+            objects, next_cursor, position = keyset_page(
+                queryset, request.query_params.get(CURSOR_PARAM, '').strip(), page_size
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        total_count, count_mode = get_total_count(request, queryset)
+        return Response({
+            "message": message,
+            "data": {
+                "from": position + 1 if objects else 0,
+                "to": position + len(objects),
+                "totalCount": total_count,
+                "totalPages": get_total_pages(total_count, page_size),
+                "countMode": count_mode,
+                "nextCursor": next_cursor,
+                "data": serialize(objects)
+            }
+        })
+
+    try:
+        page_number = int(request.query_params.get('page', 1))
+    except (TypeError, ValueError):
+        page_number = 1
+
+    total_count, count_mode = get_total_count(request, queryset)
+    if count_mode != COUNT_EXACT:
+        # No exact count to clamp against: serve the requested slice as-is.
+        page_number = max(page_number, 1)
+        offset = (page_number - 1) * page_size
+        objects = list(queryset[offset:offset + page_size])
+    else:
+        paginator = Paginator(queryset, page_size)
+        paginator.count = total_count
+        page = paginator.get_page(page_number)
+        page_number, objects = page.number, page.object_list
+
+    from_count = (page_number - 1) * page_size + 1
+    to_count = from_count + len(objects) - 1 if objects else 0
+
+    return Response({
+        "message": message,
+        "data": {
+            "from": from_count,
+            "to": to_count,
+            "totalCount": total_count,
+            "totalPages": get_total_pages(total_count, page_size),
+            "countMode": count_mode,
+            "data": serialize(objects)
+        }
+    })
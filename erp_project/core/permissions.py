@@ -1,8 +1,152 @@
 # core/permissions.py
 
+import threading
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from django.core.cache import cache
 from rest_framework import permissions
 
 
+# ────────────────────────────────────────────────
+# Compiled role permissions
+# ────────────────────────────────────────────────
+#
+# A Role's ``permissions`` JSON ({"inventory": {"view": true, ...}, ...}) is
+# compiled once into a bitmask per category.  Compiled roles are kept in a
+# per-process dict and in the Django cache, keyed by role id + ``updated_at``.
+# The version always comes from the database: the role row the authentication
+# query already joined, or a one-column lookup otherwise.  Saving a Role bumps
+# ``updated_at``, so every worker compiles the new version on its next request
+# whether or not the cache is shared between them.
+
+PERM_VIEW = 1
+PERM_CREATE = 2
+PERM_EDIT = 4
+PERM_DELETE = 8
+PERM_FULL_ACCESS = 16
+
+PERMISSION_BITS = {
+    'view': PERM_VIEW,
+    'create': PERM_CREATE,
+    'edit': PERM_EDIT,
+    'delete': PERM_DELETE,
+    'full_access': PERM_FULL_ACCESS,
+}
+
+# Any of these bits lets the method through.
+METHOD_BITS = {
+    'GET': PERM_VIEW | PERM_FULL_ACCESS,
+    'HEAD': PERM_VIEW | PERM_FULL_ACCESS,
+    'OPTIONS': PERM_VIEW | PERM_FULL_ACCESS,
+    'POST': PERM_CREATE | PERM_FULL_ACCESS,
+    'PUT': PERM_EDIT | PERM_FULL_ACCESS,
+    'PATCH': PERM_EDIT | PERM_FULL_ACCESS,
+    'DELETE': PERM_DELETE | PERM_FULL_ACCESS,
+}
+
+# Entries are keyed by version, so this only bounds how long dead versions linger
+ROLE_CACHE_TIMEOUT = 60 * 10
+
+
+class CompiledRole(NamedTuple):
+    is_admin: bool
+    masks: Mapping[str, int]
+
+    def allows(self, category, method):
+        return bool(self.masks.get(category, 0) & METHOD_BITS.get(method, 0))
+
+
+def compile_role(role_name, permissions_dict):
+    masks = {}
+    if isinstance(permissions_dict, dict):
+        for category, cat_perms in permissions_dict.items():
+            if not isinstance(cat_perms, dict):
+                continue
+            mask = 0
+            for name, bit in PERMISSION_BITS.items():
+                if cat_perms.get(name, False):
+                    mask |= bit
+            masks[category] = mask
+    return CompiledRole(
+        is_admin=(role_name or '').lower().strip() == 'admin',
+        masks=MappingProxyType(masks),
+    )
+
+
+def _version(updated_at):
+    return updated_at.timestamp() if updated_at else 0
+
+
+def _role_key(role_id, version):
+    return f'rbac:role:{role_id}:{version}'
+
+
+# role_id -> (version, CompiledRole)
+_compiled_roles = {}
+_compiled_lock = threading.Lock()
+
+
+def _remember(role_id, version, compiled):
+    with _compiled_lock:
+        _compiled_roles[role_id] = (version, compiled)
+
+
+def _lookup(role_id, version):
+    """Process dict first, then the shared cache."""
+    entry = _compiled_roles.get(role_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    shared = cache.get(_role_key(role_id, version))
+    if shared is None:
+        return None
+    compiled = CompiledRole(shared[0], MappingProxyType(shared[1]))
+    _remember(role_id, version, compiled)
+    return compiled
+
+
+def publish_role(role):
+    """Compiles ``role`` and stores it under its current version everywhere."""
+    version = _version(role.updated_at)
+    compiled = compile_role(role.role, role.permissions)
+    cache.set(_role_key(role.pk, version), (compiled.is_admin, dict(compiled.masks)), ROLE_CACHE_TIMEOUT)
+    _remember(role.pk, version, compiled)
+    return compiled
+
+
+def forget_role(role_id):
+    with _compiled_lock:
+        _compiled_roles.pop(role_id, None)
+
+
+def get_compiled_role(user):
+    """
+    CompiledRole for ``user``'s role.  Free when the role row is already
+    loaded on ``user``; otherwise one query for its ``updated_at``, plus one
+    for the role itself if that version isn't compiled yet.
+    """
+    role_id = getattr(user, 'role_id', None)
+    if role_id is None:
+        return None
+
+    role = user._state.fields_cache.get('role')
+    if role is not None:
+        return _lookup(role_id, _version(role.updated_at)) or publish_role(role)
+
+    from masters.models import Role
+    updated_at = Role.objects.filter(pk=role_id).values_list('updated_at', flat=True).first()
+    if updated_at is not None:
+        compiled = _lookup(role_id, _version(updated_at))
+        if compiled is not None:
+            return compiled
+
+    role = Role.objects.only('id', 'role', 'permissions', 'updated_at').filter(pk=role_id).first()
+    if role is None:
+        return None
+    return publish_role(role)
+
+
+
 class RoleBasedPermission(permissions.BasePermission):
     """
     Role-Based Access Control (RBAC) for Stackly ERP
@@ -84,44 +228,21 @@ class RoleBasedPermission(permissions.BasePermission):
             return False
 
         # 3. Must have a role assigned
-        if not hasattr(request.user, 'role') or not request.user.role:
+        compiled = get_compiled_role(request.user)
+        if compiled is None:
             return False
 
-        role = request.user.role
-        role_name = role.role.lower().strip()  # Normalize for matching
-
         # 4. Special 'Admin' role → full access (bypass all checks, listed or unlisted views)
-        if role_name == 'admin':
+        if compiled.is_admin:
             return True
 
-        # 5. Normal roles → apply strict JSON-based permission check
-        permissions_dict = role.permissions or {}
-
-        view_name = view.__class__.__name__
-        category = self.VIEW_TO_CATEGORY.get(view_name)
+        # 5. Normal roles → check the compiled per-category bitmask
+        category = self.VIEW_TO_CATEGORY.get(view.__class__.__name__)
 
         # If view is NOT listed in mapping → deny access (safe default for normal users)
         if not category:
             return False
 
-        # Get permissions for this category from JSON
-        cat_perms = permissions_dict.get(category, {})
-
-        # SAFE METHODS (GET, HEAD, OPTIONS) → require 'view' or 'full_access'
-        if request.method in permissions.SAFE_METHODS:
-            return cat_perms.get('view', False) or cat_perms.get('full_access', False)
-
-        # CREATE (POST)
-        if request.method == 'POST':
-            return cat_perms.get('create', False) or cat_perms.get('full_access', False)
-
-        # UPDATE (PUT/PATCH)
-        if request.method in ['PUT', 'PATCH']:
-            return cat_perms.get('edit', False) or cat_perms.get('full_access', False)
-
-        # DELETE
-        if request.method == 'DELETE':
-            return cat_perms.get('delete', False) or cat_perms.get('full_access', False)
-
-        # Default deny
-        return False
\ No newline at end of file
+        # GET/HEAD/OPTIONS need 'view', POST 'create', PUT/PATCH 'edit',
+        # DELETE 'delete'; 'full_access' allows all.  Anything else is denied.
+        return compiled.allows(category, request.method)
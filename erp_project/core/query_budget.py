@@ -0,0 +1,242 @@
+"""
+Per-request SQL accounting and the declared query budget of every API view.
+
+``QueryRecorder`` hooks into ``connection.execute_wrapper`` and records the
+number of queries, total DB time and a fingerprint per statement.  Repeated
+fingerprints are the N+1 signature: the same statement run once per row.
+
+``QUERY_BUDGETS`` maps view class names (like ``VIEW_TO_CATEGORY`` in
+core.permissions) to the most queries one request may run.  A value is
+either an int for all methods or a ``{method: int}`` dict.  The numbers
+include authentication and the permission check.
+"""
+import contextlib
+import hashlib
+import re
+import time
+
+from django.db import connections
+
+DEFAULT_QUERY_BUDGET = 20
+
+QUERY_BUDGETS = {
+    # core
+    'LoginView': 6,
+    'LogoutView': 5,
+    'ForgotPasswordView': 5,
+    'ResetPasswordView': 6,
+    'ProfileView': {'GET': 6, 'PUT': 10, 'PATCH': 10},
+    'OnboardingListView': {'GET': 8, 'POST': 15},
+    'OnboardingDetailView': {'GET': 8, 'PUT': 15, 'PATCH': 15, 'DELETE': 10},
+    'AttendanceView': 8,
+    'CheckInOutView': 8,
+    'GovernmentHolidayView': 6,
+    'TaskListView': {'GET': 6, 'POST': 8},
+    'TaskDetailView': {'GET': 5, 'PUT': 8, 'PATCH': 8, 'DELETE': 6},
+    'TaskSummaryView': 6,
+    'DashboardCombinedView': 12,
+    'JobDetailView': 5,
+    'JobResultView': 5,
+
+    # masters
+    'ManageUsersListCreateView': {'GET': 6, 'POST': 12},
+    'ManageUserDetailView': {'GET': 6, 'PUT': 12, 'PATCH': 12, 'DELETE': 10},
+    'BranchListCreateView': {'GET': 5, 'POST': 6},
+    'BranchDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'DepartmentListView': 6,
+    'DepartmentCreateView': 15,
+    'DepartmentDetailView': {'GET': 6, 'PUT': 20, 'PATCH': 20, 'DELETE': 10},
+    'RoleListView': 5,
+    'RoleDetailView': 4,
+    'ProductListCreateView': {'GET': 5, 'POST': 12},
+    'ProductDetailView': {'GET': 5, 'PUT': 12, 'PATCH': 12, 'DELETE': 10},
+    'CategoryListCreateView': {'GET': 5, 'POST': 6},
+    'CategoryDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'TaxCodeListCreateView': {'GET': 5, 'POST': 6},
+    'TaxCodeDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'UOMListCreateView': {'GET': 5, 'POST': 6},
+    'UOMDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'WarehouseListCreateView': {'GET': 5, 'POST': 6},
+    'WarehouseDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'SizeListCreateView': {'GET': 5, 'POST': 6},
+    'SizeDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'ColorListCreateView': {'GET': 5, 'POST': 6},
+    'ColorDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'ProductSupplierListCreateView': {'GET': 5, 'POST': 6},
+    'ProductSupplierDetailView': {'GET': 4, 'PUT': 6, 'PATCH': 6, 'DELETE': 8},
+    'ProductImportView': 15,
+    'ProductImportConfirmView': 40,
+    'CustomerListCreateView': {'GET': 5, 'POST': 8},
+    'CustomerDetailView': {'GET': 4, 'PUT': 8, 'PATCH': 8, 'DELETE': 10},
+    'CustomerImportView': 15,
+    'CustomerImportConfirmView': 40,
+    'CustomerDuplicatesListView': 6,
+    'CustomerMergeReviewView': 8,
+    'CustomerMergeConfirmView': 20,
+    'SupplierListCreateView': {'GET': 5, 'POST': 10},
+    'SupplierDetailView': {'GET': 4, 'PUT': 10, 'PATCH': 10, 'DELETE': 10},
+    'SupplierPDFView': 5,
+    'SupplierEmailView': 5,
+    'SupplierCommentView': 6,
+    'SupplierAttachmentView': 6,
+    'SupplierHistoryView': 6,
+
+    # crm
+    'EnquiryListCreateView': {'GET': 6, 'POST': 15},
+    'EnquiryDetailView': {'GET': 6, 'PUT': 20, 'PATCH': 20, 'DELETE': 10},
+    'QuotationListCreateView': {'GET': 5, 'POST': 25},
+    'QuotationDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'QuotationActionView': 20,
+    'QuotationAttachmentView': 8,
+    'QuotationAttachmentDeleteView': 6,
+    'QuotationPDFView': 8,
+    'QuotationMailView': 10,
+    'SalesOrderListCreateView': {'GET': 5, 'POST': 25},
+    'SalesOrderDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'SalesOrderActionView': 30,
+    'SalesOrderPDFView': 8,
+    'SalesOrderMailView': 10,
+    'DeliveryNoteListView': {'GET': 10, 'POST': 25},
+    'DeliveryNoteDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'DeliveryNoteItemView': 10,
+    'DeliveryNoteSerialNumbersView': 8,
+    'DeliveryNotePDFView': 8,
+    'DeliveryNoteEmailView': 10,
+    'InvoiceListView': {'GET': 10, 'POST': 25},
+    'InvoiceBulkPDFView': 5,
+    'InvoiceDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'InvoiceItemView': 10,
+    'InvoicePDFView': 8,
+    'InvoiceEmailView': 10,
+    'InvoiceReturnListView': {'GET': 10, 'POST': 25},
+    'InvoiceReturnDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'InvoiceReturnItemView': 10,
+    'InvoiceReturnPDFView': 8,
+    'InvoiceReturnEmailView': 10,
+    'DeliveryNoteReturnListView': {'GET': 10, 'POST': 25},
+    'DeliveryNoteReturnDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25, 'DELETE': 12},
+    'DeliveryNoteReturnItemView': 10,
+    'DeliveryNoteReturnPDFView': 8,
+    'DeliveryNoteReturnEmailView': 10,
+
+    # purchase
+    'PurchaseOrderListView': {'GET': 10, 'POST': 25},
+    'PurchaseOrderDetailView': {'GET': 10, 'PUT': 25, 'PATCH': 25},
+    'PurchaseOrderItemView': 8,
+    'PurchaseOrderHistoryView': 6,
+    'PurchaseOrderCommentView': 6,
+    'PurchaseOrderEmailView': 8,
+    'StockReceiptListView': {'GET': 12, 'POST': 30},
+    'StockReceiptDetailView': {'GET': 12, 'PUT': 30, 'PATCH': 30},
+    'StockReceiptItemView': 12,
+    'SerialNumberListView': 6,
+    'BatchNumberListView': 8,
+    'StockReceiptPDFView': 8,
+    'StockReceiptEmailView': 8,
+    'StockReturnListView': {'GET': 12, 'POST': 30},
+    'StockReturnDetailView': {'GET': 12, 'PUT': 30, 'PATCH': 30},
+    'StockReturnItemView': 12,
+    'SerialNumberReturnListView': 6,
+    'StockReturnPDFView': 8,
+    'StockReturnEmailView': 8,
+
+    # finance
+    'CreditNoteListView': {'GET': 20, 'POST': 25},
+    'CreditNoteBulkPDFView': 5,
+    'CreditNoteDetailView': {'GET': 12, 'PUT': 25, 'PATCH': 25},
+    'CreditNoteItemView': 8,
+    'CreditNotePDFView': 6,
+    'CreditNoteEmailView': 6,
+    'DebitNoteListView': {'GET': 12, 'POST': 25},
+    'DebitNoteDetailView': {'GET': 12, 'PUT': 25, 'PATCH': 25},
+    'DebitNoteItemView': 8,
+    'DebitNotePDFView': 6,
+    'DebitNoteEmailView': 6,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_query_budget(view_name, method):
+    """Declared budget for ``view_name``/``method``, or None if undeclared."""
+    budget = QUERY_BUDGETS.get(view_name)
+    if isinstance(budget, dict):
+        return budget.get(method.upper(), DEFAULT_QUERY_BUDGET)
+    return budget
+
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """Statement shape with literals and IN-list lengths normalised away."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _LITERAL.sub('?', sql)
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+class QueryRecorder:
+    """
+    ``execute_wrapper`` that collects count, time and fingerprints.
+
+        with QueryRecorder().record() as stats:
+            ...
+        stats.count, stats.duration_ms, stats.duplicates
+
+    With ``fingerprints=False`` only count and time are kept: normalising and
+    hashing every statement isn't free, and ``duplicates`` stays empty.
+    """
+
+    def __init__(self, fingerprints=True):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprinting = fingerprints
+        self.fingerprints = {}
+        self.samples = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if self.fingerprinting:
+                key = fingerprint(sql)
+                self.fingerprints[key] = self.fingerprints.get(key, 0) + 1
+                self.samples.setdefault(key, sql)
+
+    @contextlib.contextmanager
+    def record(self, using=None):
+        aliases = [using] if using else list(connections)
+        with contextlib.ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 2)
+
+    @property
+    def duplicates(self):
+        """{fingerprint: times run} for statements run more than once."""
+        return {key: count for key, count in self.fingerprints.items() if count > 1}
+
+    @property
+    def duplicate_count(self):
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def summary(self):
+        return {
+            'queries': self.count,
+            'db_time_ms': self.duration_ms,
+            'duplicate_queries': self.duplicate_count,
+            'duplicates': {
+                key: {'count': count, 'sql': self.samples[key]}
+                for key, count in sorted(self.duplicates.items(), key=lambda item: -item[1])
+            },
+        }
@@ -0,0 +1,112 @@
+"""
+Atomic document numbering backed by the ``core.Sequence`` table.
+
+The old ``Model.objects.order_by('-id').first()`` + 1 pattern races: two
+requests read the same last row and hand out the same number, and every
+insert pays for the extra query.  Here each prefix has one counter row that
+is bumped with a single ``UPDATE ... SET value = value + n``.
+
+    num = next_value('QUO', initial=lambda: last_number(Quotation, 'quotation_id'))
+    block = allocate_block('SO', 500)           # range of 500 numbers, one UPDATE
+
+``initial`` is only consulted when the counter row doesn't exist yet, so an
+existing database continues its numbering instead of restarting at 1.
+
+Numbers are unique but not gapless.  Inside a caller's transaction the bump
+runs on a connection of its own and commits at once, so the counter row is
+locked for one short statement rather than the whole request and creates of
+one document type run in parallel.  A request that rolls back leaves its
+numbers unused.  SQLite takes one writer at a time anyway, so there the bump
+stays in the caller's transaction.
+"""
+import re
+import threading
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+
+_TRAILING_NUMBER = re.compile(r'(\d+)$')
+_local = threading.local()
+
+
+def last_number(model, field):
+    """Trailing number of ``field`` on ``model``'s newest row, or 0."""
+    value = model.objects.order_by('-id').values_list(field, flat=True).first()
+    match = _TRAILING_NUMBER.search(value or '')
+    return int(match.group(1)) if match else 0
+
+
+def allocate_block(name, count=1, initial=None):
+    """Reserves ``count`` consecutive numbers of counter ``name``; returns them as a range."""
+    from .models import Sequence
+
+    if count < 1:
+        raise ValueError('count must be at least 1')
+
+    connection = _counter_connection()
+    table = connection.ops.quote_name(Sequence._meta.db_table)
+    last = _bump(connection, table, name, count)
+    if last is None:
+        _create_counter(connection, table, name, initial() if initial else 0)
+        last = _bump(connection, table, name, count)
+    return range(last - count + 1, last + 1)
+
+
+def _bump(connection, table, name, count):
+    """The counter's new value, or None when it doesn't exist yet."""
+    with _atomic(connection), connection.cursor() as cursor:
+        cursor.execute(f'UPDATE {table} SET value = value + %s WHERE name = %s', [count, name])
+        if not cursor.rowcount:
+            return None
+        cursor.execute(f'SELECT value FROM {table} WHERE name = %s', [name])
+        return cursor.fetchone()[0]
+
+
+def _create_counter(connection, table, name, value):
+    # Outside the transaction whose UPDATE missed: inserting while that
+    # UPDATE's gap lock is held deadlocks two first users on MySQL.
+    try:
+        with _atomic(connection), connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {table} (name, value) VALUES (%s, %s)', [name, value])
+    except IntegrityError:
+        pass  # another request created the counter first
+
+
+def _counter_connection():
+    """The connection counters are bumped on: a separate one inside a transaction, except on SQLite."""
+    default = connections[DEFAULT_DB_ALIAS]
+    if not default.in_atomic_block or default.vendor == 'sqlite':
+        return default
+    own = getattr(_local, 'connection', None)
+    if own is None:
+        own = _local.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+    return own
+
+
+@contextmanager
+def _atomic(connection):
+    if connection is connections[connection.alias]:
+        with transaction.atomic(using=connection.alias):
+            yield
+        return
+    connection.set_autocommit(False)
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    else:
+        connection.commit()
+    finally:
+        connection.set_autocommit(True)
+
+
+def close_counter_connection():
+    """Closes the separate counter connection when it is broken or past CONN_MAX_AGE, like Django's own."""
+    own = getattr(_local, 'connection', None)
+    if own is not None:
+        own.close_if_unusable_or_obsolete()
+
+
+def next_value(name, initial=None):
+    return allocate_block(name, 1, initial)[0]
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Candidate, CandidateDocument, Attendance, GovernmentHoliday, Task
+from .models import Candidate, CandidateDocument, Attendance, GovernmentHoliday, Task, Job
 from masters.models import Department, Role, Branch, CustomUser
 import re
 import logging
@@ -237,4 +237,15 @@ class TaskDataSerializer(serializers.Serializer):
     taskSummary = TaskSummarySerializer()
 
 class DashboardAttendanceSerializer(serializers.Serializer):
-    dateData = serializers.ListField(child=serializers.DictField())
\ No newline at end of file
+    dateData = serializers.ListField(child=serializers.DictField())
+class JobSerializer(serializers.ModelSerializer):
+    has_result = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ['id', 'task', 'params', 'status', 'progress', 'message', 'result', 'has_result',
+                  'error', 'attempts', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+    def get_has_result(self, obj):
+        return bool(obj.result_path)
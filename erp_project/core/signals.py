@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from crm.models import SalesOrder, StockReservation
+from crm.stock import release_reservations
+from crm.totals import schedule_totals
+
+from .audit import invalidate_user_name
+from .authentication import invalidate_token, invalidate_tokens_for, invalidate_user_tokens
+from .counting import bump_table_version
+from .documents import forget_document, refresh_document
+from .permissions import forget_role, publish_role
+from .sequences import close_counter_connection
+
+
+@receiver(request_started)
+@receiver(request_finished)
+def close_old_counter_connection(**kwargs):
+    close_counter_connection()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_list_counts(sender, **kwargs):
+    bump_table_version(sender._meta.db_table)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_audit_user_name(sender, instance, **kwargs):
+    invalidate_user_name(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender='authtoken.Token')
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender='masters.Branch')
+def invalidate_branch_principals(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_tokens_for(branch_id=instance.pk)
+
+
+@receiver(post_save, sender='masters.Role')
+def republish_role_permissions(sender, instance, created, **kwargs):
+    publish_role(instance)
+    if not created:
+        invalidate_tokens_for(role_id=instance.pk)
+
+
+@receiver(post_delete, sender='masters.Role')
+def drop_role_permissions(sender, instance, **kwargs):
+    forget_role(instance.pk)
+
+
+# Before the delete: afterwards SET_NULL has already detached the users.
+@receiver(pre_delete, sender='masters.Role')
+def invalidate_role_principals(sender, instance, **kwargs):
+    invalidate_tokens_for(role_id=instance.pk)
+
+
+@receiver(pre_delete, sender='masters.Branch')
+def invalidate_deleted_branch_principals(sender, instance, **kwargs):
+    invalidate_tokens_for(branch_id=instance.pk)
+
+
+@receiver(post_save, sender='crm.QuotationItem')
+@receiver(post_delete, sender='crm.QuotationItem')
+def refresh_quotation_totals(sender, instance, **kwargs):
+    schedule_totals(
+        sender.quotation.field.related_model, instance.quotation_id,
+        instance._state.fields_cache.get('quotation'),
+    )
+
+
+@receiver(post_save, sender='crm.SalesOrderItem')
+@receiver(post_delete, sender='crm.SalesOrderItem')
+def refresh_sales_order_totals(sender, instance, **kwargs):
+    schedule_totals(
+        sender.sales_order.field.related_model, instance.sales_order_id,
+        instance._state.fields_cache.get('sales_order'),
+    )
+
+
+# A submitted order's lines (or the order) deleted with units still held.  The
+# signal fires per line, so the first line releases everything the delete()
+# call removes and the rest return at once.
+@receiver(pre_delete, sender='crm.SalesOrderItem')
+def release_deleted_line_reservations(sender, instance, origin=None, **kwargs):
+    if getattr(origin, '_reservations_released', False):
+        return
+    if isinstance(origin, SalesOrder):
+        lines = {'sales_order_item__sales_order': origin}
+    elif isinstance(origin, QuerySet) and origin.model is SalesOrder:
+        lines = {'sales_order_item__sales_order__in': origin}
+    elif isinstance(origin, QuerySet) and origin.model is sender:
+        lines = {'sales_order_item__in': origin}
+    else:
+        lines, origin = {'sales_order_item': instance}, None
+    release_reservations(StockReservation.objects.filter(**lines))
+    if origin is not None:
+        origin._reservations_released = True
+
+
+# Rows printed on a document that are written without saving it; bumping the
+# document's updated_at retires its cached PDF (core/documents.py).  History
+# rows are left out: downloading a quotation PDF itself logs one.
+PRINTED_CHILDREN = {
+    'crm.QuotationComment': 'quotation',
+    'crm.QuotationRevision': 'quotation',
+    'crm.SalesOrderComment': 'sales_order',
+    'masters.SupplierComment': 'supplier',
+    'masters.SupplierAttachment': 'supplier',
+    'purchase.StockReceiptItem': 'stock_receipt',
+    'purchase.StockReturnItem': 'stock_return',
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def touch_printed_document(sender, instance, **kwargs):
+    field_name = PRINTED_CHILDREN.get(sender._meta.label)
+    if field_name is None:
+        return
+    field = sender._meta.get_field(field_name)
+    document_id = getattr(instance, field.attname)
+    if document_id is not None:
+        field.related_model._default_manager.filter(pk=document_id).update(updated_at=timezone.now())
+        refresh_document(field.related_model, document_id)
+
+
+@receiver(post_save)
+def prewarm_saved_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_document(sender, instance.pk)
+
+
+@receiver(post_delete)
+def drop_deleted_document_pdfs(sender, instance, **kwargs):
+    forget_document(sender, instance.pk)
@@ -0,0 +1,37 @@
+"""Background tasks owned by core; see core/jobs.py."""
+import tempfile
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from .documents import render_document
+from .exports import PDFExport
+from .jobs import save_result, task
+
+
+@task('render_pdf')
+def render_pdf(job, document, pk, base_url=None):
+    job.report(10, 'Rendering')
+    filename, pdf = render_document(document, pk, base_url=base_url)
+    save_result(job, filename, pdf)
+    return {'filename': filename, 'size': len(pdf)}
+
+
+@task('cache_pdf')
+def cache_pdf(job, document, pk):
+    """Renders a document into the PDF cache ahead of its next download."""
+    try:
+        filename, pdf = render_document(document, pk)
+    except ObjectDoesNotExist:
+        return None  # deleted since the write that queued this
+    return {'filename': filename, 'size': len(pdf)}
+
+
+@task('export_pdfs')
+def export_pdfs(job, document, pks):
+    export = PDFExport(document, pks, job=job)
+    with tempfile.TemporaryFile() as archive:
+        for chunk in export:
+            archive.write(chunk)
+        archive.seek(0)
+        save_result(job, f'{document}_export_{job.pk}.zip', archive)
+    return export.summary()
@@ -0,0 +1,70 @@
+"""
+Test helpers for the query budgets in core.query_budget.
+
+    class ProductListTests(QueryBudgetTestMixin, APITestCase):
+        def test_list_budget(self):
+            response = self.client.get('/api/masters/products/')
+            self.assertWithinQueryBudget(response)
+
+        def test_every_view_has_a_budget(self):
+            self.assertEqual(views_without_budget(), [])
+"""
+from django.urls import URLResolver, get_resolver
+
+from .query_budget import QUERY_BUDGETS, QueryRecorder, get_query_budget
+
+BUDGETED_URLCONFS = ('core.urls', 'masters.urls', 'crm.urls', 'purchase.urls', 'finance.urls')
+
+
+def _walk(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+        else:
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class is not None:
+                yield view_class
+
+
+def registered_views(urlconfs=BUDGETED_URLCONFS):
+    """Every class-based view routed by ``urlconfs``."""
+    views = {}
+    for urlconf in urlconfs:
+        for view_class in _walk(get_resolver(urlconf).url_patterns):
+            views[view_class.__name__] = view_class
+    return views
+
+
+def views_without_budget(urlconfs=BUDGETED_URLCONFS):
+    return sorted(name for name in registered_views(urlconfs) if name not in QUERY_BUDGETS)
+
+
+class QueryBudgetTestMixin:
+    """Assertions on the ``query_stats`` QueryBudgetMiddleware attaches to responses."""
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        stats = getattr(response, 'query_stats', None)
+        if stats is None:
+            self.fail("Response has no query_stats; is QueryBudgetMiddleware installed?")
+        if budget is None:
+            view_class = getattr(response.wsgi_request.resolver_match.func, 'view_class', None)
+            budget = get_query_budget(view_class.__name__, response.wsgi_request.method) if view_class else None
+        if budget is None:
+            self.fail("No query budget declared for this view")
+        self.assertLessEqual(
+            stats.count, budget,
+            f"{stats.count} queries over a budget of {budget}: {stats.summary()['duplicates']}"
+        )
+
+    def assertNoDuplicateQueries(self, response):
+        stats = response.query_stats
+        if not stats.fingerprinting:
+            self.fail("Query fingerprints weren't collected; turn on DEBUG, QUERY_BUDGET_STRICT or QUERY_BUDGET_HEADERS")
+        self.assertEqual(stats.duplicate_count, 0, f"Duplicate queries: {stats.summary()['duplicates']}")
+
+    def assertMaxQueries(self, budget, func, *args, **kwargs):
+        """Runs ``func`` outside a request and checks its query count."""
+        with QueryRecorder().record() as stats:
+            result = func(*args, **kwargs)
+        self.assertLessEqual(stats.count, budget, f"{stats.count} queries over a budget of {budget}")
+        return result
@@ -1,3 +1,492 @@
-from django.test import TestCase
+"""
+Tests for the core services.
+
+Query budgets (core.query_budget) are checked against real requests: each
+URLconf's endpoints run on the seed_perf_data dataset, so a view that
+queries once per row blows its budget here instead of in production.  The
+audit name cache is emptied before every request: budgets are what the
+first request of a fresh worker pays.
+"""
+import base64
+import json
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from crm.models import DeliveryNote, Invoice, Quotation, QuotationItem, SalesOrder
+from finance.models import CreditNote, DebitNote
+from masters.models import Customer, Product, Supplier, TaxCode
+from purchase.models import PurchaseOrder, StockReceipt
+
+from .audit import clear_user_names
+from .benchmark import BenchmarkRunner, LocalSMTPServer, build_scenarios, get_benchmark_client
+from .dynamic_fields import DynamicFieldsMixin
+from .jobs import enqueue
+from .models import OutboxEmail, Sequence
+from .outbox import MAX_ATTEMPTS, backoff, drain, queue_email
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+from .pricing import line_total, line_totals, price_items
+from .sequences import _local as sequence_connections, allocate_block, last_number, next_value
+from .testing import QueryBudgetTestMixin, views_without_budget
+
+
+class QueryBudgetCoverageTests(SimpleTestCase):
+    def test_every_view_has_a_budget(self):
+        self.assertEqual(views_without_budget(), [])
+
+
+class SeededBudgetTestCase(QueryBudgetTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+
+    def setUp(self):
+        clear_user_names()
+        self.client = get_benchmark_client()
+        self.client.raise_request_exception = True
+
+    def assertGetWithinBudget(self, *urls):
+        for url in urls:
+            with self.subTest(url=url):
+                clear_user_names()
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, response.content[:200])
+                self.assertWithinQueryBudget(response)
+
+
+class BenchmarkRunnerTests(SeededBudgetTestCase):
+    def run_scenarios(self, *names):
+        scenarios = [scenario for scenario in build_scenarios()[0] if scenario.name in names]
+        self.assertEqual(len(scenarios), len(names))
+        runner = BenchmarkRunner(iterations=2, warmup=1)
+        results = runner.run(scenarios)
+        self.assertEqual([result.errors for result in results], [0] * len(names))
+        return runner
+
+    def test_email_scenarios_deliver_over_smtp(self):
+        runner = self.run_scenarios('quotations.email', 'suppliers.email')
+        self.assertEqual(runner.emails_sent, 6)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_write_scenarios_delete_their_rows(self):
+        products, quotations = Product.objects.count(), Quotation.objects.count()
+        self.run_scenarios('products.create', 'quotations.create')
+        self.assertEqual(Product.objects.count(), products)
+        self.assertEqual(Quotation.objects.count(), quotations)
+
+
+class CoreQueryBudgetTests(SeededBudgetTestCase):
+    def test_reads(self):
+        self.assertGetWithinBudget(
+            '/api/profile/', '/api/onboarding/', '/api/attendance/', '/api/attendance/holidays/',
+            '/api/tasks/', '/api/task-summary/', '/api/dashboard/',
+        )
+
+    def test_job_status_and_result(self):
+        user = self.client.get('/api/profile/').wsgi_request.user
+        job = enqueue('export_pdfs', user=user, document='invoice', pks=[])
+        self.assertGetWithinBudget(f'/api/jobs/{job.pk}/')
+
+        response = self.client.get(f'/api/jobs/{job.pk}/result/')
+        self.assertEqual(response.status_code, 409)
+        self.assertWithinQueryBudget(response)
+
+    def test_fingerprints_only_when_asked_for(self):
+        with override_settings(DEBUG=False, QUERY_BUDGET_HEADERS=False, QUERY_BUDGET_STRICT=False):
+            response = self.client.get('/api/profile/')
+        self.assertGreater(response.query_stats.count, 0)
+        self.assertEqual(response.query_stats.fingerprints, {})
+        self.assertNotIn('X-DB-Query-Count', response)
+
+        with override_settings(DEBUG=False, QUERY_BUDGET_HEADERS=False, QUERY_BUDGET_STRICT=True):
+            response = self.client.get('/api/profile/')
+        self.assertEqual(sum(response.query_stats.fingerprints.values()), response.query_stats.count)
+
+
+class MastersQueryBudgetTests(SeededBudgetTestCase):
+    def test_lists(self):
+        self.assertGetWithinBudget(
+            '/api/masters/users/', '/api/masters/branches/', '/api/masters/departments/',
+            '/api/masters/roles/', '/api/masters/products/', '/api/masters/categories/',
+            '/api/masters/taxcodes/', '/api/masters/uoms/', '/api/masters/warehouses/',
+            '/api/masters/sizes/', '/api/masters/colors/', '/api/masters/product-suppliers/',
+            '/api/masters/customers/', '/api/masters/customers/duplicates/', '/api/masters/suppliers/',
+        )
+
+    def test_details(self):
+        self.assertGetWithinBudget(
+            f'/api/masters/products/{Product.objects.first().pk}/',
+            f'/api/masters/customers/{Customer.objects.first().pk}/',
+            f'/api/masters/suppliers/{Supplier.objects.first().pk}/',
+        )
+
+    def test_product_import_confirm_is_flat_in_rows(self):
+        product = Product.objects.exclude(category=None).exclude(uom=None).first()
+        rows = [
+            {'name': f'Budget import {i}', 'product_type': 'Goods', 'unit_price': '10.00', 'quantity': 1,
+             'stock_level': 1, 'status': 'Active', 'product_usage': 'Both', 'category': product.category_id,
+             'uom': product.uom_id, 'related_products': [product.pk]}
+            for i in range(50)
+        ]
+        response = self.client.post('/api/masters/products/import/confirm/', {'valid_rows': rows}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created_count'], 50)
+        self.assertWithinQueryBudget(response)
+
+
+class CrmQueryBudgetTests(SeededBudgetTestCase):
+    def test_lists(self):
+        self.assertGetWithinBudget(
+            '/api/crm/enquiries/', '/api/crm/quotations/', '/api/crm/sales-orders/',
+            '/api/crm/delivery-notes/', '/api/crm/invoices/', '/api/crm/invoice-returns/',
+            '/api/crm/delivery-note-returns/',
+        )
+
+    def test_details(self):
+        self.assertGetWithinBudget(
+            f'/api/crm/quotations/{Quotation.objects.first().pk}/',
+            f'/api/crm/sales-orders/{SalesOrder.objects.first().pk}/',
+            f'/api/crm/delivery-notes/{DeliveryNote.objects.first().pk}/',
+            f'/api/crm/invoices/{Invoice.objects.first().pk}/',
+        )
+
+    def test_bulk_export_is_queued_within_budget(self):
+        ids = list(Invoice.objects.values_list('pk', flat=True)[:50])
+        response = self.client.post('/api/crm/invoices/export-pdf/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertWithinQueryBudget(response)
+
+
+class PurchaseQueryBudgetTests(SeededBudgetTestCase):
+    def test_lists(self):
+        self.assertGetWithinBudget(
+            '/api/purchase/purchase-orders/', '/api/purchase/stock-receipts/', '/api/purchase/stock-returns/',
+        )
+
+    def test_details(self):
+        self.assertGetWithinBudget(
+            f'/api/purchase/purchase-orders/{PurchaseOrder.objects.first().pk}/',
+            f'/api/purchase/stock-receipts/{StockReceipt.objects.first().pk}/',
+        )
+
+
+class FinanceQueryBudgetTests(SeededBudgetTestCase):
+    def test_lists(self):
+        self.assertGetWithinBudget(
+            '/api/finance/credit-notes/', '/api/finance/credit-notes/?fields=id,customer',
+            '/api/finance/debit-notes/',
+        )
+
+    def test_details(self):
+        self.assertGetWithinBudget(
+            f'/api/finance/credit-notes/{CreditNote.objects.first().pk}/',
+            f'/api/finance/debit-notes/{DebitNote.objects.first().pk}/',
+        )
+
+    def test_bulk_export_is_queued_within_budget(self):
+        ids = list(CreditNote.objects.values_list('pk', flat=True))
+        response = self.client.post(
+            '/api/finance/credit-notes/export-pdf/?background=true', {'ids': ids}, format='json',
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertWithinQueryBudget(response)
+
+
+
+class LabelledProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'unit_price', 'category', 'label']
+
+    def get_label(self, obj):
+        return f'{obj.name} @ {obj.unit_price}'
+
+
+class DynamicFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+
+    def render(self, **kwargs):
+        queryset = LabelledProductSerializer(**kwargs).trim_queryset(Product.objects.order_by('pk')[:20])
+        with self.assertNumQueries(1):
+            return LabelledProductSerializer(queryset, many=True, **kwargs).data
+
+    def test_plain_fields_defer_the_rest(self):
+        queryset = LabelledProductSerializer(fields=['id', 'name']).trim_queryset(Product.objects.all())
+        self.assertEqual(queryset.query.deferred_loading, ({'unit_price', 'category'}, True))
+        self.assertEqual(list(self.render(fields=['id', 'name'])[0]), ['id', 'name'])
+
+    def test_method_field_keeps_the_columns_it_reads(self):
+        rows = self.render(fields=['id', 'label'])
+        product = Product.objects.order_by('pk').first()
+        self.assertEqual(rows[0], {'id': product.pk, 'label': f'{product.name} @ {product.unit_price}'})
+
+
+class SequenceTests(TestCase):
+    def test_blocks_are_consecutive(self):
+        self.assertEqual(allocate_block('TST', 3), range(1, 4))
+        self.assertEqual(allocate_block('TST', 2), range(4, 6))
+        self.assertEqual(next_value('TST'), 6)
+        self.assertEqual(Sequence.objects.get(name='TST').value, 6)
+
+    def test_rejects_an_empty_block(self):
+        with self.assertRaises(ValueError):
+            allocate_block('TST', 0)
+
+    def test_new_counter_continues_from_initial(self):
+        calls = []
+
+        def initial():
+            calls.append(1)
+            return 41
+
+        self.assertEqual(next_value('TST', initial=initial), 42)
+        self.assertEqual(allocate_block('TST', 2, initial=initial), range(43, 45))
+        self.assertEqual(len(calls), 1)
+
+    def test_last_number(self):
+        self.assertEqual(last_number(Sequence, 'name'), 0)
+        Sequence.objects.create(name='QUO-0041')
+        self.assertEqual(last_number(Sequence, 'name'), 41)
+        Sequence.objects.create(name='no number')
+        self.assertEqual(last_number(Sequence, 'name'), 0)
+
+    def test_first_use_race(self):
+        def initial():
+            # Another request creates the counter after this one found none
+            Sequence.objects.create(name='TST', value=10)
+            return 0
+
+        with transaction.atomic():
+            self.assertEqual(allocate_block('TST', 2, initial=initial), range(11, 13))
+            # The IntegrityError left the caller's transaction usable
+            self.assertEqual(next_value('TST'), 13)
+
+
+class SequenceConnectionTests(TransactionTestCase):
+    """On a backend with concurrent writers the bump commits on its own connection."""
+
+    def setUp(self):
+        patcher = mock.patch.object(connections[DEFAULT_DB_ALIAS], 'vendor', 'mysql')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.close_counter_connection)
+
+    @staticmethod
+    def close_counter_connection():
+        own = getattr(sequence_connections, 'connection', None)
+        if own is not None:
+            own.close()
+            del sequence_connections.connection
+
+    def test_numbers_survive_the_callers_rollback(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.assertEqual(allocate_block('TST', 2), range(1, 3))
+            self.assertIsNotNone(getattr(sequence_connections, 'connection', None))
+            raise RuntimeError
+        # The counter was created and bumped on the other connection: a gap, not a reused number
+        self.assertEqual(next_value('TST'), 3)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages over OutboxEmail.sent_at, a nullable sort key with ties."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # Two rows share each timestamp, and three were never sent
+        for sent_at in [now, None, now - timedelta(days=1), None, now, now - timedelta(days=1), None]:
+            OutboxEmail.objects.create(subject='Test', body='', sent_at=sent_at)
+        cls.field = OutboxEmail._meta.get_field('sent_at')
+
+    def walk(self, queryset, page_size=2):
+        seen, cursor = [], ''
+        while True:
+            objects, cursor, position = keyset_page(queryset, cursor, page_size)
+            self.assertEqual(position, len(seen))
+            seen += [obj.pk for obj in objects]
+            if cursor is None:
+                return seen
+
+    def expected(self, descending):
+        rows = list(OutboxEmail.objects.all())
+        sent = sorted((row for row in rows if row.sent_at), key=lambda row: (row.sent_at, row.pk),
+                      reverse=descending)
+        unsent = sorted((row for row in rows if row.sent_at is None), key=lambda row: row.pk, reverse=descending)
+        return [row.pk for row in sent + unsent]
+
+    def test_walks_every_row_once_with_nulls_last(self):
+        self.assertEqual(self.walk(OutboxEmail.objects.order_by('sent_at')), self.expected(False))
+        self.assertEqual(self.walk(OutboxEmail.objects.order_by('-sent_at')), self.expected(True))
+        self.assertEqual(self.walk(OutboxEmail.objects.order_by('sent_at'), page_size=100), self.expected(False))
+
+    def test_unordered_queryset_seeks_on_the_primary_key(self):
+        pks = list(OutboxEmail.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual(self.walk(OutboxEmail.objects.all(), page_size=3), pks)
+
+    def test_cursor_round_trip(self):
+        sent = OutboxEmail.objects.exclude(sent_at=None).first()
+        unsent = OutboxEmail.objects.filter(sent_at=None).first()
+        self.assertEqual(decode_cursor(self.field, encode_cursor(self.field, sent, 4)), (sent.sent_at, sent.pk, 4))
+        self.assertEqual(decode_cursor(self.field, encode_cursor(self.field, unsent, 0)), (None, unsent.pk, 0))
+
+    def test_malformed_cursors(self):
+        def cursor(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+        subject = OutboxEmail._meta.get_field('subject')
+        for bad in [
+            'not a cursor', '!!!', cursor([1, 2]), cursor({'v': None}),
+            cursor({'v': '2024-01-01T00:00:00Z', 'id': '7', 'n': 0}),
+            cursor({'v': '2024-01-01T00:00:00Z', 'id': True, 'n': 0}),
+            cursor({'v': '2024-01-01T00:00:00Z', 'id': 7, 'n': -1}),
+            cursor({'v': 20240101, 'id': 7, 'n': 0}),
+            cursor({'v': 'yesterday', 'id': 7, 'n': 0}),
+        ]:
+            with self.subTest(cursor=bad), self.assertRaises(InvalidCursor):
+                decode_cursor(self.field, bad)
+        # NULL is only a position on a nullable key
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(subject, cursor({'v': None, 'id': 7, 'n': 0}))
+
+    def test_list_endpoint_rejects_a_malformed_cursor(self):
+        client = get_benchmark_client()
+        self.assertEqual(client.get('/api/crm/quotations/?cursor=garbage').status_code, 400)
+        response = client.get('/api/crm/quotations/?cursor=')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['data']['nextCursor'])
+
+
+class PricingTests(TestCase):
+    # (quantity, unit_price, discount %, tax %) whose exact totals sit on or near half a cent
+    EDGE_CASES = [
+        (1, Decimal('0.05'), Decimal('10'), Decimal('0')),        # 0.045
+        (1, Decimal('0.15'), Decimal('10'), Decimal('0')),        # 0.135
+        (3, Decimal('0.35'), Decimal('0'), Decimal('0.5')),       # 1.05525
+        (7, Decimal('12.35'), Decimal('12.5'), Decimal('18')),    # 89.2599...
+        (1, Decimal('0.01'), Decimal('50'), Decimal('0')),        # 0.005
+        (1, Decimal('0.01'), Decimal('49.99'), Decimal('0')),     # 0.005001
+        (2, Decimal('99999.99'), Decimal('3.33'), Decimal('28')),
+        (1, Decimal('10.00'), Decimal('100'), Decimal('18')),     # free line
+        (0, Decimal('10.00'), Decimal('0'), Decimal('18')),
+    ]
+
+    @staticmethod
+    def old_save_total(quantity, unit_price, discount, tax_rate):
+        """QuotationItem.save() before core.pricing, rounded half-up to the cent."""
+        subtotal = quantity * unit_price
+        after_discount = subtotal - subtotal * (discount / Decimal('100'))
+        total = after_discount + after_discount * (tax_rate / Decimal('100'))
+        return total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    def test_batch_matches_the_per_row_formula(self):
+        expected = [self.old_save_total(*line) for line in self.EDGE_CASES]
+        self.assertEqual(line_totals(self.EDGE_CASES), expected)
+        self.assertEqual([line_total(*line) for line in self.EDGE_CASES], expected)
+        self.assertEqual(expected[:2], [Decimal('0.05'), Decimal('0.14')])
+
+    def test_inputs_are_converted_exactly(self):
+        self.assertEqual(line_total(3, 0.1, 0, 0), Decimal('0.30'))
+        self.assertEqual(line_total('2', '0.15', None, ''), Decimal('0.30'))
+
+    def test_bulk_priced_items_match_saved_items(self):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+        quotation, product = Quotation.objects.first(), Product.objects.first()
+        saved, priced = [], []
+        for n, (quantity, unit_price, discount, tax_rate) in enumerate(self.EDGE_CASES):
+            tax = TaxCode.objects.create(name=f'Pricing test {n}', percentage=tax_rate)
+            item = QuotationItem(quotation=quotation, product=product, unit_price=unit_price,
+                                 quantity=quantity, discount=discount, tax=tax)
+            item.save()
+            saved.append(QuotationItem.objects.get(pk=item.pk).total)
+            priced.append(QuotationItem(unit_price=unit_price, quantity=quantity, discount=discount, tax_rate=tax_rate))
+        price_items(priced, tax_rate='tax_rate')
+        self.assertEqual(saved, [item.total for item in priced])
+        self.assertEqual(saved, [self.old_save_total(*line) for line in self.EDGE_CASES])
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.smtp = LocalSMTPServer().__enter__()
+        self.addCleanup(self.smtp.__exit__, None, None, None)
+        settings = override_settings(**self.smtp.email_settings())
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def queue(self, count):
+        return [queue_email(EmailMessage(f'Outbox test {n}', 'Body', to=['someone@example.com'])).pk
+                for n in range(count)]
+
+    def rows(self, pks):
+        return list(OutboxEmail.objects.filter(pk__in=pks).order_by('pk'))
+
+    def test_sends_due_messages(self):
+        pks = self.queue(3)
+        self.assertEqual(drain(burst=True), 3)
+        self.assertEqual(self.smtp.messages, 3)
+        self.assertEqual({(row.status, row.attempts) for row in self.rows(pks)}, {('Sent', 1)})
+        self.assertEqual(drain(burst=True), 0)
+
+    def test_temporary_refusal_backs_off(self):
+        pks = self.queue(2)
+        self.smtp.reject_next = 1
+        started = timezone.now()
+        with self.assertLogs('core.outbox', 'WARNING'):
+            self.assertEqual(drain(burst=True), 1)
+        refused, sent = self.rows(pks)
+        self.assertEqual((refused.status, refused.attempts, sent.status), ('Pending', 1, 'Sent'))
+        self.assertIn('451', refused.last_error)
+        self.assertGreaterEqual(refused.next_attempt_at, started + backoff(1))
+        self.assertLessEqual(refused.next_attempt_at, timezone.now() + backoff(1))
+
+        # Not due yet, then delivered once it is
+        self.assertEqual(drain(burst=True), 0)
+        OutboxEmail.objects.filter(pk=refused.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain(burst=True), 1)
+        refused.refresh_from_db()
+        self.assertEqual((refused.status, refused.attempts, refused.last_error), ('Sent', 2, ''))
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertEqual([backoff(n).total_seconds() for n in (1, 2, 3, 7, 20)], [60, 120, 240, 3600, 3600])
+
+    def test_permanent_refusal_fails_at_once(self):
+        [pk] = self.queue(1)
+        self.smtp.reject_next, self.smtp.reject_code = 1, 554
+        with self.assertLogs('core.outbox', 'WARNING'):
+            self.assertEqual(drain(burst=True), 0)
+        [row] = self.rows([pk])
+        self.assertEqual((row.status, row.attempts), ('Failed', 1))
+        self.assertIn('554', row.last_error)
+
+    def test_last_attempt_fails(self):
+        [pk] = self.queue(1)
+        OutboxEmail.objects.filter(pk=pk).update(attempts=MAX_ATTEMPTS - 1)
+        self.smtp.reject_next = 1
+        with self.assertLogs('core.outbox', 'WARNING'):
+            drain(burst=True)
+        [row] = self.rows([pk])
+        self.assertEqual((row.status, row.attempts), ('Failed', MAX_ATTEMPTS))
+
+    def test_unreachable_server_defers_the_batch(self):
+        pks = self.queue(3)
+        self.smtp.__exit__(None, None, None)  # nothing listens on the port any more
+        started = timezone.now()
+        with self.assertLogs('core.outbox', 'WARNING') as logs:
+            self.assertEqual(drain(burst=True), 0)
+        self.assertEqual(len(logs.output), 1)
+        rows = self.rows(pks)
+        self.assertEqual({(row.status, row.attempts) for row in rows}, {('Pending', 1)})
+        self.assertTrue(all(row.next_attempt_at >= started + backoff(1) for row in rows))
 
-# Create your tests here.
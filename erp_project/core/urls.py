@@ -26,5 +26,9 @@ urlpatterns = [
     path('task-summary/', views.TaskSummaryView.as_view(), name='task-summary'),
     path("dashboard/", views.DashboardCombinedView.as_view(), name="dashboard-all"),
 
+    # Background jobs
+    path('jobs/<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/result/', views.JobResultView.as_view(), name='job-result'),
+
     
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
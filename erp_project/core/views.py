@@ -31,6 +31,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.core.mail import EmailMessage
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.conf import settings
 import logging
@@ -41,6 +42,7 @@ from .serializers import (
     LoginSerializer, ForgotPasswordSerializer, ResetPasswordSerializer,
     ProfileUpdateSerializer, ProfileChangePasswordSerializer
 )
+from core.outbox import queue_email
 from core.permissions import RoleBasedPermission
 
 logger = logging.getLogger(__name__)
@@ -103,7 +105,6 @@ class ForgotPasswordView(generics.GenericAPIView):
         reset_token = get_random_string(length=32)
         user.reset_token = reset_token
         user.reset_token_expiry = timezone.now() + timezone.timedelta(hours=1)
-        user.save()
 
         reset_link = f"{settings.FRONTEND_URL.rstrip('/')}/reset-password/{reset_token}"
 
@@ -125,13 +126,12 @@ class ForgotPasswordView(generics.GenericAPIView):
         )
         email_msg.content_subtype = 'html'
 
-        try:
-            email_msg.send(fail_silently=False)
-            logger.info(f"Password reset email sent to {email}")
-            return Response({"detail": "Password reset link has been sent to your email."}, status=status.HTTP_200_OK)
-        except Exception as e:
-            logger.error(f"Failed to send reset email to {email}: {str(e)}")
-            return Response({"detail": "Failed to send reset email. Please try again later."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # The token is only stored together with the email that carries it
+        with transaction.atomic():
+            user.save()
+            queue_email(email_msg)
+        logger.info(f"Password reset email queued for {email}")
+        return Response({"detail": "Password reset link has been sent to your email."}, status=status.HTTP_200_OK)
 
 class ResetPasswordView(generics.GenericAPIView):
     permission_classes = [AllowAny]
@@ -196,10 +196,10 @@ class OnboardingListView(APIView):
 
     def get(self, request, format=None):
         try:
-            candidates = Candidate.objects.select_related('department', 'branch', 'designation').all()
-            serializer = CandidateSerializer(candidates, many=True)
-            logger.info("Fetched %d candidates", candidates.count())
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            candidates = Candidate.objects.select_related('department', 'branch', 'designation').prefetch_related('upload_documents')
+            data = CandidateSerializer(candidates, many=True).data
+            logger.info("Fetched %d candidates", len(data))
+            return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error("Error fetching candidates: %s", str(e))
             return Response(
@@ -490,3 +490,47 @@ class DashboardCombinedView(APIView):
             },
             status=status.HTTP_200_OK
         )
+
+
+# ──────────────────────────────────────────────────────────────
+# Background jobs (see core/jobs.py)
+# ──────────────────────────────────────────────────────────────
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from .models import Job
+from .serializers import JobSerializer
+
+
+def _visible_jobs(user):
+    jobs = Job.objects.all()
+    return jobs if user.is_superuser else jobs.filter(created_by=user)
+
+
+class JobDetailView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            job = _visible_jobs(request.user).get(pk=pk)
+        except Job.DoesNotExist:
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        data = JobSerializer(job).data
+        data['result_url'] = request.build_absolute_uri(f'/api/jobs/{job.pk}/result/') if job.result_path else None
+        return Response({"message": "Job fetched successfully", "data": data}, status=status.HTTP_200_OK)
+
+
+class JobResultView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            job = _visible_jobs(request.user).get(pk=pk)
+        except Job.DoesNotExist:
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != 'Succeeded' or not job.result_path:
+            return Response({'error': f'Job has no result to download (status: {job.status})'},
+                            status=status.HTTP_409_CONFLICT)
+        if not default_storage.exists(job.result_path):
+            return Response({'error': 'Job result has expired'}, status=status.HTTP_410_GONE)
+        return FileResponse(default_storage.open(job.result_path, 'rb'), as_attachment=True,
+                            filename=os.path.basename(job.result_path))
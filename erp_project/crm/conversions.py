@@ -0,0 +1,447 @@
+"""
+Document conversions for sales orders: purchase orders for shortfalls,
+delivery notes and invoices.
+
+Each conversion takes any number of source documents and writes them in a
+fixed number of queries, however many documents or lines there are:
+
+* the sources and their lines are loaded once, with everything the copies need,
+* document numbers come from one ``allocate_block`` per call, in the same
+  sequence and format as the models' single-row defaults,
+* headers, then lines, are written with ``bulk_create``, all in one transaction.
+
+``bulk_create`` skips the item models' ``save()``, so lines are priced here
+through core.pricing, the same way ``save()`` prices them.  It also skips the
+``post_save`` signal, so the cached list counts are bumped explicitly.
+
+    create_delivery_notes(SalesOrder.objects.filter(status='Submitted'), user)
+    create_invoices(orders)
+    create_invoices_from_delivery_notes(delivery_notes)
+    create_purchase_orders([sales_order], partial=False)
+"""
+from datetime import timedelta
+from decimal import ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.counting import bump_table_version
+from core.pricing import CENT, HUNDRED, ZERO, line_totals, price_items
+from core.sequences import allocate_block, last_number
+from masters.models import Product
+from purchase.models import PurchaseOrder, PurchaseOrderItem
+
+from .models import (
+    DeliveryNote, DeliveryNoteItem, Invoice, InvoiceItem, OrderSummary,
+    SalesOrder, SalesOrderHistory, SalesOrderItem, StockReservation,
+)
+from .stock import available_quantities, consume_lines, lock_products, ship_unreserved
+
+DELIVERABLE_STATUSES = ['Submitted', 'Submitted(PD)', 'Partially Delivered']
+INVOICEABLE_STATUSES = DELIVERABLE_STATUSES + ['Delivered']
+INVOICE_PAYMENT_DAYS = 30
+PURCHASE_LEAD_DAYS = 7
+
+
+def _allocate_codes(name, model, field, count, template):
+    block = allocate_block(name, count, initial=lambda: last_number(model, field))
+    return [template.format(num) for num in block]
+
+
+def _insert(model, objs, code_field=None):
+    """``bulk_create`` that leaves every instance with its pk, even on MySQL."""
+    model.objects.bulk_create(objs, batch_size=500)
+    if code_field and any(obj.pk is None for obj in objs):
+        # Backends without RETURNING: look the new rows up by their unique codes
+        pks = dict(
+            model.objects.filter(**{f'{code_field}__in': [getattr(obj, code_field) for obj in objs]})
+            .values_list(code_field, 'pk')
+        )
+        for obj in objs:
+            obj.pk = pks[getattr(obj, code_field)]
+    return objs
+
+
+def _bump(*models):
+    for model in models:
+        bump_table_version(model._meta.db_table)
+
+
+def _lock_orders(sales_orders, statuses):
+    """Locks the given orders in pk order and returns those in ``statuses``."""
+    return list(
+        SalesOrder.objects.select_for_update(of=('self',))
+        .filter(pk__in=[getattr(order, 'pk', order) for order in sales_orders], status__in=statuses)
+        .select_related('customer')
+        .order_by('pk')
+    )
+
+
+def _lines_by_order(orders, *related):
+    lines = {order.pk: [] for order in orders}
+    queryset = (
+        SalesOrderItem.objects.filter(sales_order__in=lines)
+        .select_related('uom', 'product', *related)
+        .order_by('sales_order_id', 'pk')
+    )
+    for line in queryset:
+        lines[line.sales_order_id].append(line)
+    return lines
+
+
+def _copied_quantities(item_model, parent, status_field, orders):
+    """{(order_id, product_id): units} already copied onto documents that aren't cancelled."""
+    reference = f'{parent}__sales_order_reference'
+    rows = (
+        item_model.objects.filter(**{f'{reference}__in': orders})
+        .exclude(**{f'{parent}__{status_field}': 'Cancelled'})
+        .order_by()
+        .values(reference, 'product')
+        .annotate(units=Sum('quantity'))
+        .values_list(reference, 'product', 'units')
+    )
+    return {(order_id, product_id): units for order_id, product_id, units in rows}
+
+
+def _customer_name(customer):
+    if customer is None:
+        return ''
+    return customer.company_name or f'{customer.first_name} {customer.last_name}'.strip()
+
+
+def _uom_name(line):
+    return line.uom.name if line.uom_id else ''
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Delivery notes
+# ──────────────────────────────────────────────────────────────────────────────
+
+@transaction.atomic
+def create_delivery_notes(sales_orders, user=None):
+    """
+    Ships every deliverable order in ``sales_orders`` (instances or pks) on
+    one delivery note each and returns the notes.  An order holding stock
+    reservations ships what each line holds, up to what it still owes; any
+    other order ships whatever hasn't been delivered yet, as far as available
+    stock goes.  The orders move to Delivered or Partially Delivered, the
+    shipped units leave stock and the status change is logged.  Orders with
+    nothing to ship are skipped.
+    """
+    orders = _lock_orders(sales_orders, DELIVERABLE_STATUSES)
+    if not orders:
+        return []
+    lines = _lines_by_order(orders)
+    delivered = _copied_quantities(DeliveryNoteItem, 'delivery_note', 'delivery_status', orders)
+    held = dict(
+        StockReservation.objects.filter(sales_order_item__sales_order__in=orders, status='Active')
+        .order_by()
+        .values('sales_order_item')
+        .annotate(units=Sum('quantity'))
+        .values_list('sales_order_item', 'units')
+    )
+
+    # Unreserved lines ship from what is free right now, orders served in pk order
+    reserved_lines = set(held)
+    free = lock_products({
+        line.product_id for order_lines in lines.values() for line in order_lines
+        if line.pk not in reserved_lines
+    })
+
+    plans, consumed = [], {}
+    for order in orders:
+        reserved = any(line.pk in held for line in lines[order.pk])
+        shipments, complete, order_consumed = [], True, {}
+        for line in lines[order.pk]:
+            outstanding = line.quantity - delivered.get((order.pk, line.product_id), 0)
+            if reserved:
+                units = min(held.get(line.pk, 0), outstanding)
+            else:
+                units = max(min(outstanding, free.get(line.product_id, 0)), 0)
+                free[line.product_id] = free.get(line.product_id, 0) - units
+            if units > 0:
+                shipments.append((line, units))
+            complete = complete and units >= outstanding
+            if line.pk in held:
+                order_consumed[line.pk] = (units, units >= outstanding)
+        if shipments:
+            plans.append((order, shipments, complete, reserved))
+            consumed.update(order_consumed)
+    if not plans:
+        return []
+
+    today = timezone.localdate()
+    codes = _allocate_codes('DN', DeliveryNote, 'DN_ID', len(plans), 'DN-{:04d}')
+    notes = _insert(DeliveryNote, [
+        DeliveryNote(
+            DN_ID=code,
+            delivery_date=today,
+            sales_order_reference=order,
+            customer_name=_customer_name(order.customer),
+            destination_address=(order.customer.address or '') if order.customer else '',
+            delivery_status='Delivered' if complete else 'Partially Delivered',
+            partially_delivered=not complete,
+        )
+        for code, (order, _, complete, _) in zip(codes, plans)
+    ], 'DN_ID')
+    DeliveryNoteItem.objects.bulk_create([
+        DeliveryNoteItem(delivery_note=note, product_id=line.product_id, quantity=units, uom=_uom_name(line))
+        for note, (_, shipments, _, _) in zip(notes, plans)
+        for line, units in shipments
+    ], batch_size=500)
+
+    # Reserved units leave both counters at once; unreserved ones only leave quantity
+    consume_lines(consumed)
+    unreserved = {}
+    for _, shipments, _, reserved in plans:
+        if not reserved:
+            for line, units in shipments:
+                unreserved[line.product_id] = unreserved.get(line.product_id, 0) + units
+    ship_unreserved(unreserved)
+
+    _set_statuses(
+        {order: 'Delivered' if complete else 'Partially Delivered' for order, _, complete, _ in plans},
+        user,
+    )
+    _bump(DeliveryNote, DeliveryNoteItem)
+    return notes
+
+
+def _set_statuses(new_statuses, user):
+    """Saves ``{order: status}`` with one UPDATE per status and logs each change."""
+    now = timezone.now()
+    changes = {}
+    for order, status in new_statuses.items():
+        if order.status != status:
+            changes.setdefault(status, []).append(order)
+    history = []
+    for status, orders in changes.items():
+        values = {'status': status, 'updated_at': now}
+        if user is not None:
+            values['updated_by'] = user
+        SalesOrder.objects.filter(pk__in=[order.pk for order in orders]).update(**values)
+        for order in orders:
+            order.status = status
+            history.append(SalesOrderHistory(
+                sales_order=order, event_type='status_change', status=status, action_by=user,
+            ))
+    SalesOrderHistory.objects.bulk_create(history, batch_size=500)
+    if history:
+        _bump(SalesOrder, SalesOrderHistory)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Invoices
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _invoice_header(order, today, due_date=None, shipping_address=None):
+    # Field values, not an instance: Invoice() would run generate_invoice_id()
+    customer = order.customer if order else None
+    billing_address = (customer.address or '') if customer else ''
+    header = {
+        'invoice_date': today,
+        'due_date': due_date or today + timedelta(days=INVOICE_PAYMENT_DAYS),
+        'sales_order_reference': order,
+        'customer': customer,
+        'billing_address': billing_address,
+        'shipping_address': billing_address if shipping_address is None else shipping_address,
+        'email_id': customer.email if customer else '',
+        'phone_number': customer.phone_number if customer else '',
+    }
+    if order is not None:
+        header['currency'] = order.currency
+    return header
+
+
+def _summary(invoice, items):
+    # Same arithmetic as OrderSummary.save(), with no discount, shipping or payments yet
+    subtotal = sum((item.total for item in items), ZERO)
+    tax_summary = sum((item.tax * item.total / HUNDRED for item in items), ZERO)
+    grand_total = (subtotal + tax_summary).quantize(CENT, rounding=ROUND_HALF_UP)
+    return OrderSummary(
+        invoice=invoice,
+        subtotal=subtotal,
+        tax_summary=tax_summary.quantize(CENT, rounding=ROUND_HALF_UP),
+        grand_total=grand_total,
+        balance_due=grand_total,
+    )
+
+
+def _write_invoices(drafts):
+    """Numbers, prices and inserts ``[(header, [items])]``; returns the invoices."""
+    if not drafts:
+        return []
+    all_items = price_items([item for _, items in drafts for item in items])
+    codes = _allocate_codes('INV', Invoice, 'INVOICE_ID', len(drafts), 'INV-{:04d}')
+    invoices = _insert(Invoice, [
+        Invoice(INVOICE_ID=code, invoice_total=sum((item.total for item in items), ZERO), **header)
+        for code, (header, items) in zip(codes, drafts)
+    ], 'INVOICE_ID')
+    for invoice, (_, items) in zip(invoices, drafts):
+        for item in items:
+            item.invoice = invoice
+    InvoiceItem.objects.bulk_create(all_items, batch_size=500)
+    OrderSummary.objects.bulk_create(
+        [_summary(invoice, items) for invoice, (_, items) in zip(invoices, drafts)], batch_size=500
+    )
+    _bump(Invoice, InvoiceItem, OrderSummary)
+    return invoices
+
+
+@transaction.atomic
+def create_invoices(sales_orders):
+    """
+    Invoices every invoiceable order in ``sales_orders`` (instances or pks)
+    for the quantities not yet invoiced, at the order's own prices, and
+    returns the invoices.  Orders with nothing left to invoice are skipped.
+    """
+    orders = _lock_orders(sales_orders, INVOICEABLE_STATUSES)
+    if not orders:
+        return []
+    lines = _lines_by_order(orders)
+    invoiced = _copied_quantities(InvoiceItem, 'invoice', 'invoice_status', orders)
+
+    today = timezone.localdate()
+    drafts = []
+    for order in orders:
+        items = []
+        for line in lines[order.pk]:
+            units = line.quantity - invoiced.get((order.pk, line.product_id), 0)
+            if units > 0:
+                items.append(InvoiceItem(
+                    product_id=line.product_id, quantity=units, uom=_uom_name(line),
+                    unit_price=line.unit_price, discount=line.discount, tax=line.tax_rate,
+                ))
+        if items:
+            drafts.append((_invoice_header(order, today, due_date=order.due_date), items))
+    return _write_invoices(drafts)
+
+
+@transaction.atomic
+def create_invoices_from_delivery_notes(delivery_notes):
+    """
+    Invoices each delivery note in ``delivery_notes`` (instances or pks) for
+    exactly what it shipped and returns the invoices.  Lines are priced as on
+    the sales order the note references, or at the product's list price for
+    products that aren't on it.  Cancelled and empty notes are skipped.
+    """
+    notes = list(
+        DeliveryNote.objects.filter(pk__in=[getattr(note, 'pk', note) for note in delivery_notes])
+        .exclude(delivery_status='Cancelled')
+        .select_related('sales_order_reference__customer')
+        .order_by('pk')
+    )
+    items_by_note = {note.pk: [] for note in notes}
+    for item in DeliveryNoteItem.objects.filter(delivery_note__in=notes).order_by('delivery_note_id', 'pk'):
+        items_by_note[item.delivery_note_id].append(item)
+
+    order_prices = {
+        (order_id, product_id): (unit_price, discount, tax_rate)
+        for order_id, product_id, unit_price, discount, tax_rate in SalesOrderItem.objects.filter(
+            sales_order__in={note.sales_order_reference_id for note in notes if note.sales_order_reference_id}
+        ).values_list('sales_order', 'product', 'unit_price', 'discount', 'tax_rate')
+    }
+    unpriced = {
+        item.product_id
+        for note in notes for item in items_by_note[note.pk]
+        if (note.sales_order_reference_id, item.product_id) not in order_prices
+    }
+    list_prices = {
+        pk: (unit_price, discount, tax_rate or ZERO)
+        for pk, unit_price, discount, tax_rate in Product.objects.filter(pk__in=unpriced)
+        .values_list('pk', 'unit_price', 'discount', 'tax_code__percentage')
+    }
+
+    today = timezone.localdate()
+    drafts = []
+    for note in notes:
+        items = []
+        for shipped in items_by_note[note.pk]:
+            unit_price, discount, tax_rate = order_prices.get(
+                (note.sales_order_reference_id, shipped.product_id),
+                list_prices.get(shipped.product_id, (ZERO, ZERO, ZERO)),
+            )
+            items.append(InvoiceItem(
+                product_id=shipped.product_id, quantity=shipped.quantity, uom=shipped.uom,
+                unit_price=unit_price, discount=discount, tax=tax_rate,
+            ))
+        if items:
+            header = _invoice_header(note.sales_order_reference, today, shipping_address=note.destination_address)
+            drafts.append((header, items))
+    return _write_invoices(drafts)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Purchase orders
+# ──────────────────────────────────────────────────────────────────────────────
+
+@transaction.atomic
+def create_purchase_orders(sales_orders, partial=False):
+    """
+    Raises a draft purchase order per (sales order, product supplier) for the
+    lines available stock can't cover and returns them.  Each line orders the
+    shortfall, or its full quantity with ``partial``.  Orders are served in
+    pk order, each using up the stock left over from the previous ones.
+    """
+    orders = list(
+        SalesOrder.objects.filter(pk__in=[getattr(order, 'pk', order) for order in sales_orders])
+        .order_by('pk')
+    )
+    lines = _lines_by_order(orders, 'product__supplier', 'product__tax_code')
+    remaining = available_quantities({line.product_id for order_lines in lines.values() for line in order_lines})
+
+    groups = {}
+    for order in orders:
+        for line in lines[order.pk]:
+            available = max(remaining.get(line.product_id, 0), 0)
+            remaining[line.product_id] = available - min(available, line.quantity)
+            shortfall = line.quantity - available
+            if shortfall <= 0:
+                continue
+            supplier = line.product.supplier
+            groups.setdefault((order, supplier.name if supplier else ''), []).append(
+                (line, line.quantity if partial else shortfall, shortfall)
+            )
+    if not groups:
+        return []
+
+    today = timezone.localdate()
+    template = f'PO-{timezone.now():%Y%m%d}-' + '{:03d}'
+    codes = _allocate_codes('PO', PurchaseOrder, 'PO_ID', len(groups), template)
+    headers, all_items = [], []
+    for code, ((order, supplier_name), shortages) in zip(codes, groups.items()):
+        items = []
+        for line, units, shortfall in shortages:
+            product = line.product
+            items.append(PurchaseOrderItem(
+                product_id=product.pk, qty_ordered=units, insufficient_stock=shortfall,
+                unit_price=product.unit_price,
+                tax=product.tax_code.percentage if product.tax_code else ZERO,
+            ))
+        # Net and gross per line, so the header splits subtotal and tax the same way
+        net = line_totals([(item.qty_ordered, item.unit_price, ZERO, ZERO) for item in items])
+        gross = line_totals([(item.qty_ordered, item.unit_price, ZERO, item.tax) for item in items])
+        for item, total in zip(items, gross):
+            item.total = total
+        subtotal, total = sum(net, ZERO), sum(gross, ZERO)
+        headers.append(PurchaseOrder(
+            PO_ID=code,
+            delivery_date=order.due_date or today + timedelta(days=PURCHASE_LEAD_DAYS),
+            sales_order_reference=order.sales_order_id,
+            supplier_name=supplier_name,
+            currency=order.currency,
+            subtotal=subtotal,
+            tax_summary=total - subtotal,
+            shipping_charges=ZERO,
+            total_order_value=total,
+        ))
+        all_items.append(items)
+
+    purchase_orders = _insert(PurchaseOrder, headers, 'PO_ID')
+    for purchase_order, items in zip(purchase_orders, all_items):
+        for item in items:
+            item.purchase_order = purchase_order
+    PurchaseOrderItem.objects.bulk_create([item for items in all_items for item in items], batch_size=500)
+    _bump(PurchaseOrder, PurchaseOrderItem)
+    return purchase_orders
@@ -0,0 +1,61 @@
+"""
+Quotation expiry sweep.
+
+Quotations past their ``expiry_date`` used to be flipped to ``Expired`` on
+every list GET and every save, so a read endpoint took write locks.  The
+``expire_quotations`` management command now runs this sweep once per
+interval instead (cron, or ``--interval`` for a long-running process).
+
+Each chunk is its own short transaction that only touches rows still due, so
+the sweep never holds locks for long and is safe to run concurrently with
+the API or with itself.  Transitions call ``expire_if_due`` first, so a
+quotation the sweep hasn't reached yet still can't be approved or converted.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.counting import bump_table_version
+
+from .models import Quotation
+
+EXPIRABLE_STATUSES = ['Draft', 'Submitted', 'Approved']
+DEFAULT_CHUNK_SIZE = 500
+
+
+def due_quotations(today=None):
+    """Quotations whose expiry date has passed and that can still expire."""
+    today = today or timezone.localdate()
+    return Quotation.objects.filter(status__in=EXPIRABLE_STATUSES, expiry_date__lt=today)
+
+
+def expire_if_due(quotation, today=None):
+    """Expires ``quotation`` now if it is past due; returns True if it was."""
+    today = today or timezone.localdate()
+    if quotation.status not in EXPIRABLE_STATUSES or not quotation.expiry_date or quotation.expiry_date >= today:
+        return False
+    # Conditional, like the sweep: a concurrent sweep or transition may have got there first
+    if due_quotations(today).filter(pk=quotation.pk).update(status='Expired', updated_at=timezone.now()):
+        bump_table_version(Quotation._meta.db_table)
+    quotation.status = 'Expired'
+    return True
+
+
+def expire_due_quotations(today=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Marks every due quotation ``Expired`` in chunks; returns how many changed."""
+    today = today or timezone.localdate()
+    expired = 0
+    while True:
+        ids = list(due_quotations(today).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            expired += due_quotations(today).filter(pk__in=ids).update(
+                status='Expired', updated_at=timezone.now()
+            )
+        if len(ids) < chunk_size:
+            break
+
+    if expired:
+        # update() skips the post_save signal that keeps cached list counts fresh
+        bump_table_version(Quotation._meta.db_table)
+    return expired
@@ -0,0 +1,166 @@
+"""
+Diff-based persistence for quotation and sales order lines.
+
+The write serializers used to save lines one at a time: a ``get()`` per
+existing line, a ``save()`` per line that lazily loaded its product and tax,
+and a delete per dropped line.  Here a whole payload is applied in a fixed
+number of queries:
+
+* ``resolve_item_refs`` loads every referenced product, UOM and tax code in
+  one query each (during validation, so bad ids are a 400 before any write),
+* ``sync_order_items`` loads the order's current lines once, prices every
+  line in memory and applies the diff with one ``bulk_create``, one
+  ``bulk_update`` and one delete, then recalculates the stored totals once.
+
+Lines are priced as one batch by core.pricing, like the item models' ``save()``.
+"""
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from core.pricing import price_items
+from masters.models import Product, TaxCode, UOM
+
+from .totals import deferred_totals, items_relation, schedule_totals
+
+REQUIRED_FOR_NEW = ('product', 'uom', 'unit_price')
+PRICED_FIELDS = [
+    'product', 'product_name', 'product_id_display', 'uom', 'unit_price',
+    'discount', 'tax', 'tax_rate', 'quantity', 'total',
+]
+DUPLICATE_PRODUCT = "This product is already added in this {}. You cannot add it again."
+
+
+class OrderItemWriteSerializer(serializers.Serializer):
+    """
+    One line of a quotation/sales order payload.  References stay plain ids
+    here; ``resolve_item_refs`` looks them up for the whole list at once.
+    """
+    id = serializers.IntegerField(required=False, allow_null=True)
+    product = serializers.IntegerField()
+    uom = serializers.IntegerField()
+    tax = serializers.IntegerField(required=False, allow_null=True)
+    unit_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    discount = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+    quantity = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if 'unit_price' in data and data['unit_price'] <= 0:
+            raise serializers.ValidationError({"unit_price": "Must be positive"})
+
+        if 'quantity' in data and data['quantity'] < 1:
+            raise serializers.ValidationError({"quantity": "Must be at least 1"})
+
+        return data
+
+
+def _snapshot(item):
+    # attname (product_id, not product) so comparing never loads a relation
+    return [getattr(item, item._meta.get_field(field).attname) for field in PRICED_FIELDS]
+
+
+def resolve_item_refs(items):
+    """
+    Replaces the product/uom/tax ids in validated ``items`` with instances,
+    loading each model once.  Raises a per-line ValidationError for unknown
+    ids and for new lines missing a required field.
+    """
+    def ids(name):
+        return {item[name] for item in items if item.get(name) is not None}
+
+    products = Product.objects.only('id', 'name', 'product_id').in_bulk(ids('product'))
+    uoms = UOM.objects.only('id', 'name').in_bulk(ids('uom'))
+    taxes = TaxCode.objects.only('id', 'name', 'percentage').in_bulk(ids('tax'))
+    lookups = {'product': products, 'uom': uoms, 'tax': taxes}
+
+    errors, has_errors = [], False
+    for item in items:
+        error = {}
+        if not item.get('id'):
+            for name in REQUIRED_FOR_NEW:
+                if item.get(name) is None:
+                    error[name] = "This field is required."
+        for name, found in lookups.items():
+            pk = item.get(name)
+            if pk is None:
+                continue
+            if pk not in found:
+                error[name] = f'Invalid pk "{pk}" - object does not exist.'
+            else:
+                item[name] = found[pk]
+        errors.append(error)
+        has_errors = has_errors or bool(error)
+
+    if has_errors:
+        raise serializers.ValidationError(errors)
+    return items
+
+
+def sync_order_items(order, items, created=False):
+    """
+    Makes ``order``'s lines match ``items`` (as returned by
+    ``resolve_item_refs``): lines with an ``id`` are updated, lines without
+    one are created, and existing lines that were not sent are deleted.
+    ``created`` skips loading current lines for a brand-new order.
+    """
+    order_model = type(order)
+    item_model, parent = items_relation(order_model)
+    label = order_model._meta.verbose_name
+
+    existing = {}
+    if not created:
+        existing = {
+            item.pk: item
+            for item in item_model.objects.filter(**{parent: order}).select_related('product', 'tax')
+        }
+
+    priced, kept = [], set()
+    errors, has_errors = [], False
+    for data in items:
+        data = dict(data)
+        item_id = data.pop('id', None)
+        error = {}
+        if item_id:
+            item = existing.get(item_id)
+            if item is None:
+                error['id'] = f"Item {item_id} does not belong to this {label}."
+            else:
+                before = _snapshot(item)
+                for attr, value in data.items():
+                    setattr(item, attr, value)
+                kept.add(item_id)
+        else:
+            item = item_model(**{parent: order}, **data)
+        errors.append(error)
+        has_errors = has_errors or bool(error)
+        if error:
+            continue
+
+        item.product_name = item.product.name
+        item.product_id_display = item.product.product_id
+        item.tax_rate = item.tax.percentage if item.tax else Decimal("0.00")
+        priced.append((item, before if item_id else None))
+
+    if has_errors:
+        raise serializers.ValidationError({'items': errors})
+
+    price_items([item for item, _ in priced], tax_rate='tax_rate')
+    to_create = [item for item, before in priced if before is None]
+    to_update = [item for item, before in priced if before is not None and _snapshot(item) != before]
+
+    removed = [pk for pk in existing if pk not in kept]
+    final = [existing[pk] for pk in kept] + to_create
+    product_ids = [item.product_id for item in final]
+    if len(product_ids) != len(set(product_ids)):
+        raise serializers.ValidationError({'items': DUPLICATE_PRODUCT.format(label)})
+
+    # Defer so the deletes' post_delete signals and this call share one recalculation
+    with deferred_totals():
+        if to_create:
+            item_model.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            item_model.objects.bulk_update(to_update, PRICED_FIELDS, batch_size=500)
+        if removed:
+            item_model.objects.filter(pk__in=removed).delete()
+        if to_create or to_update or removed:
+            schedule_totals(order_model, order.pk, order)
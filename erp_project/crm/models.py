@@ -2,6 +2,12 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
 
+from core.pricing import line_total
+from core.sequences import last_number, next_value
+
+from .totals import deferred_totals, refresh_order_totals
+
+
 class Enquiry(models.Model):
     enquiry_id = models.CharField(max_length=10, unique=True, editable=False)  # ENQ001
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='enquiries')
@@ -127,19 +133,16 @@ class Enquiry(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = "Enquiries"
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.enquiry_id} - {self.first_name} {self.last_name}"
 
     def save(self, *args, **kwargs):
         if not self.enquiry_id:
-            last = Enquiry.objects.order_by('-id').first()
-            num = 1
-            if last and last.enquiry_id:
-                try:
-                    num = int(last.enquiry_id.replace('ENQ', '')) + 1
-                except:
-                    pass
+            num = next_value('ENQ', initial=lambda: last_number(Enquiry, 'enquiry_id'))
             self.enquiry_id = f"ENQ{num:04d}"
         super().save(*args, **kwargs)
 
@@ -160,7 +163,7 @@ class EnquiryItem(models.Model):
         return f"{self.item_code or 'Item'} - {self.product_description[:50]}"
 
     def save(self, *args, **kwargs):
-        self.total_amount = self.selling_price * self.quantity
+        self.total_amount = line_total(self.quantity, self.selling_price)
         super().save(*args, **kwargs)
 
 
@@ -231,50 +234,37 @@ class Quotation(models.Model):
     shipping_charges = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
     rounding_adjustment = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"), editable=False)
 
+    # Maintained by crm.totals whenever the items change
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+    tax_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+    grand_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['grand_total', 'id']),
+            models.Index(fields=['status', 'expiry_date']),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.quotation_id:
-            last = Quotation.objects.order_by('-id').first()
-            num = 1
-            if last and last.quotation_id:
-                try:
-                    num = int(last.quotation_id.replace('QUO', '')) + 1
-                except:
-                    pass
+            num = next_value('QUO', initial=lambda: last_number(Quotation, 'quotation_id'))
             self.quotation_id = f"QUO{num:04d}"
 
-        if self.expiry_date and self.expiry_date < timezone.now().date():
-            if self.status not in ['Expired', 'Rejected', 'Converted to SO']:
-                self.status = 'Expired'
-
+        # Expiry is applied by the expire_quotations sweep (crm.expiry)
+        refresh_order_totals(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
-    @property
-    def subtotal(self):
-        return self.items.aggregate(subtotal=Sum('total'))['subtotal'] or Decimal("0.00")
+    def delete(self, *args, **kwargs):
+        with deferred_totals():
+            return super().delete(*args, **kwargs)
 
     @property
     def tax_summary(self):
-        return self.items.aggregate(
-            tax=Sum(F('total') * F('tax_rate') / Decimal("100"))
-        )['tax'] or Decimal("0.00")
-
-    @property
-    def grand_total(self):
-        subtotal = self.subtotal
-        discount_rate = self.global_discount or Decimal("0.00")
-        shipping = self.shipping_charges or Decimal("0.00")
-        tax = self.tax_summary
-
-        discount = subtotal * (discount_rate / Decimal("100"))
-        total = subtotal - discount + tax + shipping
-
-        rounded_total = total.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-        self.rounding_adjustment = rounded_total - total
-
-        return (total + self.rounding_adjustment).quantize(Decimal("0.01"))
+        return self.tax_total
 
     def __str__(self):
         return self.quotation_id
@@ -299,15 +289,7 @@ class QuotationItem(models.Model):
         self.product_name = self.product.name
         self.product_id_display = self.product.product_id
         self.tax_rate = self.tax.percentage if self.tax else Decimal("0.00")
-
-        qty = Decimal(str(self.quantity))
-        subtotal = qty * self.unit_price
-
-        discount_amount = subtotal * (self.discount / Decimal("100"))
-        after_discount = subtotal - discount_amount
-
-        tax_amount = after_discount * (self.tax_rate / Decimal("100"))
-        self.total = after_discount + tax_amount
+        self.total = line_total(self.quantity, self.unit_price, self.discount, self.tax_rate)
 
         super().save(*args, **kwargs)
 
@@ -391,7 +373,7 @@ from django.utils import timezone
 from django.db.models import Sum, F, DecimalField as DJDecimalField
 from decimal import Decimal, ROUND_HALF_UP
 
-from masters.models import Customer, Product, UOM, TaxCode
+from masters.models import Customer, Product, UOM, TaxCode, Warehouse
 
 
 
@@ -449,48 +431,37 @@ class SalesOrder(models.Model):
     shipping_charges = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
     rounding_adjustment = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"), editable=False)
 
+    # Maintained by crm.totals whenever the items change
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+    tax_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+    grand_total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Draft')
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['grand_total', 'id']),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.sales_order_id:
-            last = SalesOrder.objects.order_by('-id').first()
-            num = 1
-            if last and last.sales_order_id:
-                try:
-                    num = int(last.sales_order_id.replace('SO-', '')) + 1
-                except:
-                    pass
+            num = next_value('SO', initial=lambda: last_number(SalesOrder, 'sales_order_id'))
             self.sales_order_id = f"SO-{num:04d}"
 
+        refresh_order_totals(self, kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
-    @property
-    def subtotal(self):
-        return self.items.aggregate(subtotal=Sum('total', output_field=DJDecimalField()))['subtotal'] or Decimal("0.00")
+    def delete(self, *args, **kwargs):
+        with deferred_totals():
+            return super().delete(*args, **kwargs)
 
     @property
     def tax_summary(self):
-        return self.items.aggregate(
-            tax=Sum(F('total') * F('tax_rate') / Decimal("100"), output_field=DJDecimalField())
-        )['tax'] or Decimal("0.00")
-
-    @property
-    def grand_total(self):
-        subtotal = self.subtotal
-        discount_rate = self.global_discount or Decimal("0.00")
-        shipping = self.shipping_charges or Decimal("0.00")
-        tax = self.tax_summary
-
-        discount = subtotal * (discount_rate / Decimal("100"))
-        total = subtotal - discount + tax + shipping
-
-        rounded_total = total.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
-        self.rounding_adjustment = rounded_total - total
-
-        return (total + self.rounding_adjustment).quantize(Decimal("0.01"))
+        return self.tax_total
 
     def __str__(self):
         return self.sales_order_id
@@ -515,15 +486,7 @@ class SalesOrderItem(models.Model):
         self.product_name = self.product.name
         self.product_id_display = self.product.product_id
         self.tax_rate = self.tax.percentage if self.tax else Decimal("0.00")
-
-        qty = Decimal(str(self.quantity))
-        subtotal = qty * self.unit_price
-
-        discount_amount = subtotal * (self.discount / Decimal("100"))
-        after_discount = subtotal - discount_amount
-
-        tax_amount = after_discount * (self.tax_rate / Decimal("100"))
-        self.total = after_discount + tax_amount
+        self.total = line_total(self.quantity, self.unit_price, self.discount, self.tax_rate)
 
         super().save(*args, **kwargs)
 
@@ -562,10 +525,43 @@ class SalesOrderHistory(models.Model):
     def __str__(self):
         return f"{self.event_type} for {self.sales_order.sales_order_id}"
 
+
+class StockReservation(models.Model):
+    """
+    Units of a product held for one sales order line, from submit until the
+    line is delivered or the order is cancelled.  ``Product.reserved_quantity``
+    is the running sum of the Active rows, kept in step by crm.stock.
+    """
+    STATUS_CHOICES = (
+        ('Active', 'Active'),
+        ('Released', 'Released'),
+        ('Fulfilled', 'Fulfilled'),
+    )
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.SET_NULL, null=True, blank=True)
+    sales_order_item = models.ForeignKey(SalesOrderItem, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Active')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product', 'warehouse', 'sales_order_item'], name='unique_stock_reservation'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['product', 'warehouse', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} for line {self.sales_order_item_id} ({self.status})"
+
 def generate_dn_id():
-    last_dn = DeliveryNote.objects.order_by('-id').first()
-    new_id = f'DN-{str(last_dn.id + 1).zfill(4) if last_dn else "0001"}' if last_dn else "DN-0001"
-    return new_id
+    num = next_value('DN', initial=lambda: last_number(DeliveryNote, 'DN_ID'))
+    return f'DN-{num:04d}'
 
 class DeliveryNoteAttachment(models.Model):
     delivery_note = models.ForeignKey('DeliveryNote', on_delete=models.CASCADE, related_name='attachments')
@@ -586,6 +582,8 @@ class DeliveryNote(models.Model):
     destination_address = models.TextField(blank=True)
     delivery_status = models.CharField(max_length=20, choices=[('Draft', 'Draft'), ('Partially Delivered', 'Partially Delivered'), ('Delivered', 'Delivered'), ('Returned', 'Returned'), ('Cancelled', 'Cancelled')], default='Draft')
     partially_delivered = models.BooleanField(default=False)
+    # Versions the cached PDF (core/documents.py); null on rows from before the field existed
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
 class DeliveryNoteItem(models.Model):
     delivery_note = models.ForeignKey(DeliveryNote, on_delete=models.CASCADE, related_name='items')
@@ -609,9 +607,8 @@ class DeliveryNoteCustomerAcknowledgement(models.Model):
 
 # New Invoice models
 def generate_invoice_id():
-    last_invoice = Invoice.objects.order_by('-id').first()
-    new_id = f'INV-{str(last_invoice.id + 1).zfill(4) if last_invoice else "0001"}' if last_invoice else "INV-0001"
-    return new_id
+    num = next_value('INV', initial=lambda: last_number(Invoice, 'INVOICE_ID'))
+    return f'INV-{num:04d}'
 
 class InvoiceAttachment(models.Model):
     invoice = models.ForeignKey('Invoice', on_delete=models.CASCADE, related_name='attachments')
@@ -645,6 +642,7 @@ class Invoice(models.Model):
     transaction_date = models.DateField(blank=True, null=True)
     payment_status = models.CharField(max_length=20, choices=[('Paid', 'Paid'), ('Partial', 'Partial'), ('Unpaid', 'Unpaid')], default='Unpaid')
     invoice_total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     def save(self, *args, **kwargs):
         if not self.invoice_total:
@@ -670,7 +668,7 @@ class InvoiceItem(models.Model):
             self.unit_price = self.product.unit_price or 0.00
             self.tax = self.product.tax or 0.00
             self.discount = self.product.discount or 0.00
-        self.total = self.quantity * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.quantity, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class OrderSummary(models.Model):
@@ -704,8 +702,8 @@ from .models import Invoice, SalesOrder
 
 
 def generate_invoice_return_id():
-    last_return = InvoiceReturn.objects.order_by('-id').first()
-    return f'INVR-{str(last_return.id + 1).zfill(4) if last_return else "0001"}' if last_return else "INVR-0001"
+    num = next_value('INVR', initial=lambda: last_number(InvoiceReturn, 'INVOICE_RETURN_ID'))
+    return f'INVR-{num:04d}'
 
 class InvoiceReturnAttachment(models.Model):
     invoice_return = models.ForeignKey('InvoiceReturn', on_delete=models.CASCADE, related_name='attachments')
@@ -736,7 +734,7 @@ class InvoiceReturnItem(models.Model):
             self.unit_price = self.product.unit_price or 0.00
             self.tax = self.product.tax or 0.00
             self.discount = self.product.discount or 0.00
-        self.total = self.returned_qty * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.returned_qty, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class InvoiceReturnSummary(models.Model):
@@ -792,8 +790,8 @@ from .models import InvoiceReturn, SalesOrder
 
 
 def generate_delivery_note_return_id():
-    last_return = DeliveryNoteReturn.objects.order_by('-id').first()
-    return f'DNR-{str(last_return.id + 1).zfill(4) if last_return else "0001"}' if last_return else "DNR-0001"
+    num = next_value('DNR', initial=lambda: last_number(DeliveryNoteReturn, 'DNR_ID'))
+    return f'DNR-{num:04d}'
 
 class DeliveryNoteReturnAttachment(models.Model):
     delivery_note_return = models.ForeignKey('DeliveryNoteReturn', on_delete=models.CASCADE, related_name='attachments')
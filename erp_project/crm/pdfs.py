@@ -0,0 +1,77 @@
+"""Printable CRM documents; see core/documents.py."""
+from core.documents import display_name, document, html_pdf, simple_pdf
+
+from .models import (
+    DeliveryNote, DeliveryNoteReturn, Invoice, InvoiceReturn, Quotation, SalesOrder,
+)
+
+
+@document('quotation', Quotation, filename=lambda quotation: f'Quotation_{quotation.quotation_id}.pdf',
+          templates=['quotation_pdf.html'])
+def render_quotation(quotation, base_url=None):
+    context = {
+        'quotation': quotation,
+        'items': quotation.items.all(),
+        'subtotal': quotation.subtotal,
+        'tax_summary': quotation.tax_summary,
+        'global_discount': quotation.global_discount,
+        'shipping_charges': quotation.shipping_charges,
+        'rounding_adjustment': quotation.rounding_adjustment,
+        'grand_total': quotation.grand_total,
+        'comments': quotation.comments.all(),
+        'history': quotation.history.all(),
+        'revisions': quotation.revisions.all()
+    }
+    return html_pdf('quotation_pdf.html', context, base_url=base_url)
+
+
+@document('sales_order', SalesOrder, filename=lambda sales_order: f'SalesOrder_{sales_order.sales_order_id}.pdf',
+          templates=['sales_order_pdf.html'])
+def render_sales_order(sales_order, base_url=None):
+    context = {
+        'sales_order': sales_order,
+        'items': sales_order.items.all(),
+        'subtotal': sales_order.subtotal,
+        'tax_summary': sales_order.tax_summary,
+        'global_discount': sales_order.global_discount,
+        'shipping_charges': sales_order.shipping_charges,
+        'rounding_adjustment': sales_order.rounding_adjustment,
+        'grand_total': sales_order.grand_total,
+        'comments': sales_order.comments.all(),
+        'history': sales_order.history.all()
+    }
+    return html_pdf('sales_order_pdf.html', context, base_url=base_url)
+
+
+@document('delivery_note', DeliveryNote, filename=lambda note: f'delivery_note_{note.DN_ID}.pdf')
+def render_delivery_note(delivery_note, base_url=None):
+    return simple_pdf(f"DN ID: {delivery_note.DN_ID}", [
+        f"Date: {delivery_note.delivery_date}",
+        f"Customer: {delivery_note.customer_name}",
+    ])
+
+
+@document('invoice', Invoice, filename=lambda invoice: f'invoice_{invoice.INVOICE_ID}.pdf')
+def render_invoice(invoice, base_url=None):
+    return simple_pdf(f"Invoice ID: {invoice.INVOICE_ID}", [
+        f"Date: {invoice.invoice_date}",
+        f"Customer: {display_name(invoice.customer)}",
+    ])
+
+
+@document('invoice_return', InvoiceReturn,
+          filename=lambda invoice_return: f'invoice_return_{invoice_return.INVOICE_RETURN_ID}.pdf')
+def render_invoice_return(invoice_return, base_url=None):
+    return simple_pdf(f"Invoice Return ID: {invoice_return.INVOICE_RETURN_ID}", [
+        f"Date: {invoice_return.invoice_return_date}",
+        f"Customer: {display_name(invoice_return.customer)}",
+    ])
+
+
+@document('delivery_note_return', DeliveryNoteReturn,
+          filename=lambda return_obj: f'delivery_note_return_{return_obj.DNR_ID}.pdf')
+def render_delivery_note_return(return_obj, base_url=None):
+    return simple_pdf(f"DNR ID: {return_obj.DNR_ID}", [
+        f"Date: {return_obj.dnr_date}",
+        f"Customer: {display_name(return_obj.customer)}",
+    ])
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core.audit import AuditUserField, AuditUserListSerializer
+from core.dynamic_fields import DynamicFieldsMixin
 from django.db import transaction
 from .models import Enquiry, EnquiryItem
 
@@ -7,7 +9,7 @@ from django.db import transaction
 from .models import Enquiry, EnquiryItem
 
 
-class EnquiryItemSerializer(serializers.ModelSerializer):
+class EnquiryItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(required=False, allow_null=True)
 
     class Meta:
@@ -50,26 +52,21 @@ class EnquiryItemSerializer(serializers.ModelSerializer):
         return data
 
 
-class EnquirySerializer(serializers.ModelSerializer):
+class EnquirySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = EnquiryItemSerializer(many=True, read_only=True)
     grand_total = serializers.SerializerMethodField()
-    user = serializers.StringRelatedField()
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    user = AuditUserField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Enquiry
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'
         read_only_fields = ['created_by', 'updated_by']
 
     def get_grand_total(self, obj):
         return sum(item.total_amount for item in obj.items.all())
-    
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
 class EnquiryWriteSerializer(serializers.ModelSerializer):
@@ -181,6 +178,7 @@ from .models import (
     Quotation, QuotationItem, QuotationAttachment,
     QuotationComment, QuotationHistory, QuotationRevision
 )
+from .line_items import OrderItemWriteSerializer, resolve_item_refs, sync_order_items
 
 User = get_user_model()
 
@@ -195,26 +193,28 @@ from .models import (
     Quotation, QuotationItem, QuotationAttachment,
     QuotationComment, QuotationHistory, QuotationRevision
 )
+from .line_items import OrderItemWriteSerializer, resolve_item_refs, sync_order_items
 
 User = get_user_model()
 
 
 # Child Serializers
-class QuotationItemSerializer(serializers.ModelSerializer):
+class QuotationItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(required=False, allow_null=True)
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_id_display = serializers.CharField(source='product.product_id', read_only=True)
     uom = serializers.PrimaryKeyRelatedField(queryset=UOM.objects.all())
+    in_stock = serializers.IntegerField(source='product.available_quantity', read_only=True)
     tax = serializers.PrimaryKeyRelatedField(queryset=TaxCode.objects.all(), allow_null=True, required=False)
 
     class Meta:
         model = QuotationItem
         fields = [
-            'id', 'product', 'product_name', 'product_id_display', 'uom',
+            'id', 'product', 'product_name', 'product_id_display', 'in_stock', 'uom',
             'unit_price', 'discount', 'tax', 'tax_rate', 'quantity', 'total'
         ]
-        read_only_fields = ['product_name', 'product_id_display', 'tax_rate', 'total']
+        read_only_fields = ['product_name', 'product_id_display', 'in_stock', 'tax_rate', 'total']
 
     def validate_product(self, value):
         quotation = self.context.get('quotation')
@@ -250,40 +250,44 @@ class QuotationItemSerializer(serializers.ModelSerializer):
         return data
 
 
-class QuotationAttachmentSerializer(serializers.ModelSerializer):
-    uploaded_by = serializers.StringRelatedField(read_only=True)
+class QuotationAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    uploaded_by = AuditUserField()
 
     class Meta:
         model = QuotationAttachment
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'file', 'uploaded_by', 'timestamp']
 
 
-class QuotationCommentSerializer(serializers.ModelSerializer):
-    comment_by = serializers.StringRelatedField(read_only=True)
+class QuotationCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    comment_by = AuditUserField()
 
     class Meta:
         model = QuotationComment
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'comment_by', 'comment', 'timestamp']
 
 
-class QuotationHistorySerializer(serializers.ModelSerializer):
-    action_by = serializers.StringRelatedField(read_only=True)
+class QuotationHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    action_by = AuditUserField()
 
     class Meta:
         model = QuotationHistory
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'event_type', 'status', 'extra_info', 'action_by', 'timestamp']
 
 
-class QuotationRevisionSerializer(serializers.ModelSerializer):
-    created_by = serializers.StringRelatedField(read_only=True)
+class QuotationRevisionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
 
     class Meta:
         model = QuotationRevision
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'revision_no', 'revision_date', 'created_by', 'comment', 'status']
 
 
 # Main Serializers
-class QuotationSerializer(serializers.ModelSerializer):
+class QuotationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = QuotationItemSerializer(many=True, read_only=True)
     attachments = QuotationAttachmentSerializer(many=True, read_only=True)
     comments = QuotationCommentSerializer(many=True, read_only=True)
@@ -291,10 +295,10 @@ class QuotationSerializer(serializers.ModelSerializer):
     revisions = QuotationRevisionSerializer(many=True, read_only=True)
 
     customer = CustomerSerializer(read_only=True)
-    sales_rep = serializers.StringRelatedField(read_only=True)
+    sales_rep = AuditUserField()
 
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     subtotal = serializers.ReadOnlyField()
     tax_summary = serializers.ReadOnlyField()
@@ -302,17 +306,33 @@ class QuotationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Quotation
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
 
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
+class OrderCustomerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ['id', 'customer_id', 'first_name', 'last_name', 'company_name']
+
+
+class QuotationListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Grid row: flat columns plus the customer, no nested items or history."""
+    customer = OrderCustomerSerializer(read_only=True)
+    sales_rep = AuditUserField()
+
+    class Meta:
+        model = Quotation
+        list_serializer_class = AuditUserListSerializer
+        fields = [
+            'id', 'quotation_id', 'customer', 'sales_rep', 'quotation_type',
+            'quotation_date', 'expiry_date', 'currency', 'status', 'grand_total',
+            'created_at', 'updated_at'
+        ]
 
 
 class QuotationWriteSerializer(serializers.ModelSerializer):
-    items = QuotationItemSerializer(many=True, required=False, allow_empty=True)
+    items = OrderItemWriteSerializer(many=True, required=False, allow_empty=True)
     comments = QuotationCommentSerializer(many=True, required=False, allow_empty=True)
 
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
@@ -340,6 +360,9 @@ class QuotationWriteSerializer(serializers.ModelSerializer):
 
         return data
 
+    def validate_items(self, items):
+        return resolve_item_refs(items)
+
     @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
@@ -351,13 +374,7 @@ class QuotationWriteSerializer(serializers.ModelSerializer):
             **validated_data
         )
 
-        for item_data in items_data:
-            serializer = QuotationItemSerializer(
-                data=item_data,
-                context={'quotation': quotation}
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save(quotation=quotation)
+        sync_order_items(quotation, items_data, created=True)
 
 
         for comment_data in comments_data:
@@ -384,33 +401,7 @@ class QuotationWriteSerializer(serializers.ModelSerializer):
 
         # items update
         if items_data is not None:
-            sent_item_ids = []
-
-            for item_data in items_data:
-                item_id = item_data.pop('id', None)
-
-                if item_id:
-                    item = QuotationItem.objects.get(
-                        id=item_id,
-                        quotation=instance
-                    )
-
-                    for attr, value in item_data.items():
-                        setattr(item, attr, value)
-
-                    item.save()
-                    sent_item_ids.append(item.id)
-
-                else:
-                    new_item = QuotationItem.objects.create(
-                        quotation=instance,
-                        **item_data
-                    )
-                    sent_item_ids.append(new_item.id)
-
-            QuotationItem.objects.filter(
-                quotation=instance
-            ).exclude(id__in=sent_item_ids).delete()
+            sync_order_items(instance, items_data)
 
         # comments
         if comments_data:
@@ -441,15 +432,17 @@ from masters.models import Customer, Product, UOM, TaxCode
 from masters.serializers import CustomerSerializer
 
 from .models import SalesOrder, SalesOrderItem, SalesOrderComment, SalesOrderHistory
+from .line_items import OrderItemWriteSerializer, resolve_item_refs, sync_order_items
+from .stock import order_lines_locked
 
 User = get_user_model()
 
-class SalesOrderItemSerializer(serializers.ModelSerializer):
+class SalesOrderItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(required=False, allow_null=True)
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_id_display = serializers.CharField(source='product.product_id', read_only=True)
-    in_stock = serializers.IntegerField(source='product.quantity_in_stock', read_only=True)  # Assuming Product has quantity_in_stock
+    in_stock = serializers.IntegerField(source='product.available_quantity', read_only=True)
     uom = serializers.PrimaryKeyRelatedField(queryset=UOM.objects.all())
     tax = serializers.PrimaryKeyRelatedField(queryset=TaxCode.objects.all(), allow_null=True, required=False)
 
@@ -491,32 +484,34 @@ class SalesOrderItemSerializer(serializers.ModelSerializer):
         return data
 
 
-class SalesOrderCommentSerializer(serializers.ModelSerializer):
-    comment_by = serializers.StringRelatedField(read_only=True)
+class SalesOrderCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    comment_by = AuditUserField()
 
     class Meta:
         model = SalesOrderComment
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'comment_by', 'comment', 'timestamp']
 
 
-class SalesOrderHistorySerializer(serializers.ModelSerializer):
-    action_by = serializers.StringRelatedField(read_only=True)
+class SalesOrderHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    action_by = AuditUserField()
 
     class Meta:
         model = SalesOrderHistory
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'event_type', 'status', 'extra_info', 'action_by', 'timestamp']
 
 
-class SalesOrderSerializer(serializers.ModelSerializer):
+class SalesOrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = SalesOrderItemSerializer(many=True, read_only=True)
     comments = SalesOrderCommentSerializer(many=True, read_only=True)
     history = SalesOrderHistorySerializer(many=True, read_only=True)
 
     customer = CustomerSerializer(read_only=True)
-    sales_rep = serializers.StringRelatedField(read_only=True)
+    sales_rep = AuditUserField()
 
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     subtotal = serializers.ReadOnlyField()
     tax_summary = serializers.ReadOnlyField()
@@ -524,18 +519,28 @@ class SalesOrderSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SalesOrder
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'  
-    
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
 
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
+class SalesOrderListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """Grid row: flat columns plus the customer, no nested items or history."""
+    customer = OrderCustomerSerializer(read_only=True)
+    sales_rep = AuditUserField()
+
+    class Meta:
+        model = SalesOrder
+        list_serializer_class = AuditUserListSerializer
+        fields = [
+            'id', 'sales_order_id', 'customer', 'sales_rep', 'order_type',
+            'order_date', 'due_date', 'currency', 'status', 'grand_total',
+            'created_at', 'updated_at'
+        ]
+
 
 class SalesOrderWriteSerializer(serializers.ModelSerializer):
-    items = SalesOrderItemSerializer(many=True, required=False, allow_empty=True)
+    items = OrderItemWriteSerializer(many=True, required=False, allow_empty=True)
     comments = SalesOrderCommentSerializer(many=True, required=False, allow_empty=True)
 
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
@@ -565,6 +570,9 @@ class SalesOrderWriteSerializer(serializers.ModelSerializer):
 
         return data
 
+    def validate_items(self, items):
+        return resolve_item_refs(items)
+
     @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
@@ -576,13 +584,7 @@ class SalesOrderWriteSerializer(serializers.ModelSerializer):
             **validated_data
         )
 
-        for item_data in items_data:
-            serializer = SalesOrderItemSerializer(
-                data=item_data,
-                context={'sales_order': sales_order}
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save(sales_order=sales_order)
+        sync_order_items(sales_order, items_data, created=True)
 
 
         for comment_data in comments_data:
@@ -599,6 +601,11 @@ class SalesOrderWriteSerializer(serializers.ModelSerializer):
         items_data = validated_data.pop('items', None)
         comments_data = validated_data.pop('comments', None)
 
+        if items_data is not None and order_lines_locked(instance):
+            raise serializers.ValidationError({
+                'items': "Items of a submitted sales order can't be changed. Cancel it and create a new one."
+            })
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
@@ -606,41 +613,7 @@ class SalesOrderWriteSerializer(serializers.ModelSerializer):
         instance.save()
 
         if items_data is not None:
-            sent_item_ids = []
-
-            for item_data in items_data:
-                item_id = item_data.pop('id', None)
-
-                if item_id:
-                    item = SalesOrderItem.objects.get(
-                        id=item_id,
-                        sales_order=instance
-                    )
-
-                    serializer = SalesOrderItemSerializer(
-                        item,
-                        data=item_data,
-                        partial=True,
-                        context={'sales_order': instance}
-                    )
-                    serializer.is_valid(raise_exception=True)
-                    serializer.save()
-
-                    sent_item_ids.append(item.id)
-
-                else:
-                    serializer = SalesOrderItemSerializer(
-                        data=item_data,
-                        context={'sales_order': instance}
-                    )
-                    serializer.is_valid(raise_exception=True)
-                    new_item = serializer.save(sales_order=instance)
-
-                    sent_item_ids.append(new_item.id)
-
-            SalesOrderItem.objects.filter(
-                sales_order=instance
-            ).exclude(id__in=sent_item_ids).delete()
+            sync_order_items(instance, items_data)
 
         if comments_data:
             for comment_data in comments_data:
@@ -654,17 +627,17 @@ class SalesOrderWriteSerializer(serializers.ModelSerializer):
 
 
 # Existing DeliveryNote serializers
-class DeliveryNoteAttachmentSerializer(serializers.ModelSerializer):
+class DeliveryNoteAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteAttachment
         fields = ['id', 'file']
 
-class DeliveryNoteRemarkSerializer(serializers.ModelSerializer):
+class DeliveryNoteRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class DeliveryNoteItemSerializer(serializers.ModelSerializer):
+class DeliveryNoteItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
     serial_numbers = SerialNumberSerializer(many=True, required=False)
 
@@ -678,12 +651,12 @@ class DeliveryNoteItemSerializer(serializers.ModelSerializer):
             data['uom'] = data['product'].uom
         return data
 
-class DeliveryNoteCustomerAcknowledgementSerializer(serializers.ModelSerializer):
+class DeliveryNoteCustomerAcknowledgementSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteCustomerAcknowledgement
         fields = ['id', 'received_by', 'contact_number', 'proof_of_delivery']
 
-class DeliveryNoteSerializer(serializers.ModelSerializer):
+class DeliveryNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = DeliveryNoteItemSerializer(many=True, required=False)
     attachments = DeliveryNoteAttachmentSerializer(many=True, required=False)
     remarks = DeliveryNoteRemarkSerializer(many=True, required=False)
@@ -711,17 +684,17 @@ class DeliveryNoteSerializer(serializers.ModelSerializer):
         return delivery_note
 
 # New Invoice serializers
-class InvoiceAttachmentSerializer(serializers.ModelSerializer):
+class InvoiceAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceAttachment
         fields = ['id', 'file']
 
-class InvoiceRemarkSerializer(serializers.ModelSerializer):
+class InvoiceRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class InvoiceItemSerializer(serializers.ModelSerializer):
+class InvoiceItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
 
     class Meta:
@@ -737,12 +710,12 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
             data['discount'] = data['product'].discount or 0.00
         return data
 
-class OrderSummarySerializer(serializers.ModelSerializer):
+class OrderSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = OrderSummary
         fields = ['id', 'subtotal', 'global_discount', 'tax_summary', 'shipping_charges', 'rounding_adjustment', 'credit_note_applied', 'amount_paid', 'grand_total', 'balance_due']
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = InvoiceItemSerializer(many=True, required=False)
     attachments = InvoiceAttachmentSerializer(many=True, required=False)
     remarks = InvoiceRemarkSerializer(many=True, required=False)
@@ -801,17 +774,17 @@ from masters.serializers import CustomerSerializer, ProductSerializer
 from crm.serializers import  SalesOrderSerializer
 from purchase.serializers import SerialNumberSerializer  # Assumed
 
-class InvoiceReturnAttachmentSerializer(serializers.ModelSerializer):
+class InvoiceReturnAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceReturnAttachment
         fields = ['id', 'file']
 
-class InvoiceReturnRemarkSerializer(serializers.ModelSerializer):
+class InvoiceReturnRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceReturnRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class InvoiceReturnItemSerializer(serializers.ModelSerializer):
+class InvoiceReturnItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
     serial_numbers = SerialNumberSerializer(many=True, read_only=True)
 
@@ -826,22 +799,22 @@ class InvoiceReturnItemSerializer(serializers.ModelSerializer):
             item.serial_numbers.set(serial_numbers_data)
         return item
 
-class InvoiceReturnSummarySerializer(serializers.ModelSerializer):
+class InvoiceReturnSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceReturnSummary
         fields = ['id', 'original_grand_total', 'global_discount', 'return_subtotal', 'global_discount_amount', 'rounding_adjustment', 'amount_to_refund']
 
-class InvoiceReturnHistorySerializer(serializers.ModelSerializer):
+class InvoiceReturnHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceReturnHistory
         fields = ['id', 'user', 'action', 'timestamp']
 
-class InvoiceReturnCommentSerializer(serializers.ModelSerializer):
+class InvoiceReturnCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = InvoiceReturnComment
         fields = ['id', 'user', 'comment', 'timestamp']
 
-class InvoiceReturnSerializer(serializers.ModelSerializer):
+class InvoiceReturnSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = InvoiceReturnItemSerializer(many=True, required=False)
     attachments = InvoiceReturnAttachmentSerializer(many=True, required=False)
     remarks = InvoiceReturnRemarkSerializer(many=True, required=False)
@@ -878,17 +851,17 @@ from masters.serializers import CustomerSerializer, ProductSerializer
 from purchase.serializers import SerialNumberSerializer  
 from .serializers import InvoiceReturnSerializer  
 
-class DeliveryNoteReturnAttachmentSerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteReturnAttachment
         fields = ['id', 'file']
 
-class DeliveryNoteReturnRemarkSerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteReturnRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class DeliveryNoteReturnItemSerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
     serial_numbers = SerialNumberSerializer(many=True, read_only=True)
 
@@ -903,17 +876,17 @@ class DeliveryNoteReturnItemSerializer(serializers.ModelSerializer):
             item.serial_numbers.set(serial_numbers_data)
         return item
 
-class DeliveryNoteReturnHistorySerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteReturnHistory
         fields = ['id', 'user', 'action', 'timestamp']
 
-class DeliveryNoteReturnCommentSerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DeliveryNoteReturnComment
         fields = ['id', 'user', 'comment', 'timestamp']
 
-class DeliveryNoteReturnSerializer(serializers.ModelSerializer):
+class DeliveryNoteReturnSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = DeliveryNoteReturnItemSerializer(many=True, required=False)
     attachments = DeliveryNoteReturnAttachmentSerializer(many=True, required=False)
     remarks = DeliveryNoteReturnRemarkSerializer(many=True, required=False)
@@ -0,0 +1,256 @@
+"""
+Stock availability and reservations for sales order lines.
+
+Submitting an order used to walk its lines and read ``item.product.quantity``
+one query at a time, without a lock, so two concurrent submits could both
+pass the check against the same units.  ``check_stock`` instead:
+
+1. locks the order's product rows with ``select_for_update``, always in
+   primary-key order so two transactions can't deadlock on each other,
+2. sums the required quantity per product in one grouped query,
+3. returns every shortage at once.
+
+Submitted orders hold their units in the ``StockReservation`` ledger, one
+row per (product, warehouse, line), and ``Product.reserved_quantity`` keeps
+the running total, so ``available = quantity - reserved_quantity`` is read
+from the product row itself instead of summed over open orders:
+
+* ``reserve_order`` on submit,
+* ``release_order`` on cancel, ``release_reservations`` when lines are deleted,
+* ``consume_lines`` on delivery, which takes exactly the shipped units off
+  ``quantity`` as well and releases whatever a finished line still held.
+
+Each moves the counters for all of an order's products in one ``UPDATE``
+with ``F()`` expressions, so nothing is read, changed and written back.
+The lines of an order that holds stock can't be edited (``order_lines_locked``),
+so the ledger always matches the quantities it was sized by.
+The query count doesn't depend on the number of lines.  Call these inside a
+transaction and keep that transaction open until the order's status is
+saved, otherwise the locks are released before they protect anything.
+"""
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+
+from masters.models import Product
+
+from .models import SalesOrder, SalesOrderItem, StockReservation
+
+# Reservations and deliveries were sized by the lines, so they stay as they are
+LOCKED_LINE_STATUSES = ['Submitted', 'Submitted(PD)', 'Partially Delivered', 'Delivered']
+
+
+def _require_atomic(name):
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError(f'{name}() must run inside transaction.atomic()')
+
+
+def available_quantities(product_ids):
+    """{pk: quantity - reserved_quantity} for the given products, read by primary key."""
+    return dict(
+        Product.objects.filter(pk__in=product_ids)
+        .order_by()
+        .values_list('pk', F('quantity') - F('reserved_quantity'))
+    )
+
+
+def lock_products(product_ids):
+    """Locks the given product rows in primary-key order; returns {pk: available quantity}."""
+    return dict(
+        Product.objects.select_for_update()
+        .filter(pk__in=product_ids)
+        .order_by('pk')
+        .values_list('pk', F('quantity') - F('reserved_quantity'))
+    )
+
+
+def required_quantities(sales_order):
+    """{product_id: total quantity} over the order's lines, in one grouped query."""
+    return dict(
+        SalesOrderItem.objects.filter(sales_order=sales_order)
+        .order_by()
+        .values('product')
+        .annotate(required=Sum('quantity'))
+        .values_list('product', 'required')
+    )
+
+
+def check_stock(sales_order):
+    """
+    Locks the products on ``sales_order`` and returns the lines that can't be
+    covered, as ``[{'product', 'required', 'available', 'shortage'}]`` sorted
+    by product.  An empty list means the whole order can ship.
+    """
+    _require_atomic('check_stock')
+
+    product_ids = SalesOrderItem.objects.filter(sales_order=sales_order).values('product')
+    on_hand = lock_products(product_ids)
+    shortages = []
+    for product_id, required in sorted(required_quantities(sales_order).items()):
+        available = on_hand.get(product_id, 0)
+        if available < required:
+            shortages.append({
+                'product': product_id,
+                'required': required,
+                'available': available,
+                'shortage': required - available,
+            })
+    return shortages
+
+
+def _by_product(deltas):
+    # CASE pk WHEN ... THEN delta: one statement moves every product's counter
+    return Case(
+        *[When(pk=product_id, then=Value(delta)) for product_id, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def adjust_reserved(deltas, consume=False):
+    """
+    Adds ``{product_id: delta}`` to ``reserved_quantity`` in one ``UPDATE``.
+    With ``consume`` the same units also leave ``quantity``, which is how a
+    delivery turns a reservation into a shipment without changing availability.
+    """
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    changes = {'reserved_quantity': F('reserved_quantity') + _by_product(deltas)}
+    if consume:
+        changes['quantity'] = F('quantity') + _by_product(deltas)
+    return Product.objects.filter(pk__in=deltas).update(**changes)
+
+
+def reserve_order(sales_order, partial=False):
+    """
+    Reserves every line of ``sales_order`` that isn't reserved yet and returns
+    ``{product_id: units}``.  Call after ``check_stock`` came back empty;
+    with ``partial`` each product instead reserves what is available, lines
+    in id order, and lines that get nothing are skipped.
+    """
+    _require_atomic('reserve_order')
+    lines = list(
+        SalesOrderItem.objects.filter(sales_order=sales_order)
+        .exclude(reservations__status='Active')
+        .order_by('pk')
+        .values_list('pk', 'product_id', 'product__warehouse_id', 'quantity')
+    )
+    if not lines:
+        return {}
+
+    remaining = lock_products({product_id for _, product_id, _, _ in lines}) if partial else {}
+    reservations, reserved = [], {}
+    for line_id, product_id, warehouse_id, quantity in lines:
+        if partial:
+            quantity = min(quantity, max(remaining.get(product_id, 0), 0))
+            remaining[product_id] = remaining.get(product_id, 0) - quantity
+        if quantity <= 0:
+            continue
+        reservations.append(StockReservation(
+            product_id=product_id, warehouse_id=warehouse_id,
+            sales_order_item_id=line_id, quantity=quantity,
+        ))
+        reserved[product_id] = reserved.get(product_id, 0) + quantity
+
+    StockReservation.objects.bulk_create(reservations, batch_size=500)
+    adjust_reserved(reserved)
+    return reserved
+
+
+def order_lines_locked(sales_order):
+    """
+    Whether ``sales_order``'s lines must stay as they are: it is submitted or
+    still holds stock.  Locks the order row, so a concurrent submit waits for
+    the edit to commit.
+    """
+    _require_atomic('order_lines_locked')
+    status = (
+        SalesOrder.objects.select_for_update().filter(pk=sales_order.pk)
+        .values_list('status', flat=True).first()
+    )
+    return status in LOCKED_LINE_STATUSES or StockReservation.objects.filter(
+        sales_order_item__sales_order=sales_order, status='Active'
+    ).exists()
+
+
+def release_reservations(reservations):
+    """Gives back the Active rows of the ``StockReservation`` queryset ``reservations``; returns ``{product_id: units}``."""
+    _require_atomic('release_reservations')
+    # Lock the ledger rows so a concurrent cancel/deliver can't close them twice
+    pks = list(
+        reservations.filter(status='Active').select_for_update()
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    if not pks:
+        return {}
+    held = dict(
+        StockReservation.objects.filter(pk__in=pks)
+        .order_by()
+        .values('product')
+        .annotate(units=Sum('quantity'))
+        .values_list('product', 'units')
+    )
+    StockReservation.objects.filter(pk__in=pks).update(status='Released', updated_at=timezone.now())
+    adjust_reserved({product_id: -units for product_id, units in held.items()})
+    return held
+
+
+def release_order(sales_order):
+    """Gives back everything ``sales_order`` holds; returns ``{product_id: units}``."""
+    return release_reservations(StockReservation.objects.filter(sales_order_item__sales_order=sales_order))
+
+
+def consume_lines(shipments):
+    """
+    Ships ``{sales_order_item_id: (units, complete)}`` out of the lines'
+    Active reservations and returns ``{product_id: units consumed}``.  The
+    shipped units leave ``reserved_quantity`` and ``quantity`` together; a
+    line that held more keeps the rest reserved, or gives it back when
+    ``complete`` says nothing is left to deliver on it.
+    """
+    _require_atomic('consume_lines')
+    rows = list(
+        StockReservation.objects.select_for_update()
+        .filter(sales_order_item__in=list(shipments), status='Active')
+        .order_by('pk')
+        .values_list('pk', 'sales_order_item_id', 'product_id', 'quantity')
+    )
+    if not rows:
+        return {}
+
+    left = {line_id: units for line_id, (units, _) in shipments.items()}
+    quantities, statuses, consumed, released = {}, {}, {}, {}
+    for pk, line_id, product_id, held in rows:
+        units = min(held, left[line_id])
+        left[line_id] -= units
+        rest = held - units
+        if rest and not shipments[line_id][1]:
+            quantities[pk], statuses[pk] = rest, 'Active'
+        elif units:
+            # Fulfilled rows record what actually shipped
+            quantities[pk], statuses[pk] = units, 'Fulfilled'
+            released[product_id] = released.get(product_id, 0) + rest
+        else:
+            quantities[pk], statuses[pk] = held, 'Released'
+            released[product_id] = released.get(product_id, 0) + rest
+        consumed[product_id] = consumed.get(product_id, 0) + units
+
+    StockReservation.objects.filter(pk__in=quantities).update(
+        quantity=Case(*[When(pk=pk, then=Value(units)) for pk, units in quantities.items()]),
+        status=Case(*[When(pk=pk, then=Value(status)) for pk, status in statuses.items()]),
+        updated_at=timezone.now(),
+    )
+    adjust_reserved({product_id: -units for product_id, units in consumed.items()}, consume=True)
+    adjust_reserved({product_id: -units for product_id, units in released.items()})
+    return {product_id: units for product_id, units in consumed.items() if units}
+
+
+def ship_unreserved(deltas):
+    """Takes ``{product_id: units}`` that were never reserved off ``quantity`` in one ``UPDATE``."""
+    deltas = {product_id: units for product_id, units in deltas.items() if units}
+    if not deltas:
+        return 0
+    return Product.objects.filter(pk__in=deltas).update(
+        quantity=F('quantity') - _by_product(deltas)
+    )
@@ -1,3 +1,256 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.audit import clear_user_names
+from core.benchmark import get_benchmark_client
+from core.pricing import line_total
+from core.testing import QueryBudgetTestMixin
+from masters.models import Customer, Product
+
+from .conversions import create_delivery_notes, create_invoices
+from .models import (
+    DeliveryNoteItem, Invoice, InvoiceItem, Quotation, QuotationItem, SalesOrder, SalesOrderItem,
+    StockReservation,
+)
+from .stock import check_stock, consume_lines, release_order, reserve_order
+
+
+class LargeDocumentQueryCountTests(QueryBudgetTestMixin, APITestCase):
+    """A detail GET costs the same queries for 2,000 lines as for 2."""
+
+    LINES = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+        cls.products = list(Product.objects.select_related('tax_code').order_by('pk'))
+
+    def setUp(self):
+        self.client = get_benchmark_client()
+        self.client.raise_request_exception = True
+
+    def add_lines(self, item_model, count, **document):
+        items = []
+        for n in range(count):
+            product = self.products[n % len(self.products)]
+            tax_rate = product.tax_code.percentage if product.tax_code else Decimal('0.00')
+            quantity = n % 5 + 1
+            items.append(item_model(
+                product=product, product_name=product.name, product_id_display=product.product_id,
+                uom_id=product.uom_id, unit_price=product.unit_price, tax=product.tax_code, tax_rate=tax_rate,
+                quantity=quantity, total=line_total(quantity, product.unit_price, Decimal('0.00'), tax_rate),
+                **document,
+            ))
+        item_model.objects.bulk_create(items, batch_size=500)
+
+    def get(self, url):
+        clear_user_names()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        return response
+
+    def assertFlatInLines(self, small_url, large_url):
+        with CaptureQueriesContext(connection) as small:
+            self.get(small_url)
+
+        with self.assertNumQueries(len(small)):
+            response = self.get(large_url)
+        self.assertEqual(len(response.data['data']['items']), self.LINES)
+        self.assertWithinQueryBudget(response)
+
+    def test_quotation_detail(self):
+        small, large = Quotation.objects.order_by('pk')[:2]
+        for quotation, count in ((small, 2), (large, self.LINES)):
+            quotation.items.all().delete()
+            self.add_lines(QuotationItem, count, quotation=quotation)
+
+        self.assertFlatInLines(f'/api/crm/quotations/{small.pk}/', f'/api/crm/quotations/{large.pk}/')
+
+    def test_sales_order_detail(self):
+        small, large = SalesOrder.objects.order_by('pk')[:2]
+        for sales_order, count in ((small, 2), (large, self.LINES)):
+            sales_order.items.all().delete()
+            self.add_lines(SalesOrderItem, count, sales_order=sales_order)
+
+        self.assertFlatInLines(f'/api/crm/sales-orders/{small.pk}/', f'/api/crm/sales-orders/{large.pk}/')
+
+
+class StockTestCase(TestCase):
+    """Fresh products and submitted orders on top of the seeded customers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+        cls.customer = Customer.objects.order_by('pk').first()
+
+    def make_product(self, quantity):
+        return Product.objects.create(
+            name=f'Stock test {Product.objects.count()}', product_type='Goods', unit_price=Decimal('10.00'),
+            quantity=quantity, stock_level=quantity, status='Active', product_usage='Both',
+        )
+
+    def make_order(self, *lines, status='Submitted'):
+        order = SalesOrder.objects.create(customer=self.customer, status=status)
+        for product, quantity in lines:
+            SalesOrderItem.objects.create(sales_order=order, product=product, unit_price=product.unit_price,
+                                          quantity=quantity)
+        return order
+
+    def assertStock(self, product, quantity, reserved):
+        """On-hand and reserved units, with reserved_quantity matching the Active ledger rows."""
+        product.refresh_from_db()
+        self.assertEqual((product.quantity, product.reserved_quantity), (quantity, reserved))
+        held = StockReservation.objects.filter(product=product, status='Active').aggregate(units=Sum('quantity'))
+        self.assertEqual(held['units'] or 0, reserved)
+
+
+class StockReservationTests(StockTestCase):
+    def test_reserve_and_release(self):
+        bolts, nuts = self.make_product(10), self.make_product(4)
+        order = self.make_order((bolts, 3), (bolts, 2), (nuts, 4))
+        self.assertEqual(check_stock(order), [])
+
+        self.assertEqual(reserve_order(order), {bolts.pk: 5, nuts.pk: 4})
+        self.assertStock(bolts, 10, 5)
+        self.assertStock(nuts, 4, 4)
+        self.assertEqual(reserve_order(order), {}, 'reserved lines are not reserved twice')
+
+        # The next order sees only what is left
+        other = self.make_order((nuts, 1))
+        self.assertEqual(check_stock(other), [{'product': nuts.pk, 'required': 1, 'available': 0, 'shortage': 1}])
+
+        self.assertEqual(release_order(order), {bolts.pk: 5, nuts.pk: 4})
+        self.assertStock(bolts, 10, 0)
+        self.assertStock(nuts, 4, 0)
+        self.assertEqual(release_order(order), {})
+
+    def test_partial_reserve_takes_what_is_free(self):
+        nuts = self.make_product(5)
+        order = self.make_order((nuts, 3), (nuts, 4))
+        self.assertEqual(reserve_order(order, partial=True), {nuts.pk: 5})
+        self.assertStock(nuts, 5, 5)
+        self.assertEqual(
+            list(StockReservation.objects.filter(product=nuts).order_by('pk').values_list('quantity', flat=True)),
+            [3, 2],
+        )
+
+    def test_consume_partial_then_complete(self):
+        bolts, nuts = self.make_product(10), self.make_product(6)
+        order = self.make_order((bolts, 4), (nuts, 6))
+        reserve_order(order)
+        bolt_line, nut_line = order.items.order_by('pk')
+
+        # 3 of 4 bolts ship and one stays held; all the nuts ship
+        self.assertEqual(consume_lines({bolt_line.pk: (3, False), nut_line.pk: (6, True)}), {bolts.pk: 3, nuts.pk: 6})
+        self.assertStock(bolts, 7, 1)
+        self.assertStock(nuts, 0, 0)
+
+        # The line is closed with nothing more shipped: the held bolt goes back
+        self.assertEqual(consume_lines({bolt_line.pk: (0, True)}), {})
+        self.assertStock(bolts, 7, 0)
+
+    def test_deleting_lines_releases_them(self):
+        bolts = self.make_product(10)
+        order = self.make_order((bolts, 4), (bolts, 2))
+        reserve_order(order)
+        order.items.filter(quantity=2).delete()
+        self.assertStock(bolts, 10, 4)
+        order.delete()
+        self.assertStock(bolts, 10, 0)
+
+
+class ConversionTests(StockTestCase):
+    def shipped(self, note):
+        return dict(note.items.values_list('product_id', 'quantity'))
+
+    def test_delivery_notes_for_several_orders_with_partial_stock(self):
+        bolts, nuts = self.make_product(10), self.make_product(5)
+        reserved = self.make_order((bolts, 4), (nuts, 2))
+        reserve_order(reserved)
+        # Unreserved orders ship from what is free, in pk order: 3 nuts are left for 4 wanted
+        first = self.make_order((bolts, 2), (nuts, 4))
+        second = self.make_order((nuts, 1))
+
+        notes = create_delivery_notes([second, reserved, first])
+        self.assertEqual([note.sales_order_reference_id for note in notes], [reserved.pk, first.pk])
+        self.assertEqual([self.shipped(note) for note in notes], [{bolts.pk: 4, nuts.pk: 2}, {bolts.pk: 2, nuts.pk: 3}])
+        self.assertEqual([note.delivery_status for note in notes], ['Delivered', 'Partially Delivered'])
+        self.assertEqual(
+            dict(SalesOrder.objects.filter(pk__in=[reserved.pk, first.pk, second.pk]).values_list('pk', 'status')),
+            {reserved.pk: 'Delivered', first.pk: 'Partially Delivered', second.pk: 'Submitted'},
+        )
+        self.assertStock(bolts, 4, 0)
+        self.assertStock(nuts, 0, 0)
+
+        # Restocked: only what is still owed ships, and a delivered order ships nothing
+        Product.objects.filter(pk=nuts.pk).update(quantity=10)
+        notes = create_delivery_notes([reserved, first, second])
+        self.assertEqual([self.shipped(note) for note in notes], [{nuts.pk: 1}, {nuts.pk: 1}])
+        self.assertEqual(SalesOrder.objects.get(pk=first.pk).status, 'Delivered')
+        self.assertStock(nuts, 8, 0)
+        self.assertEqual(DeliveryNoteItem.objects.filter(delivery_note__sales_order_reference=first)
+                         .aggregate(units=Sum('quantity'))['units'], 6)
+
+    def test_invoices_for_several_orders_cover_what_is_not_invoiced(self):
+        bolts, nuts = self.make_product(10), self.make_product(10)
+        first = self.make_order((bolts, 3), (nuts, 1))
+        second = self.make_order((nuts, 2))
+        draft = self.make_order((nuts, 5), status='Draft')
+
+        invoices = create_invoices([first, second, draft])
+        self.assertEqual([invoice.sales_order_reference_id for invoice in invoices], [first.pk, second.pk])
+        for invoice, order in zip(invoices, [first, second]):
+            lines = {item.product_id: (item.quantity, item.total) for item in InvoiceItem.objects.filter(invoice=invoice)}
+            self.assertEqual(lines, {line.product_id: (line.quantity, line.total) for line in order.items.all()})
+            self.assertEqual(invoice.invoice_total, sum(total for _, total in lines.values()))
+            self.assertEqual(invoice.summary.grand_total, invoice.invoice_total)
+
+        # Everything is invoiced: nothing new, however often it runs
+        self.assertEqual(create_invoices([first, second]), [])
+        # A line added later is invoiced on its own
+        SalesOrderItem.objects.create(sales_order=second, product=bolts, unit_price=bolts.unit_price, quantity=1)
+        [extra] = create_invoices([first, second])
+        self.assertEqual(list(extra.items.values_list('product_id', 'quantity')), [(bolts.pk, 1)])
+        self.assertEqual(len({invoice.INVOICE_ID for invoice in Invoice.objects.filter(sales_order_reference__in=[first, second])}), 3)
+
+
+class QuotationExpiryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+
+    def setUp(self):
+        self.client = get_benchmark_client()
+        self.client.raise_request_exception = True
+
+    def submitted(self, expiry_date):
+        quotation = Quotation.objects.filter(status='Submitted').order_by('pk').first()
+        Quotation.objects.filter(pk=quotation.pk).update(expiry_date=expiry_date)
+        return quotation
+
+    def approve(self, quotation):
+        return self.client.post(f'/api/crm/quotations/{quotation.pk}/action/', {'action': 'approve'}, format='json')
+
+    def test_past_due_quotation_expires_instead_of_transitioning(self):
+        quotation = self.submitted(timezone.localdate() - timedelta(days=1))
+        response = self.approve(quotation)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expired', response.data['message'])
+        quotation.refresh_from_db()
+        self.assertEqual(quotation.status, 'Expired')
+
+    def test_quotation_is_valid_through_its_expiry_date(self):
+        quotation = self.submitted(timezone.localdate())
+        self.assertEqual(self.approve(quotation).status_code, 200)
+        quotation.refresh_from_db()
+        self.assertEqual(quotation.status, 'Approved')
 
-# Create your tests here.
@@ -0,0 +1,222 @@
+"""
+Stored order totals for ``Quotation`` and ``SalesOrder``.
+
+``subtotal``, ``tax_total``, ``grand_total`` and ``rounding_adjustment`` are
+real columns, so lists, PDFs and emails read them instead of aggregating the
+items on every access, and ``grand_total`` can be filtered and sorted on an
+index.
+
+They are kept current by core.signals: every saved or deleted item
+recomputes its order with one grouped aggregate and one UPDATE, under a row
+lock on the order.  Code that writes many items at once batches the work:
+
+    with deferred_totals():
+        for item_data in items:
+            QuotationItem.objects.create(quotation=quotation, **item_data)
+    # one recalculation per touched order here
+
+``bulk_create`` and ``QuerySet.update`` send no signals, so after those call
+``recalculate_totals(Quotation, order_ids)`` yourself.
+
+Rows written before these columns existed hold 0.00 until
+``manage.py backfill_order_totals`` has run; the Docker images run it after
+``migrate`` on every start, which only writes orders whose totals are off.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.counting import bump_table_version
+
+TOTAL_FIELDS = ('subtotal', 'tax_total', 'grand_total', 'rounding_adjustment')
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+_state = threading.local()
+
+
+def _money():
+    return models.DecimalField(max_digits=14, decimal_places=2)
+
+
+def apply_totals(order, subtotal, tax_total):
+    """Sets the stored total fields on ``order`` (not saved) from its item sums."""
+    subtotal = (subtotal or ZERO).quantize(CENT)
+    tax_total = (tax_total or ZERO).quantize(CENT)
+    discount_rate = order.global_discount or ZERO
+    shipping = order.shipping_charges or ZERO
+
+    discount = subtotal * (discount_rate / Decimal('100'))
+    total = subtotal - discount + tax_total + shipping
+    rounded_total = total.quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+
+    order.subtotal = subtotal
+    order.tax_total = tax_total
+    order.rounding_adjustment = (rounded_total - total).quantize(CENT)
+    order.grand_total = rounded_total.quantize(CENT)
+
+
+def items_relation(order_model):
+    relation = order_model._meta.get_field('items')
+    return relation.related_model, relation.field.name
+
+
+def item_sums(order_model, order_ids):
+    """{order_id: (subtotal, tax_total)} for ``order_ids``, in one grouped query."""
+    item_model, parent = items_relation(order_model)
+    rows = (
+        item_model.objects.filter(**{f'{parent}__in': order_ids})
+        .order_by()
+        .values(parent)
+        .annotate(
+            subtotal=Sum('total', output_field=_money()),
+            tax=Sum(F('total') * F('tax_rate') * Decimal('0.01'), output_field=_money()),
+        )
+    )
+    return {row[parent]: (row['subtotal'], row['tax']) for row in rows}
+
+
+def recalculate_totals(order_model, order_ids, instances=()):
+    """
+    Recomputes and stores the totals of ``order_ids``.  The orders are locked
+    in primary-key order first so concurrent item writers can't interleave.
+    ``instances`` are in-memory copies of those orders to update as well.
+    """
+    order_ids = sorted({pk for pk in order_ids if pk is not None})
+    if not order_ids:
+        return
+
+    with transaction.atomic():
+        orders = list(
+            order_model.objects.select_for_update()
+            .filter(pk__in=order_ids)
+            .order_by('pk')
+            .only('pk', 'global_discount', 'shipping_charges')
+        )
+        if not orders:
+            return
+        sums = item_sums(order_model, order_ids)
+        now = timezone.now()
+        for order in orders:
+            apply_totals(order, *sums.get(order.pk, (ZERO, ZERO)))
+            order.updated_at = now
+        order_model.objects.bulk_update(orders, TOTAL_FIELDS + ('updated_at',), batch_size=500)
+
+    by_pk = {order.pk: order for order in orders}
+    for instance in instances:
+        fresh = by_pk.get(instance.pk)
+        if fresh is not None:
+            for field in TOTAL_FIELDS + ('updated_at',):
+                setattr(instance, field, getattr(fresh, field))
+
+
+def backfill_totals(order_model, chunk_size=500):
+    """
+    Brings the stored totals of every ``order_model`` row in line with its
+    items, ``chunk_size`` orders per transaction, and returns
+    ``(checked, changed)``.  Only orders whose totals differ are written, so
+    running it again is cheap and leaves ``updated_at`` alone.
+    """
+    checked = changed = 0
+    last_pk = None
+    while True:
+        with transaction.atomic():
+            queryset = order_model.objects.select_for_update().order_by('pk')
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            orders = list(queryset.only('pk', 'global_discount', 'shipping_charges', *TOTAL_FIELDS)[:chunk_size])
+            if not orders:
+                break
+            sums = item_sums(order_model, [order.pk for order in orders])
+            now = timezone.now()
+            stale = []
+            for order in orders:
+                before = [getattr(order, field) for field in TOTAL_FIELDS]
+                apply_totals(order, *sums.get(order.pk, (ZERO, ZERO)))
+                if [getattr(order, field) for field in TOTAL_FIELDS] != before:
+                    order.updated_at = now
+                    stale.append(order)
+            order_model.objects.bulk_update(stale, TOTAL_FIELDS + ('updated_at',), batch_size=500)
+        checked += len(orders)
+        changed += len(stale)
+        last_pk = orders[-1].pk
+    if changed:
+        # ?min_total counts cached before the backfill are wrong now
+        bump_table_version(order_model._meta.db_table)
+    return checked, changed
+
+
+def refresh_order_totals(order, update_fields=None):
+    """
+    Called from the order's ``save()`` so a full save never writes stale totals
+    (e.g. after ``global_discount`` changed or the items moved on since the
+    order was loaded).  Saves limited by ``update_fields`` leave them alone.
+    """
+    if update_fields is not None:
+        return
+    if order._state.adding:
+        apply_totals(order, ZERO, ZERO)
+    else:
+        apply_totals(order, *item_sums(type(order), [order.pk]).get(order.pk, (ZERO, ZERO)))
+
+
+def schedule_totals(order_model, order_id, instance=None):
+    """Recalculates now, or at the end of the enclosing ``deferred_totals`` block."""
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        recalculate_totals(order_model, [order_id], [instance] if instance is not None else ())
+        return
+    pending[order_model].setdefault(order_id, [])
+    if instance is not None:
+        pending[order_model][order_id].append(instance)
+
+
+@contextmanager
+def deferred_totals():
+    """Collects item changes and recalculates each touched order once on exit."""
+    if getattr(_state, 'pending', None) is not None:
+        yield
+        return
+
+    _state.pending = defaultdict(dict)
+    try:
+        yield
+    except BaseException:
+        _state.pending = None
+        raise
+
+    pending, _state.pending = _state.pending, None
+    for order_model, orders in pending.items():
+        instances = [instance for copies in orders.values() for instance in copies]
+        recalculate_totals(order_model, orders.keys(), instances)
+
+
+def filter_by_order_value(queryset, params):
+    """
+    ``?min_total=`` / ``?max_total=`` and ``?ordering=grand_total`` (or
+    ``-grand_total``) for the order lists, served by the (grand_total, id) index.
+    """
+    bounds = {}
+    for param, lookup in (('min_total', 'grand_total__gte'), ('max_total', 'grand_total__lte')):
+        value = params.get(param)
+        if value in (None, ''):
+            continue
+        try:
+            bounds[lookup] = Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({param: 'Must be a number'})
+    if bounds:
+        queryset = queryset.filter(**bounds)
+
+    ordering = params.get('ordering')
+    if ordering in ('grand_total', '-grand_total'):
+        prefix = ordering[:-len('grand_total')]
+        queryset = queryset.order_by(ordering, f'{prefix}id')
+    return queryset
@@ -33,6 +33,7 @@ urlpatterns = [
    
     # Invoice URLs
     path('invoices/', views.InvoiceListView.as_view(), name='invoice-list'),
+    path('invoices/export-pdf/', views.InvoiceBulkPDFView.as_view(), name='invoice-export-pdf'),
     path('invoices/<int:pk>/', views.InvoiceDetailView.as_view(), name='invoice-detail'),
     path('invoices/<int:pk>/items/', views.InvoiceItemView.as_view(), name='invoice-items'),
     path('invoices/<int:pk>/pdf/', views.InvoicePDFView.as_view(), name='invoice-pdf'),
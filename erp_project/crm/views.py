@@ -6,6 +6,7 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from core.permissions import RoleBasedPermission
+from core.pagination import paginated_response
 from .models import Enquiry
 from .serializers import EnquirySerializer, EnquiryWriteSerializer
 
@@ -20,34 +21,15 @@ class EnquiryListCreateView(generics.ListCreateAPIView):
         return EnquiryWriteSerializer
 
     def get_queryset(self):
+        # Items feed both the nested list and grand_total
+        enquiries = Enquiry.objects.prefetch_related('items')
         if self.request.user.is_superuser or self.request.user.role.role.lower() == 'admin':
-            return Enquiry.objects.all()
-        return Enquiry.objects.filter(user=self.request.user)
+            return enquiries.all()
+        return enquiries.filter(user=self.request.user)
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Enquiries fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Enquiries fetched successfully")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -106,58 +88,45 @@ class EnquiryDetailView(generics.RetrieveUpdateDestroyAPIView):
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from core.documents import pdf_view_response
+from core.exports import export_pdfs_response
+from core.outbox import queue_email
 from core.permissions import RoleBasedPermission
 from rest_framework.views import APIView
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-from weasyprint import HTML
 from django.core.mail import EmailMessage
 from django.conf import settings
-from io import BytesIO
+from django.db import transaction
+from django.db.models import Prefetch
 from .models import Quotation, QuotationItem, QuotationAttachment, QuotationComment, QuotationHistory, QuotationRevision
-from .serializers import QuotationSerializer, QuotationWriteSerializer, QuotationRevisionSerializer
+from .serializers import QuotationSerializer, QuotationListSerializer, QuotationWriteSerializer, QuotationRevisionSerializer
+from .expiry import expire_if_due
+from .totals import filter_by_order_value
 
 class QuotationListCreateView(generics.ListCreateAPIView):
     queryset = Quotation.objects.select_related('customer', 'sales_rep').order_by('-created_at')
+    # Just the columns QuotationListSerializer reads, customer joined in
+    list_queryset = Quotation.objects.select_related('customer').only(
+        'id', 'quotation_id', 'customer', 'sales_rep', 'quotation_type', 'quotation_date',
+        'expiry_date', 'currency', 'status', 'grand_total', 'created_at', 'updated_at',
+        'customer__id', 'customer__customer_id', 'customer__first_name', 'customer__last_name',
+        'customer__company_name',
+    ).order_by('-created_at')
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
     def get_queryset(self):
-        expired = self.queryset.filter(
-            expiry_date__lt=timezone.now().date(),
-            status__in=['Draft', 'Submitted', 'Approved']
-        )
-        expired.update(status='Expired')
-        return self.queryset
+        queryset = self.list_queryset if self.request.method == 'GET' else self.queryset
+        return filter_by_order_value(queryset.all(), self.request.query_params)
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return QuotationWriteSerializer
-        return QuotationSerializer
+        return QuotationListSerializer
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Quotations fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Quotations fetched successfully")
 
     def create(self, request, *args, **kwargs):
         write_serializer = QuotationWriteSerializer(
@@ -167,6 +136,7 @@ class QuotationListCreateView(generics.ListCreateAPIView):
         write_serializer.is_valid(raise_exception=True)
         quotation = write_serializer.save()
 
+        quotation = QuotationDetailView.detail_queryset.get(pk=quotation.pk)
         read_serializer = QuotationSerializer(quotation)
         return Response({
             "message": "Quotation created successfully",
@@ -176,9 +146,19 @@ class QuotationListCreateView(generics.ListCreateAPIView):
 
 class QuotationDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Quotation.objects.select_related('customer', 'sales_rep')
+    # Everything QuotationSerializer walks: six queries however many lines
+    # the quotation has, plus AuditUserField's cached name lookups
+    detail_queryset = queryset.prefetch_related(
+        Prefetch('items', queryset=QuotationItem.objects.select_related('product').order_by('id')),
+        'attachments', 'comments', 'history', 'revisions',
+    )
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        queryset = self.detail_queryset if self.request.method == 'GET' else self.queryset
+        return queryset.all()
+
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return QuotationSerializer
@@ -224,6 +204,10 @@ class QuotationActionView(APIView):
             quotation = Quotation.objects.get(id=pk)
             action = request.data.get('action')
 
+            # Don't wait for the expire_quotations sweep
+            if expire_if_due(quotation):
+                return Response({'message': f'Quotation expired on {quotation.expiry_date}'}, status=400)
+
             allowed_transitions = {
                 'Draft': ['save_draft', 'submit'],
                 'Submitted': ['approve', 'reject', 'revise'],
@@ -318,24 +302,7 @@ class QuotationPDFView(APIView):
     def get(self, request, pk):
         try:
             quotation = Quotation.objects.get(id=pk)
-            context = {
-                'quotation': quotation,
-                'items': quotation.items.all(),
-                'subtotal': quotation.subtotal,
-                'tax_summary': quotation.tax_summary,
-                'global_discount': quotation.global_discount,
-                'shipping_charges': quotation.shipping_charges,
-                'rounding_adjustment': quotation.rounding_adjustment,
-                'grand_total': quotation.grand_total,
-                'comments': quotation.comments.all(),
-                'history': quotation.history.all(),
-                'revisions': quotation.revisions.all()
-            }
-
-            html_string = render_to_string('quotation_pdf.html', context)
-            html = HTML(string=html_string, base_url=request.build_absolute_uri())
-            pdf_buffer = BytesIO()
-            html.write_pdf(pdf_buffer)
+            response = pdf_view_response(request, 'quotation', quotation)
 
             # Log PDF generation
             QuotationHistory.objects.create(
@@ -343,10 +310,6 @@ class QuotationPDFView(APIView):
                 event_type='pdf_generated',
                 action_by=request.user
             )
-
-            response = HttpResponse(content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="Quotation_{quotation.quotation_id}.pdf"'
-            response.write(pdf_buffer.getvalue())
             return response
         except Quotation.DoesNotExist:
             return Response({'error': 'Quotation not found'}, status=404)
@@ -377,17 +340,18 @@ class QuotationMailView(APIView):
                 to=[recipient]
             )
             email.content_subtype = 'html'
-            email.send()
 
-            # Log email sent
-            QuotationHistory.objects.create(
-                quotation=quotation,
-                event_type='email_sent',
-                extra_info=f"sent to {recipient}",
-                action_by=request.user
-            )
+            # The history row and the queued mail commit together
+            with transaction.atomic():
+                queue_email(email)
+                QuotationHistory.objects.create(
+                    quotation=quotation,
+                    event_type='email_sent',
+                    extra_info=f"sent to {recipient}",
+                    action_by=request.user
+                )
 
-            return Response({'message': 'Email sent successfully'}, status=200)
+            return Response({'message': 'Email queued for sending'}, status=200)
         except Quotation.DoesNotExist:
             return Response({'error': 'Quotation not found'}, status=404)
 
@@ -397,13 +361,10 @@ from rest_framework import status, permissions
 from .models import SalesOrder, SalesOrderItem, SalesOrderComment, SalesOrderHistory, DeliveryNote, DeliveryNoteItem, DeliveryNoteCustomerAcknowledgement, DeliveryNoteAttachment, DeliveryNoteRemark, Invoice, InvoiceItem, InvoiceAttachment, InvoiceRemark, OrderSummary
 from .serializers import  SalesOrderHistorySerializer, DeliveryNoteSerializer, DeliveryNoteItemSerializer, DeliveryNoteCustomerAcknowledgementSerializer, DeliveryNoteAttachmentSerializer, DeliveryNoteRemarkSerializer, InvoiceSerializer, InvoiceItemSerializer, OrderSummarySerializer
 from django.core.exceptions import ObjectDoesNotExist
+from masters.serializers import with_nested_product
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 from django.utils import timezone
 # views.py
 
@@ -416,115 +377,45 @@ from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from io import BytesIO
-from weasyprint import HTML
-
-from .models import SalesOrder, SalesOrderHistory
-from .serializers import SalesOrderSerializer, SalesOrderWriteSerializer
+from .models import SalesOrder, SalesOrderItem, SalesOrderHistory
+from .serializers import SalesOrderSerializer, SalesOrderListSerializer, SalesOrderWriteSerializer
+from .conversions import (
+    create_delivery_notes, create_invoices, create_invoices_from_delivery_notes, create_purchase_orders,
+)
+from .stock import check_stock, release_order, reserve_order
+from .totals import filter_by_order_value
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
 from core.permissions import RoleBasedPermission  
 
-# Placeholder for PurchaseOrder generation (to be implemented later)
-def generate_purchase_order(sales_order, partial=False):
-    # TODO: Implement full PurchaseOrder creation logic
-    # For insufficient items, create PO for (quantity - product.quantity_in_stock)
-    # If partial, create for partial quantities or handle differently
-    insufficient = []
-    for item in sales_order.items.all():
-        available = item.product.quantity # Assuming field exists in Product model
-        if available < item.quantity:
-            deficient = item.quantity - available if not partial else item.quantity  # Adjust logic as needed for partial
-            insufficient.append({'product': item.product, 'quantity': deficient})
-    
-    # Create PurchaseOrder with insufficient items
-    # Example placeholder:
-    # from purchases.models import PurchaseOrder, PurchaseOrderItem  # Assume imports
-    # purchase_order = PurchaseOrder.objects.create(...)  # Fill with relevant data from sales_order
-    # for def_item in insufficient:
-    #     PurchaseOrderItem.objects.create(purchase_order=purchase_order, **def_item)
-    
-    # Return purchase_order or success message
-    return {'message': f'Purchase Order generated ({"partial" if partial else "full"} placeholder)'}
-
-# Placeholder for DeliveryNote generation
-def generate_delivery_note(sales_order):
-    # TODO: Implement full DeliveryNote creation
-    # from deliveries.models import DeliveryNote, DeliveryNoteItem  # Assume
-    # delivery_note = DeliveryNote.objects.create(
-    #     delivery_date=timezone.now().date(),
-    #     sales_order=sales_order,
-    #     customer=sales_order.customer,
-    #     # ... other fields
-    # )
-    # for item in sales_order.items.all():
-    #     DeliveryNoteItem.objects.create(
-    #         delivery_note=delivery_note,
-    #         product=item.product,
-    #         quantity=item.quantity
-    #     )
-    # Update inventory, etc.
-    return {'message': 'Delivery Note generated (placeholder)'}
-
-# Placeholder for Invoice generation
-def generate_invoice(sales_order):
-    # TODO: Implement full Invoice creation
-    # from invoices.models import Invoice, InvoiceItem  # Assume
-    # invoice = Invoice.objects.create(
-    #     invoice_date=timezone.now().date(),
-    #     due_date=sales_order.due_date,
-    #     sales_order=sales_order,
-    #     customer=sales_order.customer,
-    #     # ... other fields
-    # )
-    # for item in sales_order.items.all():
-    #     InvoiceItem.objects.create(
-    #         invoice=invoice,
-    #         product=item.product,
-    #         quantity=item.quantity,
-    #         unit_price=item.unit_price,
-    #         discount=item.discount,
-    #         tax=item.tax
-    #     )
-    # Calculate summary, etc.
-    return {'message': 'Invoice generated (placeholder)'}
-
 class SalesOrderListCreateView(generics.ListCreateAPIView):
     queryset = SalesOrder.objects.select_related('customer', 'sales_rep').order_by('-created_at')
+    # Just the columns SalesOrderListSerializer reads, customer joined in
+    list_queryset = SalesOrder.objects.select_related('customer').only(
+        'id', 'sales_order_id', 'customer', 'sales_rep', 'order_type', 'order_date',
+        'due_date', 'currency', 'status', 'grand_total', 'created_at', 'updated_at',
+        'customer__id', 'customer__customer_id', 'customer__first_name', 'customer__last_name',
+        'customer__company_name',
+    ).order_by('-created_at')
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
+    def get_queryset(self):
+        queryset = self.list_queryset if self.request.method == 'GET' else self.queryset
+        return filter_by_order_value(queryset.all(), self.request.query_params)
+
     def get_serializer_class(self):
         if self.request.method == "POST":
             return SalesOrderWriteSerializer
-        return SalesOrderSerializer
+        return SalesOrderListSerializer
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Sales Orders fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Sales Orders fetched successfully")
 
     def create(self, request, *args, **kwargs):
         write_serializer = SalesOrderWriteSerializer(
@@ -534,6 +425,7 @@ class SalesOrderListCreateView(generics.ListCreateAPIView):
         write_serializer.is_valid(raise_exception=True)
         sales_order = write_serializer.save()
 
+        sales_order = SalesOrderDetailView.detail_queryset.get(pk=sales_order.pk)
         read_serializer = SalesOrderSerializer(sales_order)
         return Response({
             "message": "Sales Order created successfully",
@@ -543,9 +435,19 @@ class SalesOrderListCreateView(generics.ListCreateAPIView):
 
 class SalesOrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = SalesOrder.objects.select_related('customer', 'sales_rep')
+    # Everything SalesOrderSerializer walks: four queries however many lines
+    # the order has, plus AuditUserField's cached name lookups
+    detail_queryset = queryset.prefetch_related(
+        Prefetch('items', queryset=SalesOrderItem.objects.select_related('product').order_by('id')),
+        'comments', 'history',
+    )
     permission_classes = [IsAuthenticated, RoleBasedPermission]
     lookup_field = 'pk'
 
+    def get_queryset(self):
+        queryset = self.detail_queryset if self.request.method == 'GET' else self.queryset
+        return queryset.all()
+
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return SalesOrderSerializer
@@ -585,8 +487,11 @@ class SalesOrderDetailView(generics.RetrieveUpdateDestroyAPIView):
 class SalesOrderActionView(APIView):
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
+    # One transaction: the order row and, on submit, its product rows stay
+    # locked until the new status is saved
+    @transaction.atomic
     def post(self, request, pk):
-        sales_order = get_object_or_404(SalesOrder, id=pk)
+        sales_order = get_object_or_404(SalesOrder.objects.select_for_update(), id=pk)
         action = request.data.get('action')
 
         allowed_transitions = {
@@ -607,41 +512,40 @@ class SalesOrderActionView(APIView):
         if action == 'save_draft':
             sales_order.status = 'Draft'
         elif action == 'submit':
-            insufficient = []
-            for item in sales_order.items.all():
-                available = item.product.quantity  # Assuming field
-                if available < item.quantity:
-                    insufficient.append({
-                        'product': item.product.id,
-                        'required': item.quantity,
-                        'available': available
-                    })
+            insufficient = check_stock(sales_order)
             if insufficient:
                 return Response({'error': 'insufficient_stock', 'details': insufficient}, status=400)
+            reserve_order(sales_order)
             sales_order.status = 'Submitted'
         elif action == 'submit_pd':
-            # For partial, assume some logic, perhaps no full check
+            # Partial submit holds whatever is available now; the rest ships later
+            reserve_order(sales_order, partial=True)
             sales_order.status = 'Submitted(PD)'
         elif action == 'cancel':
+            release_order(sales_order)
             sales_order.status = 'Cancelled'
         elif action == 'generate_po':
             partial = request.data.get('partial', False)
-            result = generate_purchase_order(sales_order, partial)
+            purchase_orders = create_purchase_orders([sales_order], partial=partial)
             SalesOrderHistory.objects.create(
                 sales_order=sales_order,
                 event_type='po_generated',
-                extra_info=str(result),
+                extra_info=', '.join(po.PO_ID for po in purchase_orders)[:255] or 'No shortfall',
                 action_by=request.user
             )
             sales_order.status = 'Ready to Submit'  # After PO, ready to submit again
-        elif action == 'convert_to_delivery':
-            result = generate_delivery_note(sales_order)
-            # Update status based on full or partial
-            sales_order.status = 'Delivered' if sales_order.status == 'Submitted' else 'Partially Delivered'
-            # Log if needed
-        elif action == 'convert_to_invoice':
-            result = generate_invoice(sales_order)
-            # No status change assumed, or adjust as needed
+        elif action in ('convert_to_delivery', 'convert_to_invoice'):
+            # The conversion saves the order's new status and history itself
+            if action == 'convert_to_delivery':
+                created = create_delivery_notes([sales_order], user=request.user)
+                nothing_left = 'Nothing left to deliver on this order, or no stock available for it'
+            else:
+                created = create_invoices([sales_order])
+                nothing_left = 'Nothing left to invoice on this order'
+            if not created:
+                return Response({'error': nothing_left}, status=400)
+            sales_order = SalesOrderDetailView.detail_queryset.get(pk=sales_order.pk)
+            return Response(SalesOrderSerializer(sales_order).data, status=200)
 
         sales_order.updated_by = request.user
         sales_order.save()
@@ -654,6 +558,7 @@ class SalesOrderActionView(APIView):
                 action_by=request.user
             )
 
+        sales_order = SalesOrderDetailView.detail_queryset.get(pk=sales_order.pk)
         return Response(SalesOrderSerializer(sales_order).data, status=200)
 
 
@@ -662,36 +567,15 @@ class SalesOrderPDFView(APIView):
 
     def get(self, request, pk):
         sales_order = get_object_or_404(SalesOrder, id=pk)
-        context = {
-            'sales_order': sales_order,
-            'items': sales_order.items.all(),
-            'subtotal': sales_order.subtotal,
-            'tax_summary': sales_order.tax_summary,
-            'global_discount': sales_order.global_discount,
-            'shipping_charges': sales_order.shipping_charges,
-            'rounding_adjustment': sales_order.rounding_adjustment,
-            'grand_total': sales_order.grand_total,
-            'comments': sales_order.comments.all(),
-            'history': sales_order.history.all()
-        }
-
-        html_string = render_to_string('sales_order_pdf.html', context)  # Assume template exists
-        html = HTML(string=html_string, base_url=request.build_absolute_uri())
-        pdf_buffer = BytesIO()
-        html.write_pdf(pdf_buffer)
+        response = pdf_view_response(request, 'sales_order', sales_order)
 
         SalesOrderHistory.objects.create(
             sales_order=sales_order,
             event_type='pdf_generated',
             action_by=request.user
         )
-
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="SalesOrder_{sales_order.sales_order_id}.pdf"'
-        response.write(pdf_buffer.getvalue())
         return response
 
-
 class SalesOrderMailView(APIView):
     permission_classes = [IsAuthenticated, RoleBasedPermission]
 
@@ -716,16 +600,17 @@ class SalesOrderMailView(APIView):
             to=[recipient]
         )
         email.content_subtype = 'html'
-        email.send()
 
-        SalesOrderHistory.objects.create(
-            sales_order=sales_order,
-            event_type='email_sent',
-            extra_info=f"sent to {recipient}",
-            action_by=request.user
-        )
+        with transaction.atomic():
+            queue_email(email)
+            SalesOrderHistory.objects.create(
+                sales_order=sales_order,
+                event_type='email_sent',
+                extra_info=f"sent to {recipient}",
+                action_by=request.user
+            )
 
-        return Response({'message': 'Email sent successfully'}, status=200)
+        return Response({'message': 'Email queued for sending'}, status=200)
 
 
 
@@ -733,9 +618,14 @@ class SalesOrderMailView(APIView):
 # Existing DeliveryNote views
 class DeliveryNoteListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything DeliveryNoteSerializer walks, loaded per list instead of per row
+    list_queryset = DeliveryNote.objects.select_related('acknowledgement').prefetch_related(
+        Prefetch('items', queryset=with_nested_product(DeliveryNoteItem.objects.all()).prefetch_related('serial_numbers')),
+        'attachments', 'remarks',
+    ).order_by('-delivery_date')
 
     def get(self, request):
-        delivery_notes = DeliveryNote.objects.all().order_by('-delivery_date')
+        delivery_notes = self.list_queryset.all()
         serializer = DeliveryNoteSerializer(delivery_notes, many=True)
         return Response(serializer.data)
 
@@ -751,7 +641,7 @@ class DeliveryNoteDetailView(APIView):
 
     def get(self, request, pk):
         try:
-            delivery_note = DeliveryNote.objects.get(id=pk)
+            delivery_note = DeliveryNoteListView.list_queryset.get(id=pk)
             serializer = DeliveryNoteSerializer(delivery_note)
             return Response(serializer.data)
         except ObjectDoesNotExist:
@@ -781,36 +671,10 @@ class DeliveryNoteDetailView(APIView):
             return Response({'error': 'Delivery Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
     def convert_to_invoice_from_delivery(self, delivery_note):
-        invoice_data = {
-            'invoice_date': timezone.now().date(),
-            'due_date': timezone.now().date() + timezone.timedelta(days=30),
-            'sales_order_reference': delivery_note.sales_order_reference.id,
-            'customer': delivery_note.sales_order_reference.customer.id,
-            'billing_address': delivery_note.sales_order_reference.customer.address,
-            'shipping_address': delivery_note.destination_address,
-            'email_id': delivery_note.sales_order_reference.customer.email,
-            'phone_number': delivery_note.sales_order_reference.customer.phone_number,
-            'payment_terms': 'Net 30',
-            'currency': delivery_note.sales_order_reference.currency,
-        }
-        serializer = InvoiceSerializer(data=invoice_data)
-        if serializer.is_valid():
-            invoice = serializer.save()
-            for item in delivery_note.items.all():
-                item_data = {
-                    'product': item.product.id,
-                    'quantity': item.quantity,
-                    'unit_price': item.product.unit_price or 0.00,
-                    'discount': item.product.discount or 0.00,
-                }
-                item_serializer = InvoiceItemSerializer(data=item_data)
-                if item_serializer.is_valid():
-                    invoice_item = item_serializer.save()
-                    invoice.items.add(invoice_item)
-            summary_data = {'invoice': invoice.id, 'subtotal': sum(i.total for i in invoice.items.all())}
-            OrderSummarySerializer().create(summary_data)
-            return InvoiceSerializer(invoice).data
-        return serializer.errors
+        invoices = create_invoices_from_delivery_notes([delivery_note])
+        if not invoices:
+            return {'error': 'Delivery Note has no items to invoice'}
+        return InvoiceSerializer(invoices[0]).data
 
 class DeliveryNoteItemView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -862,18 +726,7 @@ class DeliveryNotePDFView(APIView):
     def get(self, request, pk):
         try:
             delivery_note = DeliveryNote.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"DN ID: {delivery_note.DN_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {delivery_note.delivery_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Customer: {delivery_note.customer_name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="delivery_note_{delivery_note.DN_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'delivery_note', delivery_note)
         except ObjectDoesNotExist:
             return Response({'error': 'Delivery Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -890,17 +743,22 @@ class DeliveryNoteEmailView(APIView):
             html_message = render_to_string('delivery_note_email_template.html', {'delivery_note': delivery_note})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Delivery Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
 # New Invoice views
 class InvoiceListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything InvoiceSerializer walks, loaded per list instead of per row
+    list_queryset = Invoice.objects.select_related('summary').prefetch_related(
+        Prefetch('items', queryset=with_nested_product(InvoiceItem.objects.all())),
+        'attachments', 'remarks',
+    ).order_by('-invoice_date')
 
     def get(self, request):
-        invoices = Invoice.objects.all().order_by('-invoice_date')
+        invoices = self.list_queryset.all()
         serializer = InvoiceSerializer(invoices, many=True)
         return Response(serializer.data)
 
@@ -911,12 +769,28 @@ class InvoiceListView(APIView):
             return Response(InvoiceSerializer(invoice).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class InvoiceBulkPDFView(APIView):
+    """POST ``{"ids": [...]}`` or filters; returns the invoices' PDFs as one ZIP, or queues it when large."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    filters = {
+        'date_from': 'invoice_date__gte',
+        'date_to': 'invoice_date__lte',
+        'invoice_status': 'invoice_status',
+        'payment_status': 'payment_status',
+        'customer': 'customer_id',
+        'sales_order': 'sales_order_reference_id',
+    }
+
+    def post(self, request):
+        return export_pdfs_response(request, 'invoice', Invoice.objects.all(), self.filters)
+
 class InvoiceDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
         try:
-            invoice = Invoice.objects.get(id=pk)
+            invoice = InvoiceListView.list_queryset.get(id=pk)
             serializer = InvoiceSerializer(invoice)
             return Response(serializer.data)
         except ObjectDoesNotExist:
@@ -972,18 +846,7 @@ class InvoicePDFView(APIView):
     def get(self, request, pk):
         try:
             invoice = Invoice.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"Invoice ID: {invoice.INVOICE_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {invoice.invoice_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Customer: {invoice.customer.name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="invoice_{invoice.INVOICE_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'invoice', invoice)
         except ObjectDoesNotExist:
             return Response({'error': 'Invoice not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1000,8 +863,8 @@ class InvoiceEmailView(APIView):
             html_message = render_to_string('invoice_email_template.html', {'invoice': invoice})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Invoice not found'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -1012,12 +875,8 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 from .models import InvoiceReturn, InvoiceReturnItem, InvoiceReturnAttachment, InvoiceReturnRemark, InvoiceReturnSummary, InvoiceReturnHistory, InvoiceReturnComment
 from .serializers import InvoiceReturnSerializer, InvoiceReturnItemSerializer, InvoiceReturnAttachmentSerializer, InvoiceReturnRemarkSerializer, InvoiceReturnSummarySerializer, InvoiceReturnHistorySerializer, InvoiceReturnCommentSerializer
 
@@ -1120,18 +979,7 @@ class InvoiceReturnPDFView(APIView):
     def get(self, request, pk):
         try:
             invoice_return = InvoiceReturn.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"Invoice Return ID: {invoice_return.INVOICE_RETURN_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {invoice_return.invoice_return_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Customer: {invoice_return.customer.name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="invoice_return_{invoice_return.INVOICE_RETURN_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'invoice_return', invoice_return)
         except ObjectDoesNotExist:
             return Response({'error': 'Invoice Return not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1148,8 +996,8 @@ class InvoiceReturnEmailView(APIView):
             html_message = render_to_string('invoice_return_email.html', {'invoice_return': invoice_return})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Invoice Return not found'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -1160,12 +1008,8 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 from .models import DeliveryNoteReturn, DeliveryNoteReturnItem, DeliveryNoteReturnAttachment, DeliveryNoteReturnRemark, DeliveryNoteReturnHistory, DeliveryNoteReturnComment
 from .serializers import DeliveryNoteReturnSerializer, DeliveryNoteReturnItemSerializer, DeliveryNoteReturnAttachmentSerializer, DeliveryNoteReturnRemarkSerializer, DeliveryNoteReturnHistorySerializer, DeliveryNoteReturnCommentSerializer
 
@@ -1266,18 +1110,7 @@ class DeliveryNoteReturnPDFView(APIView):
     def get(self, request, pk):
         try:
             return_obj = DeliveryNoteReturn.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"DNR ID: {return_obj.DNR_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {return_obj.dnr_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Customer: {return_obj.customer.name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="delivery_note_return_{return_obj.DNR_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'delivery_note_return', return_obj)
         except ObjectDoesNotExist:
             return Response({'error': 'Delivery Note Return not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1294,7 +1127,7 @@ class DeliveryNoteReturnEmailView(APIView):
             html_message = render_to_string('delivery_note_return_email.html', {'delivery_note_return': return_obj})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Delivery Note Return not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
@@ -70,6 +70,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
+    'core.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -171,7 +172,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -187,11 +188,38 @@ AUTH_USER_MODEL = 'masters.CustomUser'
 
 
 # settings.py
+# Process-local unless CACHE_URL points at a cache every gunicorn worker shares:
+# redis://host:6379/1 (needs the redis package) or dbcache://erp_cache (run createcachetable).
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
 }
+SHARED_CACHE = not CACHES['default']['BACKEND'].endswith(('.LocMemCache', '.DummyCache'))
+
+
+# Seconds a resolved token/user/role/branch stays cached (core/authentication.py); 0 disables.
+# Only used with SHARED_CACHE: a logout can only clear the cache of the worker that served it.
+AUTH_TOKEN_CACHE_TIMEOUT = env.int('AUTH_TOKEN_CACHE_TIMEOUT', default=60)
+
+
+# Query budgets (core/query_budget.py)
+# X-DB-* debug headers on every response; strict mode raises instead of logging (use in tests).
+QUERY_BUDGET_HEADERS = env.bool('QUERY_BUDGET_HEADERS', default=DEBUG)
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=False)
+
+
+# Rendered PDFs cached under MEDIA_ROOT/pdf_cache (core/documents.py).
+# Prewarm queues a re-render after every write instead of on the next download.
+PDF_CACHE_ENABLED = env.bool('PDF_CACHE_ENABLED', default=True)
+PDF_CACHE_PREWARM = env.bool('PDF_CACHE_PREWARM', default=False)
+
+# Bulk PDF export (core/exports.py): render processes (0: up to 4, one per CPU) and documents per ZIP.
+# Larger exports than PDF_EXPORT_INLINE_MAX always run as a background job instead of in the request.
+PDF_EXPORT_PROCESSES = env.int('PDF_EXPORT_PROCESSES', default=0)
+PDF_EXPORT_MAX_DOCUMENTS = env.int('PDF_EXPORT_MAX_DOCUMENTS', default=2000)
+PDF_EXPORT_INLINE_MAX = env.int('PDF_EXPORT_INLINE_MAX', default=20)
+
+# WeasyPrint documents keep parsed stylesheets and fonts between renders (core/documents.py).
+PDF_WARM_RENDER = env.bool('PDF_WARM_RENDER', default=True)
 
 
 # settings.py 
@@ -25,7 +25,7 @@ urlpatterns = [
      path('api/masters/', include('masters.urls')),
      path('api/crm/', include('crm.urls')),
      path('api/purchase/', include('purchase.urls')),
-     path('api/finance/', include('purchase.urls')),
+     path('api/finance/', include('finance.urls')),
 
 ]
 
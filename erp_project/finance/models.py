@@ -5,12 +5,14 @@ from masters.models import Branch, Department,Supplier,Customer, Product
 from core.models import Candidate
 from crm.models import Invoice
 from purchase.models import PurchaseOrder
+from core.pricing import line_total
+from core.sequences import last_number, next_value
 
 User = get_user_model()
 
-def generate_credit_note_id():  
-    last_cn = CreditNote.objects.order_by('-id').first()
-    return f'CRN-{str(last_cn.id + 1).zfill(4) if last_cn else "0001"}' if last_cn else "CRN-0001"
+def generate_credit_note_id():
+    num = next_value('CRN', initial=lambda: last_number(CreditNote, 'CREDIT_NOTE_ID'))
+    return f'CRN-{num:04d}'
 
 
 
@@ -41,6 +43,7 @@ class CreditNote(models.Model):
     invoice_status = models.CharField(max_length=20, choices=[('Draft', 'Draft'), ('Sent', 'Sent'), ('Paid', 'Paid'), ('Overdue', 'Overdue'), ('Cancelled', 'Cancelled')], default='Draft')
     payment_status = models.CharField(max_length=20, choices=[('Paid', 'Paid'), ('Partial', 'Partial'), ('Unpaid', 'Unpaid')], default='Unpaid')
     invoice_total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
 class CreditNoteItem(models.Model):
     credit_note = models.ForeignKey(CreditNote, on_delete=models.CASCADE, related_name='items')
@@ -60,7 +63,7 @@ class CreditNoteItem(models.Model):
             self.unit_price = self.product.unit_price or 0.00
             self.tax = self.product.tax or 0.00
             self.discount = self.product.discount or 0.00
-        self.total = self.returned_qty * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.returned_qty, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class CreditNotePaymentRefund(models.Model):
@@ -88,8 +91,8 @@ class CreditNotePaymentRefund(models.Model):
 
 
 def generate_debit_note_id():
-    last_dn = DebitNote.objects.order_by('-id').first()
-    return f'DBN-{str(last_dn.id + 1).zfill(4) if last_dn else "0001"}' if last_dn else "DBN-0001"
+    num = next_value('DBN', initial=lambda: last_number(DebitNote, 'DEBIT_NOTE_ID'))
+    return f'DBN-{num:04d}'
 
 class DebitNoteAttachment(models.Model):
     debit_note = models.ForeignKey('DebitNote', on_delete=models.CASCADE, related_name='attachments')
@@ -117,6 +120,7 @@ class DebitNote(models.Model):
     payment_status = models.CharField(max_length=20, choices=[('Paid', 'Paid'), ('Partial', 'Partial'), ('Unpaid', 'Unpaid')], default='Unpaid')
     credit_limit = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     purchase_total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
 class DebitNoteItem(models.Model):
     debit_note = models.ForeignKey(DebitNote, on_delete=models.CASCADE, related_name='items')
@@ -136,7 +140,7 @@ class DebitNoteItem(models.Model):
             self.unit_price = self.product.unit_price or 0.00
             self.tax = self.product.tax or 0.00
             self.discount = self.product.discount or 0.00
-        self.total = self.returned_qty * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.returned_qty, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class DebitNotePaymentRecover(models.Model):
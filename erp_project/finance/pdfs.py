@@ -0,0 +1,20 @@
+"""Printable finance documents; see core/documents.py."""
+from core.documents import display_name, document, simple_pdf
+
+from .models import CreditNote, DebitNote
+
+
+@document('credit_note', CreditNote, filename=lambda credit_note: f'credit_note_{credit_note.CREDIT_NOTE_ID}.pdf')
+def render_credit_note(credit_note, base_url=None):
+    return simple_pdf(f"Credit Note ID: {credit_note.CREDIT_NOTE_ID}", [
+        f"Date: {credit_note.credit_note_date}",
+        f"Customer: {display_name(credit_note.customer)}",
+    ])
+
+
+@document('debit_note', DebitNote, filename=lambda debit_note: f'debit_note_{debit_note.DEBIT_NOTE_ID}.pdf')
+def render_debit_note(debit_note, base_url=None):
+    return simple_pdf(f"Debit Note ID: {debit_note.DEBIT_NOTE_ID}", [
+        f"Date: {debit_note.debit_note_date}",
+        f"Supplier: {display_name(debit_note.supplier)}",
+    ])
@@ -1,20 +1,22 @@
 from rest_framework import serializers
+from core.dynamic_fields import DynamicFieldsMixin
 from .models import CreditNote, CreditNoteItem, CreditNoteAttachment, CreditNoteRemark, CreditNotePaymentRefund, DebitNote, DebitNoteItem, DebitNoteAttachment, DebitNoteRemark, DebitNotePaymentRecover
-from core.serializers import BranchSerializer, CandidateSerializer  , SupplierSerializer
+from core.serializers import CandidateSerializer
+from masters.serializers import BranchSerializer, SupplierSerializer
 from crm.serializers import CustomerSerializer, ProductSerializer, InvoiceSerializer
 from purchase.serializers import PurchaseOrderSerializer
 
-class CreditNoteAttachmentSerializer(serializers.ModelSerializer):
+class CreditNoteAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CreditNoteAttachment
         fields = ['id', 'file']
 
-class CreditNoteRemarkSerializer(serializers.ModelSerializer):
+class CreditNoteRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CreditNoteRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class CreditNoteItemSerializer(serializers.ModelSerializer):
+class CreditNoteItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
 
     class Meta:
@@ -30,12 +32,12 @@ class CreditNoteItemSerializer(serializers.ModelSerializer):
             data['discount'] = data['product'].discount or 0.00
         return data
 
-class CreditNotePaymentRefundSerializer(serializers.ModelSerializer):
+class CreditNotePaymentRefundSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CreditNotePaymentRefund
         fields = ['id', 'amount_paid_by_customer', 'balance_due_by_customer', 'invoice_return_amount', 'balance_to_refund', 'refund_mode', 'refund_paid', 'refund_date', 'adjusted_invoice_reference']
 
-class CreditNoteSerializer(serializers.ModelSerializer):
+class CreditNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = CreditNoteItemSerializer(many=True, required=False)
     attachments = CreditNoteAttachmentSerializer(many=True, required=False)
     remarks = CreditNoteRemarkSerializer(many=True, required=False)
@@ -66,17 +68,17 @@ class CreditNoteSerializer(serializers.ModelSerializer):
             CreditNotePaymentRefund.objects.create(credit_note=credit_note, **payment_refund_data)
         return credit_note
 
-class DebitNoteAttachmentSerializer(serializers.ModelSerializer):
+class DebitNoteAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DebitNoteAttachment
         fields = ['id', 'file']
 
-class DebitNoteRemarkSerializer(serializers.ModelSerializer):
+class DebitNoteRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DebitNoteRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class DebitNoteItemSerializer(serializers.ModelSerializer):
+class DebitNoteItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
 
     class Meta:
@@ -92,12 +94,12 @@ class DebitNoteItemSerializer(serializers.ModelSerializer):
             data['discount'] = data['product'].discount or 0.00
         return data
 
-class DebitNotePaymentRecoverSerializer(serializers.ModelSerializer):
+class DebitNotePaymentRecoverSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DebitNotePaymentRecover
         fields = ['id', 'amount_paid_to_vendor', 'balance_due_to_vendor', 'purchase_return_amount', 'balance_to_recover', 'refund_mode', 'refund_received', 'refund_date', 'adjusted_invoice_reference']
 
-class DebitNoteSerializer(serializers.ModelSerializer):
+class DebitNoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = DebitNoteItemSerializer(many=True, required=False)
     attachments = DebitNoteAttachmentSerializer(many=True, required=False)
     remarks = DebitNoteRemarkSerializer(many=True, required=False)
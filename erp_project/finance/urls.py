@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import CreditNoteListView, CreditNoteDetailView, CreditNoteItemView, CreditNotePDFView, CreditNoteEmailView, DebitNoteListView, DebitNoteDetailView, DebitNoteItemView, DebitNotePDFView, DebitNoteEmailView
+from .views import CreditNoteListView, CreditNoteBulkPDFView, CreditNoteDetailView, CreditNoteItemView, CreditNotePDFView, CreditNoteEmailView, DebitNoteListView, DebitNoteDetailView, DebitNoteItemView, DebitNotePDFView, DebitNoteEmailView
 
 urlpatterns = [
     # CreditNote URLs
     path('credit-notes/', CreditNoteListView.as_view(), name='credit-note-list'),
+    path('credit-notes/export-pdf/', CreditNoteBulkPDFView.as_view(), name='credit-note-export-pdf'),
     path('credit-notes/<int:pk>/', CreditNoteDetailView.as_view(), name='credit-note-detail'),
     path('credit-notes/<int:pk>/items/', CreditNoteItemView.as_view(), name='credit-note-items'),
     path('credit-notes/<int:pk>/pdf/', CreditNotePDFView.as_view(), name='credit-note-pdf'),
@@ -1,24 +1,37 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from core.documents import pdf_view_response
+from core.exports import export_pdfs_response
+from core.outbox import queue_email
+from core.dynamic_fields import apply_dynamic_fields
 from .models import CreditNote, CreditNoteItem, CreditNoteAttachment, CreditNoteRemark, CreditNotePaymentRefund, DebitNote, DebitNoteItem, DebitNoteAttachment, DebitNoteRemark, DebitNotePaymentRecover
 from .serializers import CreditNoteSerializer, CreditNoteItemSerializer, CreditNoteAttachmentSerializer, CreditNoteRemarkSerializer, CreditNotePaymentRefundSerializer, DebitNoteSerializer, DebitNoteItemSerializer, DebitNoteAttachmentSerializer, DebitNoteRemarkSerializer, DebitNotePaymentRecoverSerializer
+from crm.models import InvoiceItem
+from masters.serializers import with_nested_product
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Prefetch
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 from django.utils import timezone
 
 class CreditNoteListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything CreditNoteSerializer walks, the nested invoice included, loaded per list instead of per row
+    list_queryset = CreditNote.objects.select_related(
+        'payment_refund', 'customer', 'created_by', 'branch', 'invoice_reference__summary',
+    ).prefetch_related(
+        Prefetch('items', queryset=with_nested_product(CreditNoteItem.objects.all())),
+        'attachments', 'remarks', 'created_by__upload_documents',
+        Prefetch('invoice_reference__items', queryset=with_nested_product(InvoiceItem.objects.all())),
+        'invoice_reference__attachments', 'invoice_reference__remarks',
+    ).order_by('-credit_note_date')
 
     def get(self, request):
-        credit_notes = CreditNote.objects.all().order_by('-credit_note_date')
-        serializer = CreditNoteSerializer(credit_notes, many=True)
+        credit_notes = self.list_queryset.all()
+        credit_notes, field_kwargs = apply_dynamic_fields(credit_notes, CreditNoteSerializer, {}, request)
+        serializer = CreditNoteSerializer(credit_notes, many=True, **field_kwargs)
         return Response(serializer.data)
 
     def post(self, request):
@@ -32,12 +45,28 @@ class CreditNoteListView(APIView):
             return Response(CreditNoteSerializer(credit_note).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class CreditNoteBulkPDFView(APIView):
+    """POST ``{"ids": [...]}`` or filters; returns the credit notes' PDFs as one ZIP, or queues it when large."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    filters = {
+        'date_from': 'credit_note_date__gte',
+        'date_to': 'credit_note_date__lte',
+        'invoice_status': 'invoice_status',
+        'payment_status': 'payment_status',
+        'customer': 'customer_id',
+        'invoice': 'invoice_reference_id',
+    }
+
+    def post(self, request):
+        return export_pdfs_response(request, 'credit_note', CreditNote.objects.all(), self.filters)
+
 class CreditNoteDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
         try:
-            credit_note = CreditNote.objects.get(id=pk)
+            credit_note = CreditNoteListView.list_queryset.get(id=pk)
             serializer = CreditNoteSerializer(credit_note)
             return Response(serializer.data)
         except ObjectDoesNotExist:
@@ -91,18 +120,7 @@ class CreditNotePDFView(APIView):
     def get(self, request, pk):
         try:
             credit_note = CreditNote.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"Credit Note ID: {credit_note.CREDIT_NOTE_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {credit_note.credit_note_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Customer: {credit_note.customer.name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="credit_note_{credit_note.CREDIT_NOTE_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'credit_note', credit_note)
         except ObjectDoesNotExist:
             return Response({'error': 'Credit Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -119,17 +137,26 @@ class CreditNoteEmailView(APIView):
             html_message = render_to_string('credit_note_email_template.html', {'credit_note': credit_note})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Credit Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
 class DebitNoteListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything DebitNoteSerializer walks, the nested purchase order included, loaded per list instead of per row
+    list_queryset = DebitNote.objects.select_related(
+        'payment_recover', 'supplier', 'created_by', 'branch', 'po_reference',
+    ).prefetch_related(
+        Prefetch('items', queryset=with_nested_product(DebitNoteItem.objects.all())),
+        'attachments', 'remarks', 'created_by__upload_documents',
+        'po_reference__items', 'po_reference__history', 'po_reference__comments',
+    ).order_by('-debit_note_date')
 
     def get(self, request):
-        debit_notes = DebitNote.objects.all().order_by('-debit_note_date')
-        serializer = DebitNoteSerializer(debit_notes, many=True)
+        debit_notes = self.list_queryset.all()
+        debit_notes, field_kwargs = apply_dynamic_fields(debit_notes, DebitNoteSerializer, {}, request)
+        serializer = DebitNoteSerializer(debit_notes, many=True, **field_kwargs)
         return Response(serializer.data)
 
     def post(self, request):
@@ -147,7 +174,7 @@ class DebitNoteDetailView(APIView):
 
     def get(self, request, pk):
         try:
-            debit_note = DebitNote.objects.get(id=pk)
+            debit_note = DebitNoteListView.list_queryset.get(id=pk)
             serializer = DebitNoteSerializer(debit_note)
             return Response(serializer.data)
         except ObjectDoesNotExist:
@@ -201,18 +228,7 @@ class DebitNotePDFView(APIView):
     def get(self, request, pk):
         try:
             debit_note = DebitNote.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = [
-                Paragraph(f"Debit Note ID: {debit_note.DEBIT_NOTE_ID}", style={'fontName': 'Helvetica-Bold', 'fontSize': 14}),
-                Paragraph(f"Date: {debit_note.debit_note_date}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-                Paragraph(f"Supplier: {debit_note.supplier.name}", style={'fontName': 'Helvetica', 'fontSize': 12}),
-            ]
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="debit_note_{debit_note.DEBIT_NOTE_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'debit_note', debit_note)
         except ObjectDoesNotExist:
             return Response({'error': 'Debit Note not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -229,7 +245,7 @@ class DebitNoteEmailView(APIView):
             html_message = render_to_string('debit_note_email_template.html', {'debit_note': debit_note})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Debit Note not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
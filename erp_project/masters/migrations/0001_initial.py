@@ -0,0 +1,624 @@
+# Generated by Django 4.2.14 on 2026-10-18 06:31
+
+from decimal import Decimal
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('first_name', models.CharField(max_length=50)),
+                ('last_name', models.CharField(blank=True, max_length=50)),
+                ('contact_number', models.CharField(blank=True, max_length=15, null=True, validators=[django.core.validators.RegexValidator(message='Contact number must be digits only, optionally starting with + (up to 15 digits).', regex='^\\+?1?\\d{9,15}$')])),
+                ('employee_id', models.CharField(blank=True, max_length=50, null=True, unique=True)),
+                ('profile_pic', models.ImageField(blank=True, null=True, upload_to='profile_pics/')),
+                ('reset_token', models.CharField(blank=True, max_length=32, null=True)),
+                ('reset_token_expiry', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User',
+                'verbose_name_plural': 'Users',
+            },
+        ),
+        migrations.CreateModel(
+            name='Branch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_branches', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_branches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Branch',
+                'verbose_name_plural': 'Branches',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_categories', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_categories', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Category',
+                'verbose_name_plural': 'Categories',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Color',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_colors', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_colors', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Color',
+                'verbose_name_plural': 'Colors',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, unique=True)),
+                ('department_name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('branch', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.branch')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_departments', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_departments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Department',
+                'verbose_name_plural': 'Departments',
+            },
+        ),
+        migrations.CreateModel(
+            name='Supplier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('supplier_id', models.CharField(blank=True, editable=False, max_length=15, unique=True)),
+                ('tax_id', models.CharField(max_length=30, unique=True, verbose_name='Tax ID / GSTIN / VAT')),
+                ('supplier_name', models.CharField(max_length=200)),
+                ('company_registration_number', models.CharField(blank=True, max_length=50, null=True)),
+                ('legal_entity_name', models.CharField(max_length=200)),
+                ('country_of_registration', models.CharField(choices=[('IN', 'India'), ('US', 'United States'), ('CA', 'Canada'), ('GB', 'United Kingdom'), ('AU', 'Australia'), ('DE', 'Germany'), ('FR', 'France'), ('SG', 'Singapore'), ('AE', 'United Arab Emirates'), ('CN', 'China'), ('JP', 'Japan')], default='IN', max_length=3)),
+                ('supplier_type', models.CharField(blank=True, choices=[('Manufacturer', 'Manufacturer'), ('Distributor', 'Distributor'), ('Service Provider', 'Service Provider'), ('Trader', 'Trader'), ('Importer', 'Importer'), ('Other', 'Other'), ('Custom', 'Custom')], max_length=30, null=True)),
+                ('is_custom_supplier_type', models.BooleanField(default=False)),
+                ('custom_supplier_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('status', models.CharField(choices=[('Active', 'Active'), ('Inactive', 'Inactive'), ('Blacklisted', 'Blacklisted')], default='Active', max_length=15)),
+                ('workflow_status', models.CharField(choices=[('Draft', 'Draft'), ('Submitted', 'Submitted')], default='Draft', max_length=15)),
+                ('supplier_tier', models.CharField(blank=True, choices=[('Strategic', 'Strategic'), ('Preferred', 'Preferred'), ('Backup', 'Backup')], max_length=20, null=True)),
+                ('product_details', models.TextField(blank=True, default='')),
+                ('primary_contact_first_name', models.CharField(max_length=100)),
+                ('primary_contact_last_name', models.CharField(blank=True, default='', max_length=100)),
+                ('primary_contact_designation', models.CharField(blank=True, default='', max_length=100)),
+                ('primary_contact_email', models.EmailField(max_length=254)),
+                ('primary_contact_phone', models.CharField(max_length=20)),
+                ('alternate_contact_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('website', models.URLField(blank=True, null=True)),
+                ('relationship_manager', models.CharField(blank=True, max_length=100, null=True)),
+                ('registered_address', models.TextField()),
+                ('mailing_address', models.TextField(blank=True, null=True)),
+                ('warehouse_address', models.TextField(blank=True, null=True)),
+                ('billing_address', models.TextField(blank=True, null=True)),
+                ('region', models.CharField(choices=[('IN', 'India'), ('US', 'United States'), ('CA', 'Canada'), ('GB', 'United Kingdom'), ('AU', 'Australia'), ('DE', 'Germany'), ('FR', 'France'), ('SG', 'Singapore'), ('AE', 'United Arab Emirates'), ('CN', 'China'), ('JP', 'Japan')], default='IN', max_length=3)),
+                ('bank_name', models.CharField(blank=True, default='', max_length=150)),
+                ('bank_account_no', models.CharField(default='', max_length=50)),
+                ('iban_swift', models.CharField(blank=True, max_length=50, null=True)),
+                ('payment_method', models.CharField(blank=True, choices=[('Wire Transfer', 'Wire Transfer'), ('ACH', 'ACH'), ('Check', 'Check'), ('Credit Card', 'Credit Card'), ('UPI', 'UPI')], max_length=30, null=True)),
+                ('payment_terms', models.CharField(blank=True, choices=[('Net 15', 'Net 15'), ('Net 30', 'Net 30'), ('Net 45', 'Net 45'), ('Net 60', 'Net 60'), ('Prepaid', 'Prepaid'), ('COD', 'COD'), ('Custom', 'Custom')], max_length=20, null=True)),
+                ('is_custom_payment_terms', models.BooleanField(default=False)),
+                ('custom_payment_terms', models.CharField(blank=True, max_length=100, null=True)),
+                ('currency', models.CharField(choices=[('INR', 'Indian Rupee'), ('USD', 'US Dollar'), ('EUR', 'Euro'), ('GBP', 'British Pound'), ('SGD', 'Singapore Dollar')], default='INR', max_length=3)),
+                ('tax_withholding_setup', models.CharField(blank=True, max_length=100, null=True)),
+                ('categories_served', models.TextField(default='')),
+                ('incoterms', models.CharField(blank=True, max_length=10, null=True)),
+                ('product_catalog', models.TextField(blank=True, default='')),
+                ('freight_terms', models.CharField(blank=True, max_length=100, null=True)),
+                ('min_order_quantity', models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)])),
+                ('return_replacement_policy', models.TextField(blank=True, default='')),
+                ('avg_lead_time_days', models.PositiveIntegerField(default=30, validators=[django.core.validators.MinValueValidator(1)])),
+                ('contract_references', models.TextField(blank=True, default='')),
+                ('certifications', models.TextField(blank=True, null=True)),
+                ('compliance_status', models.CharField(blank=True, max_length=100, null=True)),
+                ('insurance_documents', models.FileField(blank=True, null=True, upload_to='suppliers/insurance/')),
+                ('mitigation_plans', models.FileField(blank=True, null=True, upload_to='suppliers/mitigation/')),
+                ('risk_rating', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], default='Low', max_length=10)),
+                ('risk_notes', models.TextField(blank=True, null=True)),
+                ('last_risk_assessment', models.DateField(blank=True, null=True)),
+                ('on_time_delivery_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('quality_rating', models.DecimalField(blank=True, decimal_places=1, max_digits=3, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)])),
+                ('defect_return_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('last_evaluation_date', models.DateField(blank=True, null=True)),
+                ('contract_breaches', models.TextField(blank=True, default='')),
+                ('improvement_plans', models.TextField(blank=True, default='')),
+                ('complaints_registered', models.TextField(blank=True, default='')),
+                ('external_key_contact', models.CharField(blank=True, max_length=100, null=True)),
+                ('interaction_logs', models.FileField(blank=True, null=True, upload_to='suppliers/interaction_logs/')),
+                ('dispute_resolutions', models.FileField(blank=True, null=True, upload_to='suppliers/dispute/')),
+                ('feedback_surveys', models.FileField(blank=True, null=True, upload_to='suppliers/feedback/')),
+                ('visit_mom_history', models.FileField(blank=True, null=True, upload_to='suppliers/mom/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_suppliers', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_suppliers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Suppliers',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Warehouse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('location', models.CharField(max_length=200)),
+                ('manager_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('contact_info', models.CharField(blank=True, max_length=100, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_warehouses', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_warehouses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Warehouse',
+                'verbose_name_plural': 'Warehouses',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UOM',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('items', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('description', models.TextField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_uoms', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_uoms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'UOM',
+                'verbose_name_plural': 'UOMs',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaxCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('percentage', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('description', models.TextField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_tax_codes', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_tax_codes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tax Code',
+                'verbose_name_plural': 'Tax Codes',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SupplierHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('changes', models.TextField()),
+                ('changed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='masters.supplier')),
+            ],
+            options={
+                'ordering': ['-changed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SupplierComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment', models.TextField()),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('commented_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='masters.supplier')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SupplierAttachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='suppliers/extra_attachments/%Y/%m/%d/')),
+                ('description', models.CharField(blank=True, max_length=300, null=True)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='extra_attachments', to='masters.supplier')),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Size',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_sizes', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_sizes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Size',
+                'verbose_name_plural': 'Sizes',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Role',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=25)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('permissions', models.JSONField(blank=True, default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('branch', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.branch')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_roles', to=settings.AUTH_USER_MODEL)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='roles', to='masters.department')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_roles', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Role',
+                'verbose_name_plural': 'Roles',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductSupplier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('contact_person', models.CharField(blank=True, max_length=100, null=True)),
+                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('address', models.TextField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_product_suppliers', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_product_suppliers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Product Supplier',
+                'verbose_name_plural': 'Product Suppliers',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.CharField(blank=True, editable=False, max_length=20, null=True, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('product_type', models.CharField(choices=[('Goods', 'Goods'), ('Services', 'Services'), ('Combo', 'Combo')], max_length=50)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('is_custom_category', models.BooleanField(default=False)),
+                ('custom_category', models.CharField(blank=True, max_length=255, null=True)),
+                ('sub_category', models.CharField(blank=True, max_length=100, null=True)),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0.0)])),
+                ('discount', models.DecimalField(decimal_places=2, default=0.0, max_digits=5, validators=[django.core.validators.MinValueValidator(0.0)])),
+                ('is_custom_tax_code', models.BooleanField(default=False)),
+                ('custom_tax_code', models.CharField(blank=True, max_length=255, null=True)),
+                ('quantity', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('is_custom_uom', models.BooleanField(default=False)),
+                ('custom_uom', models.CharField(blank=True, max_length=255, null=True)),
+                ('stock_level', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('reorder_level', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('reserved_quantity', models.IntegerField(default=0, editable=False)),
+                ('is_custom_warehouse', models.BooleanField(default=False)),
+                ('custom_warehouse', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_custom_size', models.BooleanField(default=False)),
+                ('custom_size', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_custom_color', models.BooleanField(default=False)),
+                ('custom_color', models.CharField(blank=True, max_length=255, null=True)),
+                ('weight', models.CharField(blank=True, max_length=50, null=True)),
+                ('specifications', models.TextField(blank=True, null=True)),
+                ('is_custom_related_products', models.BooleanField(default=False)),
+                ('custom_related_products', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_custom_supplier', models.BooleanField(default=False)),
+                ('custom_supplier', models.CharField(blank=True, max_length=255, null=True)),
+                ('status', models.CharField(choices=[('Active', 'Active'), ('Inactive', 'Inactive'), ('Discontinued', 'Discontinued')], max_length=20)),
+                ('product_usage', models.CharField(choices=[('Purchase', 'Purchase'), ('Sale', 'Sale'), ('Both', 'Both')], max_length=20)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='product_images/%Y/%m/%d/')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.category')),
+                ('color', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.color')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_products', to=settings.AUTH_USER_MODEL)),
+                ('related_products', models.ManyToManyField(blank=True, related_name='related_to', to='masters.product')),
+                ('size', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.size')),
+                ('supplier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.productsupplier')),
+                ('tax_code', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.taxcode')),
+                ('uom', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.uom')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_products', to=settings.AUTH_USER_MODEL)),
+                ('warehouse', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.warehouse')),
+            ],
+            options={
+                'verbose_name': 'Product',
+                'verbose_name_plural': 'Products',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(blank=True, max_length=100)),
+                ('customer_type', models.CharField(choices=[('Individual', 'Individual'), ('Business', 'Business'), ('Organization', 'Organization')], max_length=50)),
+                ('customer_id', models.CharField(blank=True, editable=False, max_length=10, null=True, unique=True)),
+                ('status', models.CharField(choices=[('Active', 'Active'), ('Inactive', 'Inactive')], default='Active', max_length=20)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('phone_number', models.CharField(max_length=15)),
+                ('address', models.TextField(blank=True, null=True)),
+                ('street', models.CharField(blank=True, max_length=100, null=True)),
+                ('city', models.CharField(blank=True, max_length=100, null=True)),
+                ('state', models.CharField(blank=True, max_length=100, null=True)),
+                ('zip_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('country', models.CharField(blank=True, max_length=100, null=True)),
+                ('company_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('industry', models.CharField(blank=True, max_length=100, null=True)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+                ('gst_tax_id', models.CharField(blank=True, max_length=20, null=True)),
+                ('credit_limit', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('available_limit', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12, null=True)),
+                ('billing_address', models.TextField(blank=True, null=True)),
+                ('shipping_address', models.TextField(blank=True, null=True)),
+                ('payment_terms', models.CharField(blank=True, max_length=50, null=True)),
+                ('credit_term', models.CharField(blank=True, max_length=50, null=True)),
+                ('last_edit_date', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assigned_sales_rep', models.ForeignKey(blank=True, limit_choices_to={'role__role': 'Sales Representative'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_customers', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_customers', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_customers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Customer',
+                'verbose_name_plural': 'Customers',
+                'ordering': ['-last_edit_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='available_branches',
+            field=models.ManyToManyField(blank=True, related_name='users', to='masters.branch'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='primary_branch', to='masters.branch'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='created_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_users', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.department'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='groups',
+            field=models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='reporting_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subordinates', to=settings.AUTH_USER_MODEL, verbose_name='Reporting To'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='role',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='masters.role'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='updated_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_users', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='user_permissions',
+            field=models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions'),
+        ),
+        migrations.AddIndex(
+            model_name='warehouse',
+            index=models.Index(fields=['name', 'is_active'], name='masters_war_name_7e20a9_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='warehouse',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_warehouse_name'),
+        ),
+        migrations.AddIndex(
+            model_name='uom',
+            index=models.Index(fields=['name', 'is_active'], name='masters_uom_name_b70a75_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='uom',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_uom_name'),
+        ),
+        migrations.AddIndex(
+            model_name='taxcode',
+            index=models.Index(fields=['name', 'is_active'], name='masters_tax_name_addef4_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taxcode',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_tax_code_name'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['supplier_id', 'status', 'tax_id'], name='masters_sup_supplie_aa0b5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['supplier_name'], name='masters_sup_supplie_d1dfed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['created_at', 'id'], name='masters_sup_created_ef470a_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='supplier',
+            constraint=models.UniqueConstraint(fields=('tax_id',), name='unique_supplier_tax_id'),
+        ),
+        migrations.AddIndex(
+            model_name='size',
+            index=models.Index(fields=['name', 'is_active'], name='masters_siz_name_4d1cd2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='size',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_size_name'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['department', 'role'], name='masters_rol_departm_8a23e2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='role',
+            constraint=models.UniqueConstraint(fields=('department', 'role'), name='unique_role_per_department'),
+        ),
+        migrations.AddIndex(
+            model_name='productsupplier',
+            index=models.Index(fields=['name', 'is_active'], name='masters_pro_name_938960_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='productsupplier',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_product_supplier_name'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'status', 'is_active'], name='masters_pro_name_9ae6d0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['product_id'], name='masters_pro_product_6d9845_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'id'], name='masters_pro_name_3c17e2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['branch', 'department_name'], name='masters_dep_branch__f39402_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['code'], name='masters_dep_code_381a58_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(fields=('branch', 'department_name'), name='unique_dept_name_per_branch'),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(fields=('code',), name='unique_department_code'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['email', 'status', 'is_active'], name='masters_cus_email_ad26cb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['customer_id'], name='masters_cus_custome_a2c753_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['last_edit_date', 'id'], name='masters_cus_last_ed_a9f10b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='customer',
+            constraint=models.UniqueConstraint(fields=('email',), name='unique_customer_email'),
+        ),
+        migrations.AddIndex(
+            model_name='color',
+            index=models.Index(fields=['name', 'is_active'], name='masters_col_name_a6107f_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='color',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_color_name'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['name', 'is_active'], name='masters_cat_name_9e6189_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_category_name'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['email'], name='masters_cus_email_a53c0b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['employee_id'], name='masters_cus_employe_b1cec6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_active'], name='masters_cus_is_acti_001d59_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.utils import timezone
+
+from core.sequences import allocate_block, last_number, next_value
 from django.db.models import JSONField, UniqueConstraint
 from django.core.validators import RegexValidator
 from django.conf import settings
@@ -436,6 +438,8 @@ class Product(models.Model):
 
     stock_level = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     reorder_level = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    # Units held by submitted sales orders; only crm.stock writes it, with F() updates
+    reserved_quantity = models.IntegerField(default=0, editable=False)
 
     warehouse = models.ForeignKey(Warehouse, on_delete=models.SET_NULL, null=True, blank=True)
     is_custom_warehouse = models.BooleanField(default=False)
@@ -483,18 +487,36 @@ class Product(models.Model):
         ordering = ['name']
         indexes = [
             Index(fields=['name', 'status', 'is_active']),
-            Index(fields=['product_id'])
+            Index(fields=['product_id']),
+            Index(fields=['name', 'id']),
         ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def allocate_product_ids(cls, count):
+        """Reserves ``count`` CVB### codes in one step for bulk creation."""
+        block = allocate_block('CVB', count, initial=lambda: last_number(cls, 'product_id'))
+        return [f'CVB{num:03d}' for num in block]
+
+    @property
+    def available_quantity(self):
+        """On hand minus what submitted sales orders have reserved."""
+        return self.quantity - self.reserved_quantity
+
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
+        # Code is allocated before the INSERT so a new product is written once.
+        if self.pk is None and not self.product_id:
+            self.product_id = self.allocate_product_ids(1)[0]
+        elif not self._state.adding and kwargs.get('update_fields') is None:
+            # Never write back reserved_quantity: the copy loaded with this
+            # instance may be stale by the time a form or import saves it.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'reserved_quantity'
+            ]
         super().save(*args, **kwargs)
-        if is_new and not self.product_id:
-            self.product_id = f'CVB{self.id:03d}'
-            super().save(update_fields=['product_id'])
 
 
 
@@ -553,7 +575,8 @@ class Customer(models.Model):
         ordering = ['-last_edit_date']
         indexes = [
             Index(fields=['email', 'status', 'is_active']),
-            Index(fields=['customer_id'])
+            Index(fields=['customer_id']),
+            Index(fields=['last_edit_date', 'id']),
         ]
         constraints = [
             UniqueConstraint(fields=['email'], name='unique_customer_email')
@@ -565,13 +588,8 @@ class Customer(models.Model):
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         if is_new and not self.customer_id:
-            last_customer = Customer.objects.order_by('-id').first()
-            if last_customer and last_customer.customer_id:
-                last_id = int(last_customer.customer_id.replace('CUS', '')) + 1
-            else:
-                last_id = 1
-
-            self.customer_id = f'CUS{last_id:04d}'
+            num = next_value('CUS', initial=lambda: last_number(Customer, 'customer_id'))
+            self.customer_id = f'CUS{num:04d}'
         super().save(*args, **kwargs)
 
 
@@ -748,7 +766,8 @@ class Supplier(models.Model):
         ordering = ['-created_at']
         indexes = [
             Index(fields=['supplier_id', 'status', 'tax_id']),
-            Index(fields=['supplier_name'])
+            Index(fields=['supplier_name']),
+            Index(fields=['created_at', 'id']),
         ]
         constraints = [
             UniqueConstraint(fields=['tax_id'], name='unique_supplier_tax_id')
@@ -756,13 +775,7 @@ class Supplier(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.supplier_id:
-            last = Supplier.objects.order_by('-id').first()
-            num = 1
-            if last and last.supplier_id and '-' in last.supplier_id:
-                try:
-                    num = int(last.supplier_id.split('-')[1]) + 1
-                except:
-                    pass
+            num = next_value('SUP', initial=lambda: last_number(Supplier, 'supplier_id'))
             self.supplier_id = f"SUP-{num:04d}"
         super().save(*args, **kwargs)
 
@@ -0,0 +1,16 @@
+"""Printable master records; see core/documents.py."""
+from core.documents import document, html_pdf
+
+from .models import Supplier
+
+
+@document('supplier', Supplier, filename=lambda supplier: f'Supplier_{supplier.supplier_id}.pdf',
+          templates=['emails/supplier_pdf.html'])
+def render_supplier(supplier, base_url=None):
+    context = {
+        'supplier': supplier,
+        'comments': supplier.comments.all(),
+        'attachments': supplier.extra_attachments.all(),
+        'history': supplier.history.all()
+    }
+    return html_pdf('emails/supplier_pdf.html', context, base_url=base_url)
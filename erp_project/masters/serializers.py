@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core.audit import AuditUserField, AuditUserListSerializer
+from core.dynamic_fields import DynamicFieldsMixin
 from django.db import transaction
 import re
 import logging
@@ -51,12 +53,13 @@ def validate_permissions(value):
 # Branch
 # ────────────────────────────────────────────────
 
-class BranchSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class BranchSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Branch
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
     
@@ -70,25 +73,19 @@ class BranchSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Branch with this name already exists.")
 
         return value
-    
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
 # ────────────────────────────────────────────────
 # Department – read & dropdown
 # ────────────────────────────────────────────────
 
-class DepartmentDropdownSerializer(serializers.ModelSerializer):
+class DepartmentDropdownSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = ['id', 'department_name']
 
 
-class DepartmentBaseSerializer(serializers.ModelSerializer):
+class DepartmentBaseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     branch = BranchSerializer(read_only=True)
 
     class Meta:
@@ -100,31 +97,27 @@ class DepartmentBaseSerializer(serializers.ModelSerializer):
 # Role – read-only serializers only
 # ────────────────────────────────────────────────
 
-class RoleReadSerializer(serializers.ModelSerializer):
+class RoleReadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     department_name = serializers.CharField(source='department.department_name', read_only=True)
     branch_name     = serializers.CharField(source='branch.name', read_only=True)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Role
+        list_serializer_class = AuditUserListSerializer
         fields = [
             'id', 'role', 'description', 'permissions',
             'department_name', 'branch_name',
             'is_active', 'created_at', 'updated_at' ,'created_by', 'updated_by',
         ]
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
 # ────────────────────────────────────────────────
 # Nested Role (only used inside Department)
 # ────────────────────────────────────────────────
 
-class NestedRoleSerializer(serializers.ModelSerializer):
+class NestedRoleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Used for both create & update inside department payload
     id is accepted but ignored on create / full-replace
@@ -196,10 +189,11 @@ class DepartmentUpdateWithRolesSerializer(serializers.ModelSerializer):
         required=False
     )
     roles = NestedRoleSerializer(many=True, required=False, allow_empty=True)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
     class Meta:
         model = Department
+        list_serializer_class = AuditUserListSerializer
         fields = [
             'id',               # include so it shows in response
             'code',
@@ -221,12 +215,6 @@ class DepartmentUpdateWithRolesSerializer(serializers.ModelSerializer):
 
     def validate_description(self, value):
         return validate_description(value)
-    
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
     @transaction.atomic
     def update(self, instance, validated_data):
@@ -277,67 +265,54 @@ class DepartmentUpdateWithRolesSerializer(serializers.ModelSerializer):
 # Department list/detail serializers (read)
 # ────────────────────────────────────────────────
 
-class DepartmentListSerializer(serializers.ModelSerializer):
+class DepartmentListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     branch = BranchSerializer(read_only=True)
     roles  = serializers.SerializerMethodField()
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Department
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'code', 'department_name', 'description', 'branch', 'roles', 'created_by' , 'updated_by' ]
 
     def get_roles(self, obj):
         if self.context.get('include_roles', True):
             return RoleReadSerializer(obj.roles.all(), many=True).data
         return []
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
 
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
-
-class DepartmentDetailSerializer(serializers.ModelSerializer):
+class DepartmentDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     branch = BranchSerializer(read_only=True)
     roles  = RoleReadSerializer(many=True, read_only=True)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Department
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'code', 'department_name', 'description', 'branch', 'roles', 'created_by' , 'updated_by' ]
-
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 # ────────────────────────────────────────────────
 # CustomUser serializers
 # ────────────────────────────────────────────────
 
-class CustomUserDetailSerializer(serializers.ModelSerializer):
+class CustomUserDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     branch            = BranchSerializer(read_only=True)
     department        = DepartmentListSerializer(read_only=True)
     role              = RoleReadSerializer(read_only=True)
     available_branches = BranchSerializer(many=True, read_only=True)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
-    reporting_to= serializers.StringRelatedField(read_only=True)  # Shows __str__ (email) — or change to get_full_name if you have it
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
+    reporting_to = AuditUserField()
 
     class Meta:
         model = CustomUser
+        list_serializer_class = AuditUserListSerializer
         fields = [
             'id', 'first_name', 'last_name', 'email', 'contact_number',
             'branch', 'department', 'role', 'available_branches',
             'reporting_to', 'employee_id', 'profile_pic','created_by', 'updated_by'
         ]
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
 class CustomUserCreateSerializer(serializers.ModelSerializer):
@@ -505,119 +480,84 @@ from rest_framework import serializers
 from .models import Category, TaxCode, UOM, Warehouse, Size, Color, ProductSupplier, Product
 
 
-class CategorySerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Category
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
 
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
-
-
-class TaxCodeSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class TaxCodeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = TaxCode
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'percentage', 'description', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
-
-class UOMSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class UOMSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = UOM
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'items', 'description', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
-
-class WarehouseSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class WarehouseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Warehouse
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'location', 'manager_name', 'contact_info', 'notes', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
-
-class SizeSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class SizeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Size
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
-
-class ColorSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class ColorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = Color
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
-
 
-class ProductSupplierSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class ProductSupplierSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
 
     class Meta:
         model = ProductSupplier
+        list_serializer_class = AuditUserListSerializer
         fields = ['id', 'name', 'contact_person', 'phone_number', 'email', 'address', 'is_active', 'created_at', 'updated_at', 'created_by', 'updated_by']
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
-
         
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     
     # Write: accept IDs
     category = serializers.PrimaryKeyRelatedField(
@@ -670,14 +610,16 @@ class ProductSerializer(serializers.ModelSerializer):
     color_detail = ColorSerializer(source='color', read_only=True)
     supplier_detail = ProductSupplierSerializer(source='supplier', read_only=True)
     related_products_detail = serializers.SerializerMethodField(read_only=True)
+    available_quantity = serializers.IntegerField(read_only=True)
 
     # Audit fields (read-only)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
     
 
     class Meta:
         model = Product
+        list_serializer_class = AuditUserListSerializer
         fields = [
             'id', 'product_id', 'name', 'product_type', 'description',
             'category', 'category_detail', 'is_custom_category', 'custom_category',
@@ -688,12 +630,13 @@ class ProductSerializer(serializers.ModelSerializer):
             'color', 'color_detail', 'is_custom_color', 'custom_color',
             'supplier', 'supplier_detail', 'is_custom_supplier', 'custom_supplier',
             'related_products', 'related_products_detail', 'is_custom_related_products', 'custom_related_products',
-            'unit_price', 'discount', 'quantity', 'stock_level', 'reorder_level',
+            'unit_price', 'discount', 'quantity', 'reserved_quantity', 'available_quantity',
+            'stock_level', 'reorder_level',
             'weight', 'specifications', 'status', 'product_usage', 'image', 'sub_category',
             'created_at', 'updated_at', 'created_by', 'updated_by'
         ]
         read_only_fields = [
-            'id', 'product_id', 'created_at', 'updated_at', 'created_by', 'updated_by',
+            'id', 'product_id', 'reserved_quantity', 'created_at', 'updated_at', 'created_by', 'updated_by',
             'category_detail', 'tax_code_detail', 'uom_detail', 'warehouse_detail',
             'size_detail', 'color_detail', 'supplier_detail', 'related_products_detail'
         ]
@@ -752,7 +695,8 @@ class ProductSerializer(serializers.ModelSerializer):
             updated_by=self.context['request'].user
         )
 
-        product.related_products.set(related_products)
+        if related_products:
+            product.related_products.set(related_products)
         return product
 
     @transaction.atomic
@@ -771,13 +715,19 @@ class ProductSerializer(serializers.ModelSerializer):
 
         return instance
 
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
 
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
-    
-class CustomerSerializer(serializers.ModelSerializer):
+# Everything ProductSerializer reads beyond the product row
+PRODUCT_SELECT_RELATED = ('category', 'tax_code', 'uom', 'warehouse', 'size', 'color', 'supplier')
+
+
+def with_nested_product(queryset, path='product'):
+    """``queryset`` of rows that nest ProductSerializer at ``path``, with its relations loaded up front."""
+    return queryset.select_related(
+        path, *(f'{path}__{name}' for name in PRODUCT_SELECT_RELATED)
+    ).prefetch_related(f'{path}__related_products')
+
+
+class CustomerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     assigned_sales_rep = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.filter(role__role="Sales Representative"),
         allow_null=True,
@@ -785,14 +735,15 @@ class CustomerSerializer(serializers.ModelSerializer):
     )
     customer_id = serializers.CharField(required=False, allow_blank=True)
     available_limit = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, allow_null=True)
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
     
     # Read-only nested for detail view
-    assigned_sales_rep_detail = serializers.StringRelatedField(source='assigned_sales_rep', read_only=True)
+    assigned_sales_rep_detail = AuditUserField(source='assigned_sales_rep')
 
     class Meta:
         model = Customer
+        list_serializer_class = AuditUserListSerializer
         fields = [
             'id', 'first_name', 'last_name', 'customer_type', 'customer_id',
             'status', 'assigned_sales_rep', 'assigned_sales_rep_detail', 'email', 'phone_number', 'address',
@@ -805,12 +756,6 @@ class CustomerSerializer(serializers.ModelSerializer):
             'id', 'customer_id', 'last_edit_date', 'created_at', 'updated_at',
             'created_by', 'updated_by', 'assigned_sales_rep_detail'
         ]
-
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
     
     def validate(self, data):
         # Only enforce required fields on creation (POST)
@@ -853,20 +798,15 @@ class CustomerSerializer(serializers.ModelSerializer):
         return instance
     
 
-class SupplierSerializer(serializers.ModelSerializer):
-    created_by = serializers.SerializerMethodField()
-    updated_by = serializers.SerializerMethodField()
+class SupplierSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    created_by = AuditUserField()
+    updated_by = AuditUserField()
     
     class Meta:
         model = Supplier
+        list_serializer_class = AuditUserListSerializer
         fields = "__all__"
         read_only_fields = ['supplier_id', 'created_at', 'updated_at', 'created_by', 'updated_by']
-    
-    def get_created_by(self, obj):
-        return obj.created_by.get_full_name() if obj.created_by else None
-
-    def get_updated_by(self, obj):
-        return obj.updated_by.get_full_name() if obj.updated_by else None
 
 
 class SupplierCreateUpdateSerializer(serializers.ModelSerializer):
@@ -969,36 +909,30 @@ class SupplierCreateUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class SupplierCommentSerializer(serializers.ModelSerializer):
-    commented_by = serializers.SerializerMethodField()
+class SupplierCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    commented_by = AuditUserField()
     class Meta:
         model = SupplierComment
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'
         read_only_fields = ['commented_by', 'timestamp']
 
-    def get_commented_by(self, obj):
-        return obj.commented_by.get_full_name() if obj.commented_by else None
-
 
-class SupplierAttachmentSerializer(serializers.ModelSerializer):
-    uploaded_by = serializers.SerializerMethodField()
+class SupplierAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    uploaded_by = AuditUserField()
 
     class Meta:
         model = SupplierAttachment
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'
         read_only_fields = ['uploaded_by', 'uploaded_at']
-    
-    def get_uploaded_by(self, obj):
-        return obj.uploaded_by.get_full_name() if obj.uploaded_by else None
 
 
-class SupplierHistorySerializer(serializers.ModelSerializer):
-    changed_by = serializers.SerializerMethodField()
+class SupplierHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    changed_by = AuditUserField()
 
     class Meta:
         model = SupplierHistory
+        list_serializer_class = AuditUserListSerializer
         fields = '__all__'
-        read_only_fields = ['changed_by', 'changed_at']
-
-    def get_changed_by(self, obj):
-        return obj.changed_by.get_full_name() if obj.changed_by else None
\ No newline at end of file
+        read_only_fields = ['changed_by', 'changed_at']
\ No newline at end of file
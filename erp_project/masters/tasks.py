@@ -0,0 +1,144 @@
+"""Background tasks for masters; see core/jobs.py."""
+from contextlib import suppress
+from types import SimpleNamespace
+
+from django.db import transaction
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+from core.counting import bump_table_version
+from core.jobs import task
+
+from .models import Product
+from .serializers import CustomerSerializer, ProductSerializer
+
+
+def save_product_rows(valid_rows, request):
+    """
+    Creates products from validated import rows; returns ``(products, errors)``.
+
+    Foreign keys are looked up once per column for the whole file and the
+    products are written with one INSERT, so an import runs the same few
+    queries however many rows it has.
+    """
+    serializers = [ProductSerializer(data=row, context={'request': request}) for row in valid_rows]
+    _preload_relations(serializers, valid_rows)
+    valid = []
+    errors = []
+    for serializer in serializers:
+        if serializer.is_valid():
+            valid.append(serializer)
+        else:
+            errors.append(serializer.errors)
+    if not valid:
+        return [], errors
+
+    # One counter bump for the whole file, as ProductSerializer.create would save each row
+    user = request.user
+    products, related = [], []
+    for serializer, product_id in zip(valid, Product.allocate_product_ids(len(valid))):
+        data = dict(serializer.validated_data)
+        related.append(dict.fromkeys(data.pop('related_products', [])))
+        products.append(Product(**data, product_id=product_id, created_by=user, updated_by=user))
+    Product.objects.bulk_create(products)
+    if any(product.pk is None for product in products):
+        # MySQL returns no ids from a bulk INSERT: look the rows up by their new codes
+        pks = dict(
+            Product.objects.filter(product_id__in=[product.product_id for product in products])
+            .values_list('product_id', 'pk')
+        )
+        for product in products:
+            product.pk = pks[product.product_id]
+    Through = Product.related_products.through
+    Through.objects.bulk_create([
+        Through(from_product_id=product.pk, to_product_id=other.pk)
+        for product, others in zip(products, related) for other in others
+    ])
+    # bulk_create sends no post_save, so invalidate the cached list counts here
+    bump_table_version(Product._meta.db_table)
+    return products, errors
+
+
+class _Preloaded:
+    """Stands in for a related field's queryset: ``get(pk=...)`` from rows loaded up front."""
+
+    def __init__(self, model, objects):
+        self.model = model
+        self.objects = objects
+
+    def get(self, pk):
+        # int() raises TypeError/ValueError like the real lookup does for a malformed id
+        try:
+            return self.objects[int(pk)]
+        except KeyError:
+            raise self.model.DoesNotExist from None
+
+
+def _preload_relations(serializers, rows):
+    """Points the id fields of every row serializer at one ``in_bulk`` per field instead of a query per row."""
+    if not serializers:
+        return
+    lookups = {}
+    for name, field in serializers[0].fields.items():
+        relation = getattr(field, 'child_relation', field)
+        if field.read_only or not isinstance(relation, PrimaryKeyRelatedField):
+            continue
+        values = [row.get(name) for row in rows if isinstance(row, dict)]
+        if isinstance(field, ManyRelatedField):
+            values = [value for value in values if isinstance(value, list) for value in value]
+        pks = set()
+        for value in values:
+            if isinstance(value, (int, str)) and not isinstance(value, bool):
+                with suppress(ValueError):
+                    pks.add(int(value))
+        queryset = relation.get_queryset()
+        lookups[name] = _Preloaded(queryset.model, queryset.in_bulk(pks) if pks else {})
+    for serializer in serializers:
+        for name, lookup in lookups.items():
+            field = serializer.fields[name]
+            getattr(field, 'child_relation', field).queryset = lookup
+
+
+def save_customer_rows(valid_rows, request):
+    """Creates customers from validated import rows; returns ``(customers, errors)``."""
+    customers = []
+    errors = []
+    for row in valid_rows:
+        serializer = CustomerSerializer(data=row, context={'request': request})
+        if serializer.is_valid():
+            customers.append(serializer.save())
+        else:
+            errors.append(serializer.errors)
+    return customers, errors
+
+
+def _as_request(job):
+    # The serializers only read ``request.user`` for created_by/updated_by
+    return SimpleNamespace(user=job.created_by)
+
+
+@task('import_products')
+def import_products(job, valid_rows):
+    # All or nothing, like the synchronous import; progress shows once it commits
+    job.report(5, f'Importing {len(valid_rows)} rows')
+    with transaction.atomic():
+        products, errors = save_product_rows(valid_rows, _as_request(job))
+    return {
+        'created_count': len(products),
+        'error_count': len(errors),
+        'created': [product.product_id for product in products],
+        'errors': errors,
+    }
+
+
+@task('import_customers')
+def import_customers(job, valid_rows):
+    # All or nothing, like the synchronous import; progress shows once it commits
+    job.report(5, f'Importing {len(valid_rows)} rows')
+    with transaction.atomic():
+        customers, errors = save_customer_rows(valid_rows, _as_request(job))
+    return {
+        'created_count': len(customers),
+        'error_count': len(errors),
+        'created': [customer.customer_id for customer in customers],
+        'errors': errors,
+    }
@@ -1,3 +1,51 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from core.benchmark import get_benchmark_client
+
+from .models import Product
+
+
+class ProductImportConfirmTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_perf_data', scale=1, seed=1, stdout=StringIO())
+        cls.product = Product.objects.exclude(category=None).exclude(uom=None).first()
+
+    def setUp(self):
+        self.client = get_benchmark_client()
+        self.client.raise_request_exception = True
+
+    def confirm(self, count):
+        rows = [
+            {'name': f'Imported {i}', 'product_type': 'Goods', 'unit_price': '10.00', 'quantity': 1,
+             'stock_level': 1, 'status': 'Active', 'product_usage': 'Both', 'category': self.product.category_id,
+             'uom': self.product.uom_id, 'related_products': [self.product.pk]}
+            for i in range(count)
+        ]
+        response = self.client.post('/api/masters/products/import/confirm/', {'valid_rows': rows}, format='json')
+        self.assertEqual(response.status_code, 201, response.content[:200])
+        return response
+
+    def assertImported(self, response, count):
+        self.assertEqual(response.data['created_count'], count)
+        created = Product.objects.filter(name__startswith='Imported ')
+        self.assertEqual(created.count(), count)
+        self.assertEqual(sorted(item['id'] for item in response.data['created']), sorted(p.pk for p in created))
+        for product in created:
+            self.assertEqual(list(product.related_products.values_list('pk', flat=True)), [self.product.pk])
+
+    def test_creates_products_and_related_rows(self):
+        self.assertImported(self.confirm(5), 5)
+
+    def test_backend_without_bulk_insert_ids(self):
+        # MySQL hands back no primary keys from bulk_create
+        features = type(connection.features)
+        with mock.patch.object(features, 'can_return_rows_from_bulk_insert', new_callable=mock.PropertyMock,
+                               return_value=False):
+            response = self.confirm(5)
+        self.assertImported(response, 5)
@@ -2,7 +2,7 @@ import logging
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Prefetch
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.core.mail import EmailMessage, send_mail
@@ -17,9 +17,14 @@ from rest_framework.authtoken.models import Token
 
 from django.contrib.auth import authenticate
 
+from core.audit import prime_audit_users
 from core.permissions import RoleBasedPermission
+from core.pagination import paginated_response
+from core.jobs import enqueue, queued_response_data, wants_background
+from core.outbox import queue_email
 from .models import Customer
 from .serializers import CustomerSerializer
+from .tasks import save_customer_rows, save_product_rows
 import pandas as pd
 
 
@@ -72,7 +77,13 @@ class ManageUsersListCreateView(generics.ListCreateAPIView):
         return CustomUserDetailSerializer
 
     def get_queryset(self):
-        qs = CustomUser.objects.select_related('branch', 'department', 'role').order_by('id')
+        # Everything CustomUserDetailSerializer walks: the department's roles, their names, the branches
+        qs = CustomUser.objects.select_related(
+            'branch', 'department__branch', 'role__department', 'role__branch',
+        ).prefetch_related(
+            'available_branches',
+            Prefetch('department__roles', queryset=Role.objects.select_related('department', 'branch')),
+        ).order_by('id')
         search = self.request.query_params.get('search', '').strip()
         if search:
             qs = qs.filter(
@@ -88,36 +99,16 @@ class ManageUsersListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        return paginated_response(self, queryset, "Users fetched successfully")
 
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Users fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
-
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         instance = serializer.instance
 
-        # Your existing email logic remains unchanged
+        # The account and its welcome email commit together
         password = get_random_string(length=8, allowed_chars='abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*')
         instance.set_password(password)
         instance.save(update_fields=['password'])
@@ -142,11 +133,8 @@ class ManageUsersListCreateView(generics.ListCreateAPIView):
         )
         email.content_subtype = 'html'
 
-        try:
-            email.send(fail_silently=False)
-            logger.info(f"Welcome email sent successfully to {instance.email}")
-        except Exception as e:
-            logger.error(f"Failed to send welcome email to {instance.email}: {str(e)}")
+        queue_email(email)
+        logger.info(f"Welcome email queued for {instance.email}")
 
         return Response({
             "message": "User created successfully",
@@ -201,28 +189,7 @@ class BranchListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Branches fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Branches fetched successfully")
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -296,6 +263,9 @@ class DepartmentListView(generics.ListAPIView):
             )
 
         self.dropdown_mode = dropdown
+        if not dropdown and self.request.query_params.get('include_roles', 'true').lower() == 'true':
+            # get_roles reads each role's department and branch name
+            qs = qs.prefetch_related(Prefetch('roles', queryset=Role.objects.select_related('department', 'branch')))
         return qs
 
     def get_serializer_class(self):
@@ -310,28 +280,7 @@ class DepartmentListView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Departments fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Departments fetched successfully")
 
 
 class DepartmentCreateView(generics.CreateAPIView):
@@ -403,28 +352,7 @@ class RoleListView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Roles fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Roles fetched successfully")
 
 
 class RoleDetailView(generics.RetrieveAPIView):
@@ -465,6 +393,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from .models import Product
 from .serializers import ProductSerializer  # assuming this is your main serializer
+from .serializers import PRODUCT_SELECT_RELATED
 
 
 class ProductListCreateView(generics.ListCreateAPIView):
@@ -490,28 +419,7 @@ class ProductListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Products fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Products fetched successfully")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -573,28 +481,7 @@ class CategoryListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Categories fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Categories fetched successfully")
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -654,28 +541,7 @@ class TaxCodeListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Tax Codes fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Tax Codes fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -734,28 +600,7 @@ class UOMListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "UOMs fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "UOMs fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -814,28 +659,7 @@ class WarehouseListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Warehouses fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Warehouses fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -894,28 +718,7 @@ class SizeListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Sizes fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Sizes fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -974,28 +777,7 @@ class ColorListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Colors fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Colors fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -1054,28 +836,7 @@ class ProductSupplierListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Product Suppliers fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Product Suppliers fetched successfully")
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     def create(self, request, *args, **kwargs):
@@ -1227,16 +988,16 @@ class ProductImportConfirmView(APIView):
         if not valid_rows:
             return Response({'error': 'No valid rows'}, status=400)
 
-        created = []
-        errors = []
+        if wants_background(request):
+            job = enqueue('import_products', user=request.user, valid_rows=valid_rows)
+            return Response(queued_response_data(job, request), status=202)
 
-        for row in valid_rows:
-            serializer = ProductSerializer(data=row, context={'request': request})
-            if serializer.is_valid():
-                product = serializer.save()
-                created.append(ProductSerializer(product).data)
-            else:
-                errors.append(serializer.errors)
+        products, errors = save_product_rows(valid_rows, request)
+        created = ProductSerializer(
+            Product.objects.select_related(*PRODUCT_SELECT_RELATED).prefetch_related('related_products')
+            .filter(pk__in=[product.pk for product in products]).order_by('pk'),
+            many=True,
+        ).data
 
         return Response({
             'created_count': len(created),
@@ -1276,28 +1037,7 @@ class CustomerListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = self.get_serializer(page, many=True)
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Customers fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Customers fetched successfully")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -1467,16 +1207,12 @@ class CustomerImportConfirmView(APIView):
         if not valid_rows:
             return Response({'error': 'No valid rows to import'}, status=400)
 
-        created = []
-        errors = []
+        if wants_background(request):
+            job = enqueue('import_customers', user=request.user, valid_rows=valid_rows)
+            return Response(queued_response_data(job, request), status=202)
 
-        for row in valid_rows:
-            serializer = CustomerSerializer(data=row, context={'request': request})
-            if serializer.is_valid():
-                customer = serializer.save()
-                created.append(CustomerSerializer(customer).data)
-            else:
-                errors.append(serializer.errors)
+        customers, errors = save_customer_rows(valid_rows, request)
+        created = [CustomerSerializer(customer).data for customer in customers]
 
         return Response({
             'created_count': len(created),
@@ -1541,6 +1277,11 @@ class CustomerDuplicatesListView(APIView):
             if not found:
                 name_groups[key] = [c]
 
+        # One name lookup for every group's audit fields, not one per group
+        prime_audit_users(CustomerSerializer(), [
+            c for group in name_groups.values() if len(group) > 1 for c in group
+        ])
+
         # Build groups with more than 1 customer
         for group in name_groups.values():
             if len(group) > 1:
@@ -1663,12 +1404,13 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from core.documents import pdf_view_response
+from core.outbox import queue_email
 from core.permissions import RoleBasedPermission
 from rest_framework.pagination import PageNumberPagination
 from django.db import transaction
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-from weasyprint import HTML
 from django.core.mail import EmailMessage
 import os
 
@@ -1705,28 +1447,7 @@ class SupplierListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-
-        page_number = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('limit', 10))
-
-        paginator = Paginator(queryset, page_size)
-        page = paginator.get_page(page_number)
-
-        serializer = SupplierSerializer(page, many=True)  # Use full serializer for list
-
-        from_count = (page.number - 1) * page_size + 1
-        to_count = from_count + len(page.object_list) - 1 if page.object_list else 0
-
-        return Response({
-            "message": "Suppliers fetched successfully",
-            "data": {
-                "from": from_count,
-                "to": to_count,
-                "totalCount": paginator.count,
-                "totalPages": paginator.num_pages,
-                "data": serializer.data
-            }
-        })
+        return paginated_response(self, queryset, "Suppliers fetched successfully", serializer_class=SupplierSerializer)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -1785,20 +1506,7 @@ class SupplierPDFView(APIView):
         if supplier.workflow_status != 'Submitted':
             return Response({'message': 'PDF only available after submission'}, status=403)
 
-        context = {
-            'supplier': supplier,
-            'comments': supplier.comments.all(),
-            'attachments': supplier.extra_attachments.all(),
-            'history': supplier.history.all()
-        }
-
-        html_string = render_to_string('emails/supplier_pdf.html', context)
-        html = HTML(string=html_string)
-        pdf = html.write_pdf()
-
-        response = HttpResponse(pdf, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="Supplier_{supplier.supplier_id}.pdf"'
-        return response
+        return pdf_view_response(request, 'supplier', supplier)
 
 
 class SupplierEmailView(APIView):
@@ -1816,9 +1524,9 @@ class SupplierEmailView(APIView):
         html_content = render_to_string('emails/supplier_email.html', {'supplier': supplier})
         msg = EmailMessage(f"Supplier {supplier.supplier_id}", html_content, to=[email])
         msg.content_subtype = "html"
-        msg.send()
+        queue_email(msg)
 
-        return Response({"message": "Email sent successfully"})
+        return Response({"message": "Email queued for sending"})
 
 
 class SupplierCommentView(APIView):
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from masters.models import Supplier, Product
+from core.pricing import line_total
+from core.sequences import last_number, next_value
 
 def get_default_po_date():
     return timezone.now().date()
@@ -32,9 +34,8 @@ class PurchaseOrder(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.PO_ID:
-            last_po = PurchaseOrder.objects.order_by('-id').first()
-            new_id = f'PO-{timezone.now().strftime("%Y%m%d")}-{str(last_po.id + 1).zfill(3) if last_po else "001"}'
-            self.PO_ID = new_id
+            num = next_value('PO', initial=lambda: last_number(PurchaseOrder, 'PO_ID'))
+            self.PO_ID = f'PO-{timezone.now().strftime("%Y%m%d")}-{num:03d}'
         super().save(*args, **kwargs)
 
 class PurchaseOrderItem(models.Model):
@@ -48,7 +49,7 @@ class PurchaseOrderItem(models.Model):
     total = models.DecimalField(max_digits=10, decimal_places=2)
 
     def save(self, *args, **kwargs):
-        self.total = self.qty_ordered * self.unit_price * (1 - self.discount/100) * (1 + self.tax/100)
+        self.total = line_total(self.qty_ordered, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class PurchaseOrderHistory(models.Model):
@@ -97,12 +98,12 @@ class StockReceipt(models.Model):
         choices=[('Draft', 'Draft'), ('Submitted', 'Submitted'), ('Returned', 'Returned'), ('Cancelled', 'Cancelled')],
         default='Draft'
     )
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     def save(self, *args, **kwargs):
         if not self.GRN_ID:
-            last_grn = StockReceipt.objects.order_by('-id').first()
-            new_id = f'GRN-{timezone.now().strftime("%Y%m%d")}-{str(last_grn.id + 1).zfill(4) if last_grn else "0001"}'
-            self.GRN_ID = new_id
+            num = next_value('GRN', initial=lambda: last_number(StockReceipt, 'GRN_ID'))
+            self.GRN_ID = f'GRN-{timezone.now().strftime("%Y%m%d")}-{num:04d}'
         super().save(*args, **kwargs)
 
 class StockReceiptItem(models.Model):
@@ -126,7 +127,7 @@ class StockReceiptItem(models.Model):
             self.rejected_qty = self.qty_received - self.accepted_qty
         if self.rejected_qty < 0:
             self.rejected_qty = 0
-        self.total = self.qty_received * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.qty_received, self.unit_price, self.discount, self.tax)
         super().save(*args, **kwargs)
 
 class SerialNumber(models.Model):
@@ -184,12 +185,12 @@ class StockReturn(models.Model):
     global_discount_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     rounding_adjustment = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     amount_to_recover = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     def save(self, *args, **kwargs):
         if not self.SRN_ID:
-            last_srn = StockReturn.objects.order_by('-id').first()
-            new_id = f'SRN-{timezone.now().strftime("%Y%m%d")}-{str(last_srn.id + 1).zfill(4) if last_srn else "0001"}'
-            self.SRN_ID = new_id
+            num = next_value('SRN', initial=lambda: last_number(StockReturn, 'SRN_ID'))
+            self.SRN_ID = f'SRN-{timezone.now().strftime("%Y%m%d")}-{num:04d}'
         if self.pk and self.items.exists():
             self.return_subtotal = sum(item.total for item in self.items.all())
             self.global_discount_amount = self.return_subtotal * (self.global_discount / 100)
@@ -219,7 +220,7 @@ class StockReturnItem(models.Model):
             self.unit_price = self.stock_receipt_item.unit_price
             self.tax = self.stock_receipt_item.tax
             self.discount = self.stock_receipt_item.discount
-        self.total = self.qty_returned * self.unit_price * (1 - self.discount / 100) * (1 + self.tax / 100)
+        self.total = line_total(self.qty_returned, self.unit_price, self.discount, self.tax)
         if self.qty_returned > (self.qty_rejected or 0):
             raise ValueError("Qty returned cannot exceed rejected qty")
         super().save(*args, **kwargs)
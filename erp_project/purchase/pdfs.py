@@ -0,0 +1,159 @@
+"""Printable purchase documents; see core/documents.py."""
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from core.documents import display_name, document
+
+from .models import StockReceipt, StockReturn
+
+
+@document('stock_receipt', StockReceipt, filename=lambda stock_receipt: f'stock_receipt_{stock_receipt.GRN_ID}.pdf')
+def render_stock_receipt(stock_receipt, base_url=None):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = []
+
+    header_data = [
+        ['GRN ID', stock_receipt.GRN_ID],
+        ['Received Date', stock_receipt.received_date],
+        ['Supplier', display_name(stock_receipt.supplier)],
+        ['Total Items', len(stock_receipt.items.all())],
+    ]
+    header_table = Table(header_data)
+    header_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ]))
+    elements.append(header_table)
+
+    items_data = [['Product', 'UOM', 'Qty Ordered', 'Qty Received', 'Accepted Qty', 'Unit Price', 'Tax (%)', 'Discount (%)', 'Total', 'Serials', 'Batches']]
+    for item in stock_receipt.items.all():
+        serials = ', '.join(sn.serial_no for sn in item.serial_numbers.all()) if item.serial_numbers.exists() else 'N/A'
+        batches = ', '.join(bn.batch_no for bn in item.batch_numbers.all()) if item.batch_numbers.exists() else 'N/A'
+        items_data.append([
+            item.product.name if item.product else 'N/A',
+            item.uom,
+            item.qty_ordered or 0,
+            item.qty_received,
+            item.accepted_qty,
+            f"{item.unit_price:.2f}",
+            f"{item.tax:.2f}",
+            f"{item.discount:.2f}",
+            f"{item.total:.2f}",
+            serials,
+            batches
+        ])
+    items_table = Table(items_data)
+    items_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    elements.append(items_table)
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+@document('stock_return', StockReturn, filename=lambda stock_return: f'stock_return_{stock_return.SRN_ID}.pdf')
+def render_stock_return(stock_return, base_url=None):
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = []
+
+    header_data = [
+        ['SRN ID', stock_return.SRN_ID],
+        ['Return Date', stock_return.return_date],
+        ['Supplier', display_name(stock_return.supplier)],
+        ['Total Items', len(stock_return.items.all())],
+    ]
+    header_table = Table(header_data)
+    header_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ]))
+    elements.append(header_table)
+
+    items_data = [['Product', 'UOM', 'Qty Ordered', 'Qty Rejected', 'Qty Returned', 'Unit Price', 'Tax (%)', 'Discount (%)', 'Total', 'Serials']]
+    for item in stock_return.items.all():
+        serials = ', '.join(sn.serial_no for sn in item.serial_numbers.all()) if item.serial_numbers.exists() else 'N/A'
+        items_data.append([
+            item.product.name if item.product else 'N/A',
+            item.uom,
+            item.qty_ordered or 0,
+            item.qty_rejected or 0,
+            item.qty_returned,
+            f"{item.unit_price:.2f}",
+            f"{item.tax:.2f}",
+            f"{item.discount:.2f}",
+            f"{item.total:.2f}",
+            serials
+        ])
+    items_table = Table(items_data)
+    items_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    elements.append(items_table)
+
+    calc_data = [
+        ['Original Purchased Total', f"₹{stock_return.original_purchased_total:.2f}"],
+        ['Global Discount (%)', f"{stock_return.global_discount:.2f}%"],
+        ['Return Subtotal', f"₹{stock_return.return_subtotal:.2f}"],
+        ['Global Discount Amount', f"₹{stock_return.global_discount_amount:.2f}"],
+        ['Rounding Adjustment', f"₹{stock_return.rounding_adjustment:.2f}"],
+        ['Amount to Recover', f"₹{stock_return.amount_to_recover:.2f}"],
+    ]
+    calc_table = Table(calc_data)
+    calc_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ]))
+    elements.append(calc_table)
+
+    doc.build(elements)
+    return buffer.getvalue()
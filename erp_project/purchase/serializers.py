@@ -1,25 +1,26 @@
 from rest_framework import serializers
+from core.dynamic_fields import DynamicFieldsMixin
 from .models import PurchaseOrder, PurchaseOrderItem, PurchaseOrderHistory, PurchaseOrderComment 
 
-class PurchaseOrderItemSerializer(serializers.ModelSerializer):
+class PurchaseOrderItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrderItem
         fields = ['id', 'product', 'qty_ordered', 'insufficient_stock', 'unit_price', 'tax', 'discount', 'total']
         read_only_fields = ['total', 'purchase_order']
 
-class PurchaseOrderHistorySerializer(serializers.ModelSerializer):
+class PurchaseOrderHistorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrderHistory
         fields = ['id', 'action', 'performed_by', 'timestamp', 'details']
         read_only_fields = ['purchase_order']
 
-class PurchaseOrderCommentSerializer(serializers.ModelSerializer):
+class PurchaseOrderCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrderComment
         fields = ['id', 'comment', 'created_by', 'timestamp']
         read_only_fields = ['purchase_order']
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = PurchaseOrderItemSerializer(many=True, required=False)
     history = PurchaseOrderHistorySerializer(many=True, required=False)
     comments = PurchaseOrderCommentSerializer(many=True, required=False)
@@ -64,17 +65,17 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
 from rest_framework import serializers
 from .models import StockReceipt, StockReceiptItem, SerialNumber, BatchNumber, BatchSerialNumber, StockReceiptRemark, StockReceiptAttachment
 
-class StockReceiptAttachmentSerializer(serializers.ModelSerializer):
+class StockReceiptAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StockReceiptAttachment
         fields = ['id', 'file']
 
-class StockReceiptRemarkSerializer(serializers.ModelSerializer):
+class StockReceiptRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StockReceiptRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class SerialNumberSerializer(serializers.ModelSerializer):
+class SerialNumberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SerialNumber
         fields = ['id', 'serial_no']
@@ -83,12 +84,12 @@ class SerialNumberSerializer(serializers.ModelSerializer):
         stock_receipt_item = self.context.get('stock_receipt_item')
         return SerialNumber.objects.create(stock_receipt_item=stock_receipt_item, **validated_data)
 
-class BatchSerialNumberSerializer(serializers.ModelSerializer):
+class BatchSerialNumberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BatchSerialNumber
         fields = ['id', 'serial_no']
 
-class BatchNumberSerializer(serializers.ModelSerializer):
+class BatchNumberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     serial_numbers = BatchSerialNumberSerializer(many=True, required=False)
 
     class Meta:
@@ -103,7 +104,7 @@ class BatchNumberSerializer(serializers.ModelSerializer):
             BatchSerialNumber.objects.create(batch_number=batch, **serial_data)
         return batch
 
-class StockReceiptItemSerializer(serializers.ModelSerializer):
+class StockReceiptItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     serial_numbers = SerialNumberSerializer(many=True, required=False)
     batch_numbers = BatchNumberSerializer(many=True, required=False)
 
@@ -143,7 +144,7 @@ class StockReceiptItemSerializer(serializers.ModelSerializer):
                 BatchNumberSerializer(context={'stock_receipt_item': instance}).create(batch_data)
         return instance
 
-class StockReceiptSerializer(serializers.ModelSerializer):
+class StockReceiptSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = StockReceiptItemSerializer(many=True, required=False)
     attachments = StockReceiptAttachmentSerializer(many=True, required=False)
     remarks = StockReceiptRemarkSerializer(many=True, required=False)
@@ -189,22 +190,22 @@ from .models import StockReturn, StockReturnItem, SerialNumberReturn, StockRetur
 from .models import StockReceiptItem
 from .serializers import SerialNumberSerializer
 
-class StockReturnAttachmentSerializer(serializers.ModelSerializer):
+class StockReturnAttachmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StockReturnAttachment
         fields = ['id', 'file']
 
-class StockReturnRemarkSerializer(serializers.ModelSerializer):
+class StockReturnRemarkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = StockReturnRemark
         fields = ['id', 'text', 'created_by', 'timestamp']
 
-class SerialNumberReturnSerializer(serializers.ModelSerializer):
+class SerialNumberReturnSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SerialNumberReturn
         fields = ['id', 'serial_no']
 
-class StockReturnItemSerializer(serializers.ModelSerializer):
+class StockReturnItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     serial_numbers = SerialNumberReturnSerializer(many=True, required=False)
     available_serials = serializers.SerializerMethodField()  # For popup data
 
@@ -243,7 +244,7 @@ class StockReturnItemSerializer(serializers.ModelSerializer):
                 SerialNumberReturn.objects.create(stock_return_item=instance, **serial_data)
         return instance
 
-class StockReturnSerializer(serializers.ModelSerializer):
+class StockReturnSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = StockReturnItemSerializer(many=True, required=False)
     attachments = StockReturnAttachmentSerializer(many=True, required=False)
     remarks = StockReturnRemarkSerializer(many=True, required=False)
@@ -1,23 +1,25 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from core.documents import pdf_view_response
+from core.outbox import queue_email
+from core.dynamic_fields import apply_dynamic_fields
 from .models import PurchaseOrder,  PurchaseOrderHistory
 from .serializers import PurchaseOrderSerializer, PurchaseOrderItemSerializer, PurchaseOrderHistorySerializer, PurchaseOrderCommentSerializer
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
-from reportlab.lib import colors
-# from reportlab.lib.pagesizes = letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 
 class PurchaseOrderListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything PurchaseOrderSerializer walks, loaded per list instead of per row
+    list_queryset = PurchaseOrder.objects.prefetch_related('items', 'history', 'comments').order_by('-PO_date')
 
     def get(self, request):
-        purchase_orders = PurchaseOrder.objects.all().order_by('-PO_date')
-        serializer = PurchaseOrderSerializer(purchase_orders, many=True)
+        purchase_orders = self.list_queryset.all()
+        purchase_orders, field_kwargs = apply_dynamic_fields(purchase_orders, PurchaseOrderSerializer, {}, request)
+        serializer = PurchaseOrderSerializer(purchase_orders, many=True, **field_kwargs)
         return Response(serializer.data)
 
     def post(self, request):
@@ -179,8 +181,8 @@ class PurchaseOrderEmailView(APIView):
             html_message = render_to_string('purchase_order_email_template.html', {'purchase_order': purchase_order})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Purchase Order not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -194,19 +196,20 @@ from .models import StockReceipt, StockReceiptItem, SerialNumber, BatchNumber, B
 from .serializers import StockReceiptSerializer, StockReceiptItemSerializer, SerialNumberSerializer, BatchNumberSerializer, StockReceiptAttachmentSerializer, StockReceiptRemarkSerializer
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 
 class StockReceiptListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Everything StockReceiptSerializer walks, loaded per list instead of per row
+    list_queryset = StockReceipt.objects.prefetch_related(
+        'items__serial_numbers', 'items__batch_numbers__serial_numbers', 'attachments', 'remarks',
+    ).order_by('-received_date')
 
     def get(self, request):
-        stock_receipts = StockReceipt.objects.all().order_by('-received_date')
-        serializer = StockReceiptSerializer(stock_receipts, many=True)
+        stock_receipts = self.list_queryset.all()
+        stock_receipts, field_kwargs = apply_dynamic_fields(stock_receipts, StockReceiptSerializer, {}, request)
+        serializer = StockReceiptSerializer(stock_receipts, many=True, **field_kwargs)
         return Response(serializer.data)
 
     def post(self, request):
@@ -312,69 +315,7 @@ class StockReceiptPDFView(APIView):
     def get(self, request, pk):
         try:
             stock_receipt = StockReceipt.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = []
-
-            header_data = [
-                ['GRN ID', stock_receipt.GRN_ID],
-                ['Received Date', stock_receipt.received_date],
-                ['Supplier', stock_receipt.supplier.name if stock_receipt.supplier else 'N/A'],
-                ['Total Items', len(stock_receipt.items.all())],
-            ]
-            header_table = Table(header_data)
-            header_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ]))
-            elements.append(header_table)
-
-            items_data = [['Product', 'UOM', 'Qty Ordered', 'Qty Received', 'Accepted Qty', 'Unit Price', 'Tax (%)', 'Discount (%)', 'Total', 'Serials', 'Batches']]
-            for item in stock_receipt.items.all():
-                serials = ', '.join(sn.serial_no for sn in item.serial_numbers.all()) if item.serial_numbers.exists() else 'N/A'
-                batches = ', '.join(bn.batch_no for bn in item.batch_numbers.all()) if item.batch_numbers.exists() else 'N/A'
-                items_data.append([
-                    item.product.name if item.product else 'N/A',
-                    item.uom,
-                    item.qty_ordered or 0,
-                    item.qty_received,
-                    item.accepted_qty,
-                    f"{item.unit_price:.2f}",
-                    f"{item.tax:.2f}",
-                    f"{item.discount:.2f}",
-                    f"{item.total:.2f}",
-                    serials,
-                    batches
-                ])
-            items_table = Table(items_data)
-            items_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(items_table)
-
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="stock_receipt_{stock_receipt.GRN_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'stock_receipt', stock_receipt)
         except ObjectDoesNotExist:
             return Response({'error': 'Stock Receipt not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -394,8 +335,8 @@ class StockReceiptEmailView(APIView):
             html_message = render_to_string('stock_receipt_email_template.html', {'stock_receipt': stock_receipt})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Stock Receipt not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -410,19 +351,16 @@ from .serializers import StockReturnSerializer, StockReturnItemSerializer, Seria
 from .models import StockReceiptItem, SerialNumber
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
-import io
 
 class StockReturnListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         stock_returns = StockReturn.objects.all().order_by('-return_date')
-        serializer = StockReturnSerializer(stock_returns, many=True)
+        stock_returns, field_kwargs = apply_dynamic_fields(stock_returns, StockReturnSerializer, {}, request)
+        serializer = StockReturnSerializer(stock_returns, many=True, **field_kwargs)
         return Response(serializer.data)
 
     def post(self, request):
@@ -513,90 +451,7 @@ class StockReturnPDFView(APIView):
     def get(self, request, pk):
         try:
             stock_return = StockReturn.objects.get(id=pk)
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = []
-
-            header_data = [
-                ['SRN ID', stock_return.SRN_ID],
-                ['Return Date', stock_return.return_date],
-                ['Supplier', stock_return.supplier.name if stock_return.supplier else 'N/A'],
-                ['Total Items', len(stock_return.items.all())],
-            ]
-            header_table = Table(header_data)
-            header_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ]))
-            elements.append(header_table)
-
-            items_data = [['Product', 'UOM', 'Qty Ordered', 'Qty Rejected', 'Qty Returned', 'Unit Price', 'Tax (%)', 'Discount (%)', 'Total', 'Serials']]
-            for item in stock_return.items.all():
-                serials = ', '.join(sn.serial_no for sn in item.serial_numbers.all()) if item.serial_numbers.exists() else 'N/A'
-                items_data.append([
-                    item.product.name if item.product else 'N/A',
-                    item.uom,
-                    item.qty_ordered or 0,
-                    item.qty_rejected or 0,
-                    item.qty_returned,
-                    f"{item.unit_price:.2f}",
-                    f"{item.tax:.2f}",
-                    f"{item.discount:.2f}",
-                    f"{item.total:.2f}",
-                    serials
-                ])
-            items_table = Table(items_data)
-            items_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(items_table)
-
-            calc_data = [
-                ['Original Purchased Total', f"₹{stock_return.original_purchased_total:.2f}"],
-                ['Global Discount (%)', f"{stock_return.global_discount:.2f}%"],
-                ['Return Subtotal', f"₹{stock_return.return_subtotal:.2f}"],
-                ['Global Discount Amount', f"₹{stock_return.global_discount_amount:.2f}"],
-                ['Rounding Adjustment', f"₹{stock_return.rounding_adjustment:.2f}"],
-                ['Amount to Recover', f"₹{stock_return.amount_to_recover:.2f}"],
-            ]
-            calc_table = Table(calc_data)
-            calc_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ]))
-            elements.append(calc_table)
-
-            doc.build(elements)
-            buffer.seek(0)
-            response = HttpResponse(buffer, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="stock_return_{stock_return.SRN_ID}.pdf"'
-            return response
+            return pdf_view_response(request, 'stock_return', stock_return)
         except ObjectDoesNotExist:
             return Response({'error': 'Stock Return not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -616,8 +471,8 @@ class StockReturnEmailView(APIView):
             html_message = render_to_string('stock_return_email_template.html', {'stock_return': stock_return})
             msg = EmailMessage(subject, html_message, to=[email])
             msg.content_subtype = 'html'
-            msg.send()
-            return Response({'message': 'Email sent successfully'}, status=status.HTTP_200_OK)
+            queue_email(msg)
+            return Response({'message': 'Email queued for sending'}, status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response({'error': 'Stock Return not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e: